@@ -3,7 +3,7 @@ import logging
 import discord
 
 from moddingway.bot import ModdingwayBot
-from moddingway.database import DatabaseConnection
+from moddingway.database import DatabaseConnection, migrations
 from moddingway.settings import get_settings
 
 settings = get_settings()
@@ -24,6 +24,6 @@ if __name__ == "__main__":
 
     database_connection = DatabaseConnection()
     database_connection.connect()
-    database_connection.create_tables()
+    migrations.migrate()
 
     bot.run(settings.discord_token)
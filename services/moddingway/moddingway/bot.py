@@ -14,7 +14,11 @@ from moddingway.commands.send_message_commands import create_send_message_comman
 from moddingway.commands.slowmode_commands import create_slowmode_commands
 from moddingway.commands.strikes_command import create_strikes_commands
 from moddingway.commands.warning_commands import create_warning_commands
+from moddingway.events.automod_events import register_automod_events
+from moddingway.events.guild_events import register_guild_events
 from moddingway.events.member_events import register_events
+from moddingway.log_sink import log_sink
+from moddingway.moderation_log import moderation_log
 from moddingway.settings import get_settings
 
 settings = get_settings()
@@ -36,6 +40,11 @@ class ModdingwayBot(Bot):
             logger.info(f"Logged in as {self.user} (ID: {self.user.id})")
         workers.start_tasks(self)
 
+    async def close(self):
+        await log_sink.close()
+        await moderation_log.close()
+        await super().close()
+
     def _register_commands(self):
         logger.info("Starting registering commands")
         create_exile_commands(self)
@@ -53,4 +62,6 @@ class ModdingwayBot(Bot):
     def _register_events(self):
         logger.info("Registering event handlers")
         register_events(self)
+        register_guild_events(self)
+        register_automod_events(self)
         logger.info("Event handlers registered")
@@ -10,7 +10,7 @@ from moddingway.constants import (
     TRUNCATE_OFFSET,
     Role,
 )
-from moddingway.database import announcements_database
+from moddingway.database.aio import announcements_database
 from moddingway.services import announcement_service
 from moddingway.settings import get_settings
 from moddingway.util import is_user_admin, user_has_role
@@ -187,12 +187,14 @@ class AnnouncementEditModal(discord.ui.Modal, title="Edit Announcement"):
                 "Announcement content cannot be empty.", ephemeral=True
             )
             return
-        announcements_database.add_revision(
+        await announcements_database.add_revision(
             announcement_id=self.announcement_id,
             author_id=interaction.user.id,
             content=new_content,
         )
-        updated_json = announcements_database.get_announcement(self.announcement_id)
+        updated_json = await announcements_database.get_announcement(
+            self.announcement_id
+        )
 
         new_view = AnnouncementShowView(
             announcement_json=updated_json, author=interaction.user, bot=self.bot
@@ -361,7 +363,7 @@ def create_announcement_commands(bot: Bot) -> None:
         announcement_id: int,
     ):
         """Publish an announcement"""
-        announcement_json = announcements_database.get_announcement(
+        announcement_json = await announcements_database.get_announcement(
             announcement_id=announcement_id
         )
         if announcement_json is None:
@@ -421,7 +423,7 @@ def create_announcement_commands(bot: Bot) -> None:
         announcement_id: int,
     ):
         """Show announcement"""
-        announcement_json = announcements_database.get_announcement(
+        announcement_json = await announcements_database.get_announcement(
             announcement_id=announcement_id
         )
 
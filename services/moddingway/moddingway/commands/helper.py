@@ -1,11 +1,12 @@
 import datetime
 import logging
 import time
-from contextlib import asynccontextmanager
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
 
 import discord
 from discord.ext.commands import Bot
 
+from moddingway.moderation_log import moderation_actor
 from moddingway.settings import get_settings
 from moddingway.util import (
     EmbedField,
@@ -56,15 +57,33 @@ def create_logging_embed(
     else:
         # TODO: MOD-169 pass something in for these situations
         description = "Command was run via a UI"
-    return create_interaction_embed_context(
-        get_log_channel(interaction.guild),
-        user=interaction.user,
-        timestamp=interaction.created_at,
-        description=description,
-        fields=fields,
+    return _attribute_moderation_events(
+        interaction.user.id,
+        create_interaction_embed_context(
+            get_log_channel(interaction.guild),
+            user=interaction.user,
+            timestamp=interaction.created_at,
+            description=description,
+            fields=fields,
+        ),
     )
 
 
+@asynccontextmanager
+async def _attribute_moderation_events(
+    actor_id: int, embed_context: AbstractAsyncContextManager[discord.Embed]
+):
+    """
+    Attribute the moderation events recorded within embed_context to actor_id
+    """
+    actor = moderation_actor.set(actor_id)
+    try:
+        async with embed_context as embed:
+            yield embed
+    finally:
+        moderation_actor.reset(actor)
+
+
 def create_bot_errors(bot: Bot) -> None:
     @bot.tree.error
     async def on_app_command_error(interaction: discord.Interaction, error):
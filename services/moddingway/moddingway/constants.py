@@ -30,6 +30,21 @@ class UserRole(IntEnum):
     USER = 1
 
 
+class ModerationEventType(StrEnum):
+    EXILE = "exile"
+    EXILE_EXTENDED = "exile_extended"
+    UNEXILE = "unexile"
+    STRIKE = "strike"
+    STRIKE_DELETED = "strike_deleted"
+    NOTE = "note"
+    WARNING = "warning"
+    BAN = "ban"
+    UNBAN = "unban"
+    AUTOMOD_THREAD_DELETED = "automod_thread_deleted"
+    AUTOMOD_MESSAGES_DELETED = "automod_messages_deleted"
+    FORM_DECISION = "form_decision"
+
+
 # Strikes constants
 MINOR_INFRACTION_POINTS = 1
 MODERATE_INFRACTION_POINTS = 3
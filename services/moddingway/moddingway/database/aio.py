@@ -0,0 +1,197 @@
+"""
+Awaitable counterparts of the *_database modules.
+
+Every call is handed to a dedicated thread pool sized to the connection pool,
+so coroutines never block the event loop on a Postgres round trip. The sync
+modules stay untouched and remain the API for scripts and the thread pool.
+The bot and the API share this executor; its queue depth and call latency
+histogram are reported by DatabaseExecutor.metrics().
+
+    from moddingway.database.aio import users_database
+
+    db_user = await users_database.get_user(member.id)
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any
+
+from moddingway.settings import get_settings
+
+from . import (
+    announcements_database as _announcements_database,
+    automod_database as _automod_database,
+    banforms_database as _banforms_database,
+    exiles_database as _exiles_database,
+    moderation_events_database as _moderation_events_database,
+    notes_database as _notes_database,
+    roles_database as _roles_database,
+    strikes_database as _strikes_database,
+    users_database as _users_database,
+)
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the call latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class ExecutorMetrics:
+    max_workers: int
+    max_pending: int
+    queued: int  # calls waiting for a worker thread
+    running: int
+    max_queued: int
+    completed: int
+    latency_sum_seconds: float
+    latency_histogram: dict[str, int]  # cumulative call count per bucket upper bound
+
+
+class DatabaseExecutor:
+    """
+    Thread pool running blocking database calls for async callers. At most
+    max_pending calls are accepted at once, further callers wait on the event
+    loop until a slot frees up instead of growing an unbounded queue.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="moddingway-db"
+        )
+        self.max_workers = max_workers
+        self.max_pending = max_workers + max_queue
+        self._slots: asyncio.Semaphore | None = None
+        self._slots_loop: asyncio.AbstractEventLoop | None = None
+
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._max_queued = 0
+        self._completed = 0
+        self._latency_sum = 0.0
+        self._latency_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # asyncio primitives are bound to the loop they are first used on
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_pending)
+            self._slots_loop = loop
+        return self._slots
+
+    async def run[T](self, func: Callable[..., T], *args, **kwargs) -> T:
+        started = time.perf_counter()
+        state = {"started": False, "abandoned": False}
+        with self._lock:
+            self._queued += 1
+            self._max_queued = max(self._max_queued, self._queued)
+
+        def job() -> T:
+            with self._lock:
+                if state["abandoned"]:
+                    raise asyncio.CancelledError()
+                state["started"] = True
+                self._queued -= 1
+                self._running += 1
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        try:
+            async with self._get_slots():
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._executor, job)
+        finally:
+            self._observe(time.perf_counter() - started, state)
+
+    def _observe(self, latency: float, state: dict[str, bool]):
+        with self._lock:
+            if not state["started"]:
+                # cancelled while waiting, the job will never run
+                state["abandoned"] = True
+                self._queued -= 1
+                return
+
+            self._completed += 1
+            self._latency_sum += latency
+            for index, upper_bound in enumerate(LATENCY_BUCKETS):
+                if latency <= upper_bound:
+                    self._latency_counts[index] += 1
+                    break
+            else:
+                self._latency_counts[-1] += 1
+
+    def metrics(self) -> ExecutorMetrics:
+        with self._lock:
+            histogram = {}
+            cumulative = 0
+            for upper_bound, count in zip(
+                (*LATENCY_BUCKETS, "+Inf"), self._latency_counts, strict=True
+            ):
+                cumulative += count
+                histogram[str(upper_bound)] = cumulative
+
+            return ExecutorMetrics(
+                max_workers=self.max_workers,
+                max_pending=self.max_pending,
+                queued=self._queued,
+                running=self._running,
+                max_queued=self._max_queued,
+                completed=self._completed,
+                latency_sum_seconds=self._latency_sum,
+                latency_histogram=histogram,
+            )
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+class AsyncDatabaseModule:
+    """
+    Exposes the functions of a *_database module as coroutines. Attributes are
+    resolved on every call, so patching the sync module also affects this one.
+    """
+
+    def __init__(self, module: ModuleType, executor: DatabaseExecutor):
+        self._module = module
+        self._executor = executor
+
+    def __getattr__(self, name: str) -> Callable[..., Awaitable[Any]]:
+        attr = getattr(self._module, name)
+        if name.startswith("_") or isinstance(attr, type) or not callable(attr):
+            raise AttributeError(
+                f"{self._module.__name__}.{name} is not a database function"
+            )
+
+        async def call(*args, **kwargs):
+            return await self._executor.run(
+                getattr(self._module, name), *args, **kwargs
+            )
+
+        return call
+
+
+executor = DatabaseExecutor(
+    max_workers=settings.postgres_pool_max_size,
+    max_queue=settings.database_executor_queue_size,
+)
+
+announcements_database = AsyncDatabaseModule(_announcements_database, executor)
+automod_database = AsyncDatabaseModule(_automod_database, executor)
+banforms_database = AsyncDatabaseModule(_banforms_database, executor)
+exiles_database = AsyncDatabaseModule(_exiles_database, executor)
+moderation_events_database = AsyncDatabaseModule(_moderation_events_database, executor)
+notes_database = AsyncDatabaseModule(_notes_database, executor)
+roles_database = AsyncDatabaseModule(_roles_database, executor)
+strikes_database = AsyncDatabaseModule(_strikes_database, executor)
+users_database = AsyncDatabaseModule(_users_database, executor)
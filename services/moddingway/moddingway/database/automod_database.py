@@ -0,0 +1,129 @@
+import logging
+from datetime import UTC, datetime
+
+from psycopg2.extras import execute_values
+
+from . import DatabaseConnection
+
+logger = logging.getLogger(__name__)
+
+
+def get_watermark(channel_id: int) -> datetime | None:
+    """
+    Return when the forum channel was last fully processed by the automod
+    """
+    conn = DatabaseConnection()
+
+    with conn.get_cursor() as cursor:
+        query = """
+        SELECT lastRunTimestamp FROM automodWatermarks WHERE channelID = %s
+        """
+
+        params = (str(channel_id),)
+
+        cursor.execute(query, params)
+        res = cursor.fetchone()
+
+        if res is None:
+            return None
+        return res[0].replace(tzinfo=UTC)
+
+
+def set_watermark(channel_id: int, timestamp: datetime):
+    conn = DatabaseConnection()
+
+    with conn.get_cursor() as cursor:
+        query = """
+        INSERT INTO automodWatermarks (channelID, lastRunTimestamp)
+        VALUES (%s, %s)
+        ON CONFLICT (channelID) DO UPDATE
+        SET lastRunTimestamp = EXCLUDED.lastRunTimestamp
+        """
+
+        params = (str(channel_id), timestamp)
+
+        cursor.execute(query, params)
+
+
+def upsert_threads(channel_id: int, threads: list[tuple[int, datetime | None, bool]]):
+    """
+    Record the last activity of threads, given as
+    (thread id, last activity timestamp, is pinned)
+    """
+    if len(threads) == 0:
+        return
+
+    conn = DatabaseConnection()
+
+    with conn.get_cursor() as cursor:
+        query = """
+        INSERT INTO automodThreads (threadID, channelID, lastActivityTimestamp, isPinned)
+        VALUES %s
+        ON CONFLICT (threadID) DO UPDATE
+        SET lastActivityTimestamp = EXCLUDED.lastActivityTimestamp,
+            isPinned = EXCLUDED.isPinned
+        """
+
+        rows = [
+            (str(thread_id), str(channel_id), last_activity, is_pinned)
+            for thread_id, last_activity, is_pinned in threads
+        ]
+
+        execute_values(cursor, query, rows)
+
+
+def get_expired_threads(channel_id: int, cutoff: datetime) -> list[int]:
+    """
+    Return the ids of the unpinned threads of a channel last active at or
+    before cutoff
+    """
+    conn = DatabaseConnection()
+
+    with conn.get_cursor() as cursor:
+        query = """
+        SELECT threadID FROM automodThreads
+        WHERE channelID = %s AND lastActivityTimestamp <= %s AND NOT isPinned
+        ORDER BY lastActivityTimestamp
+        """
+
+        params = (str(channel_id), cutoff)
+
+        cursor.execute(query, params)
+        return [int(row[0]) for row in cursor.fetchall()]
+
+
+def get_expiring_threads(
+    channel_id: int, active_before: datetime
+) -> list[tuple[int, datetime]]:
+    """
+    Return (thread id, last activity timestamp) of the unpinned threads of a
+    channel last active before active_before
+    """
+    conn = DatabaseConnection()
+
+    with conn.get_cursor() as cursor:
+        query = """
+        SELECT threadID, lastActivityTimestamp FROM automodThreads
+        WHERE channelID = %s AND lastActivityTimestamp < %s AND NOT isPinned
+        """
+
+        params = (str(channel_id), active_before)
+
+        cursor.execute(query, params)
+        return [(int(row[0]), row[1]) for row in cursor.fetchall()]
+
+
+def remove_threads(thread_ids: list[int]):
+    if len(thread_ids) == 0:
+        return
+
+    conn = DatabaseConnection()
+
+    with conn.get_cursor() as cursor:
+        query = """
+        DELETE FROM automodThreads WHERE threadID = ANY(%s)
+        """
+
+        params = ([str(thread_id) for thread_id in thread_ids],)
+
+        cursor.execute(query, params)
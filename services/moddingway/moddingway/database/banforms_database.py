@@ -3,6 +3,7 @@ import logging
 from moddingway.settings import get_settings
 
 from . import DatabaseConnection
+from .counts import Count, count_cache, fetch_counted_page, get_count
 from .models import BanForm
 
 settings = get_settings()
@@ -10,33 +11,50 @@ settings = get_settings()
 logger = logging.getLogger(__name__)
 
 
-def get_ban_forms(limit: int, offset: int) -> list[BanForm]:
+def _row_to_ban_form(row: tuple) -> BanForm:
+    return BanForm(
+        form_id=row[0],
+        user_id=row[1],
+        reason=row[2],
+        approval=row[3],
+        approved_by=row[4],
+        submission_timestamp=row[5],
+    )
+
+
+def get_ban_forms_page(limit: int, offset: int) -> tuple[list[BanForm], Count]:
+    conn = DatabaseConnection()
+
+    with conn.get_cursor() as cursor:
+        rows, total = fetch_counted_page(
+            cursor,
+            "forms",
+            columns="f.formID, f.userID, f.reason, f.approval, f.approvedByUserID, f.createdTimestamp",
+            order_by="f.formID",
+            limit=limit,
+            offset=offset,
+        )
+
+        return [_row_to_ban_form(row) for row in rows], total
+
+
+def get_ban_forms_after(after_form_id: int, limit: int) -> list[BanForm]:
     conn = DatabaseConnection()
 
     with conn.get_cursor() as cursor:
         query = """
-        SELECT * FROM forms
-        LIMIT %s OFFSET %s;
+        SELECT
+        f.formID, f.userID, f.reason, f.approval, f.approvedByUserID, f.createdTimestamp
+        FROM forms f
+        WHERE f.formID > %s
+        ORDER BY f.formID
+        LIMIT %s;
         """
-        params = (limit, offset)
+        params = (after_form_id, limit)
 
         cursor.execute(query, params)
 
-        res = cursor.fetchall()
-
-        if res:
-            return [
-                BanForm(
-                    form_id=row[0],
-                    user_id=row[1],
-                    reason=row[2],
-                    approval=row[3],
-                    approved_by=row[4],
-                    submission_timestamp=row[5],
-                )
-                for row in res
-            ]
-        return []
+        return [_row_to_ban_form(row) for row in cursor.fetchall()]
 
 
 def get_ban_form(form_id: int) -> BanForm | None:
@@ -67,19 +85,8 @@ def get_ban_form(form_id: int) -> BanForm | None:
             )
 
 
-def get_form_count() -> int:
-    conn = DatabaseConnection()
-
-    with conn.get_cursor() as cursor:
-        query = """
-            SELECT COUNT(*)
-            FROM forms
-        """
-
-        cursor.execute(query)
-
-        result = cursor.fetchall()
-        return result[0][0]
+def get_form_count() -> Count:
+    return get_count("forms")
 
 
 def add_form(form: BanForm) -> int:
@@ -104,7 +111,8 @@ def add_form(form: BanForm) -> int:
         if res is None:
             raise ValueError("Failed to add form to DB")
 
-        return res[0]
+    count_cache.invalidate("forms")
+    return res[0]
 
 
 def update_form(form_id, approval, approved_by) -> tuple[bool, int] | None:
@@ -0,0 +1,89 @@
+"""
+Micro-benchmark of the prepared statements against the database configured
+through the usual environment variables:
+
+    python -m moddingway.database.benchmark [calls]
+
+Every registered statement is run calls times with its plain query, then
+calls times through EXECUTE, on the same pooled connection. Per-call latency
+is printed for both.
+"""
+
+import logging
+import sys
+import time
+from datetime import UTC, datetime
+
+from moddingway.constants import ExileStatus
+
+from . import (
+    DatabaseConnection,
+    exiles_database,
+    notes_database,
+    roles_database,
+    statements,
+    strikes_database,
+    users_database,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CALLS = 1000
+
+# parameters each statement is benchmarked with, matching rows is not required
+SAMPLE_PARAMS = {
+    users_database.GET_USER.name: ("0",),
+    exiles_database.GET_PENDING_UNEXILES.name: (
+        ExileStatus.TIMED_EXILED,
+        datetime.now(UTC),
+    ),
+    exiles_database.GET_USER_ACTIVE_EXILE.name: (0, ExileStatus.TIMED_EXILED),
+    roles_database.GET_STICKY_ROLES.name: (0,),
+    strikes_database.LIST_STRIKES.name: (0,),
+    notes_database.LIST_NOTES.name: (0,),
+    notes_database.LIST_WARNINGS.name: (0,),
+}
+
+
+def _time_calls(run, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        run()
+    return (time.perf_counter() - started) / calls
+
+
+def main(calls: int):
+    conn = DatabaseConnection()
+    conn.connect()
+
+    logger.info(
+        f"{'statement':<24}{'plain (ms)':>12}{'prepared (ms)':>15}{'speedup':>10}"
+    )
+    with conn.get_cursor() as cursor:
+        for name, statement in statements.registry.items():
+            params = SAMPLE_PARAMS[name]
+
+            def plain(statement=statement, params=params):
+                cursor.execute(statement.query, params)
+                cursor.fetchall()
+
+            def prepared(statement=statement, params=params):
+                statement.execute(cursor, params)
+                cursor.fetchall()
+
+            # warm up the connection and prepare the statement
+            plain()
+            prepared()
+
+            plain_latency = _time_calls(plain, calls) * 1000
+            prepared_latency = _time_calls(prepared, calls) * 1000
+            logger.info(
+                f"{name:<24}{plain_latency:>12.3f}{prepared_latency:>15.3f}{plain_latency / prepared_latency:>9.2f}x"
+            )
+
+    conn.disconnect()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CALLS)
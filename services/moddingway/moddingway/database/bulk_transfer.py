@@ -0,0 +1,327 @@
+"""
+Bulk export and import of the moderation tables through COPY.
+
+Every table is streamed to or from its own gzip compressed CSV file, rows never
+go through Python one by one. The directory also holds a manifest.json listing
+the exported tables, then the tables imported from it. A run that stops
+halfway is resumed by starting it again on the same directory, tables listed
+in the manifest are skipped.
+
+Tables are exported children first, so a resumed export never holds strikes,
+exiles, notes or forms of a user missing from users.csv.gz. They are imported
+users first, each table in a single transaction through a temporary staging
+table.
+
+Ids are not kept on import, the data may come from another database whose ids
+collide with the local ones. Users are matched on their Discord user and
+guild ids, a user already present keeps its local record. The other tables
+get new ids and their userID is rewritten to the local user through that
+match, so users.csv.gz must sit next to them. A row identical to one the user
+already has is skipped, which makes importing the same file twice harmless.
+"""
+
+import gzip
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+
+from psycopg2.extensions import cursor
+
+from .connection import DatabaseConnection
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+COMPRESS_LEVEL = 6
+# cursor.copy_expert read and write size
+COPY_BUFFER_SIZE = 1 << 20
+
+
+@dataclass(frozen=True)
+class TransferTable:
+    name: str
+    primary_key: str
+    columns: tuple[str, ...]
+
+    @property
+    def filename(self) -> str:
+        return f"{self.name}.csv.gz"
+
+
+# in foreign key order, users is referenced by every other table
+TABLES = (
+    TransferTable(
+        "users",
+        "userID",
+        (
+            "userID",
+            "discordUserID",
+            "discordGuildID",
+            "userRole",
+            "temporaryPoints",
+            "permanentPoints",
+            "lastInfractionTimestamp",
+            "isBanned",
+        ),
+    ),
+    TransferTable(
+        "strikes",
+        "strikeID",
+        (
+            "strikeID",
+            "userID",
+            "severity",
+            "reason",
+            "createdTimestamp",
+            "createdBy",
+            "lastEditedTimestamp",
+            "lastEditedBy",
+        ),
+    ),
+    TransferTable(
+        "exiles",
+        "exileID",
+        (
+            "exileID",
+            "userID",
+            "reason",
+            "startTimestamp",
+            "endTimestamp",
+            "exileStatus",
+        ),
+    ),
+    TransferTable(
+        "notes",
+        "noteID",
+        (
+            "noteID",
+            "userID",
+            "isWarning",
+            "note",
+            "createdTimestamp",
+            "createdBy",
+            "lastEditedTimestamp",
+            "lastEditedBy",
+        ),
+    ),
+    TransferTable(
+        "forms",
+        "formID",
+        (
+            "formID",
+            "userID",
+            "reason",
+            "approvalNotes",
+            "approval",
+            "approvedByUserID",
+            "createdTimestamp",
+            "approvedTimestamp",
+        ),
+    ),
+)
+
+
+def select_tables(names: list[str] | None) -> list[TransferTable]:
+    """
+    The tables called names, in foreign key order, or every table
+    """
+    if not names:
+        return list(TABLES)
+
+    unknown = set(names) - {table.name for table in TABLES}
+    if unknown:
+        raise ValueError(f"Unknown tables {', '.join(sorted(unknown))}")
+    return [table for table in TABLES if table.name in names]
+
+
+def read_manifest(directory: str) -> dict:
+    path = os.path.join(directory, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {"exported": {}, "imported": {}}
+
+    with open(path, encoding="utf-8") as fd:
+        manifest = json.load(fd)
+    manifest.setdefault("exported", {})
+    manifest.setdefault("imported", {})
+    return manifest
+
+
+def write_manifest(directory: str, manifest: dict):
+    # written aside then renamed, a crash never leaves a truncated manifest
+    path = os.path.join(directory, MANIFEST_FILE)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as fd:
+        json.dump(manifest, fd, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+
+def _column_list(table: TransferTable) -> str:
+    return ", ".join(table.columns)
+
+
+def export_table(cursor: cursor, table: TransferTable, path: str) -> int:
+    """
+    Stream table into a gzip compressed CSV file at path, returns its row count
+    """
+    partial = f"{path}.partial"
+    with gzip.open(partial, "wb", compresslevel=COMPRESS_LEVEL) as fd:
+        cursor.copy_expert(
+            f"COPY (SELECT {_column_list(table)} FROM {table.name} ORDER BY {table.primary_key}) TO STDOUT WITH (FORMAT csv, HEADER)",
+            fd,
+            size=COPY_BUFFER_SIZE,
+        )
+    rows = cursor.rowcount
+    os.replace(partial, path)
+    return rows
+
+
+def _data_columns(table: TransferTable) -> tuple[str, ...]:
+    return tuple(column for column in table.columns if column != table.primary_key)
+
+
+def _stage(cursor: cursor, table: TransferTable, path: str) -> int:
+    """
+    Copy the gzip compressed CSV file at path into a temporary staging table
+    dropped at commit, returns the number of rows read
+    """
+    cursor.execute(
+        f"CREATE TEMP TABLE staging_{table.name} (LIKE {table.name} INCLUDING DEFAULTS) ON COMMIT DROP;"
+    )
+    with gzip.open(path, "rb") as fd:
+        cursor.copy_expert(
+            f"COPY staging_{table.name} ({_column_list(table)}) FROM STDIN WITH (FORMAT csv, HEADER)",
+            fd,
+            size=COPY_BUFFER_SIZE,
+        )
+    read = cursor.rowcount
+    # temporary tables are never auto analyzed, the joins below need estimates
+    cursor.execute(f"ANALYZE staging_{table.name};")
+    return read
+
+
+def _insert_users(cursor: cursor, table: TransferTable) -> int:
+    columns = ", ".join(_data_columns(table))
+    cursor.execute(
+        f"""
+        INSERT INTO users ({columns})
+        SELECT {columns} FROM staging_users
+        ON CONFLICT (discordUserID, discordGuildID) DO NOTHING;
+        """
+    )
+    return cursor.rowcount
+
+
+def _insert_user_rows(cursor: cursor, table: TransferTable) -> int:
+    columns = _data_columns(table)
+    # exported userID -> local userID, through the Discord ids of the user
+    mapping = f"""FROM staging_{table.name} s
+        LEFT JOIN staging_users su ON su.userID = s.userID
+        LEFT JOIN users u
+            ON u.discordUserID = su.discordUserID
+            AND u.discordGuildID = su.discordGuildID"""
+
+    cursor.execute(f"SELECT COUNT(*) {mapping} WHERE u.userID IS NULL;")
+    unmapped = cursor.fetchone()[0]
+    if unmapped:
+        raise ValueError(
+            f"{unmapped} {table.name} belong to users missing from users.csv.gz or not imported yet"
+        )
+
+    selected = ", ".join(
+        "u.userID" if column == "userID" else f"s.{column}" for column in columns
+    )
+    compared = ", ".join(f"t.{column}" for column in columns)
+    cursor.execute(
+        f"""
+        INSERT INTO {table.name} ({", ".join(columns)})
+        SELECT {selected}
+        {mapping}
+        WHERE NOT EXISTS (
+            SELECT 1 FROM {table.name} t
+            WHERE t.userID = u.userID
+            AND ({compared}) IS NOT DISTINCT FROM ({selected})
+        );
+        """
+    )
+    return cursor.rowcount
+
+
+def import_table(
+    cursor: cursor, table: TransferTable, path: str, users_path: str
+) -> tuple[int, int]:
+    """
+    Load the gzip compressed CSV file at path into table in one transaction,
+    users_path is the users file its userIDs refer to. Returns the number of
+    rows read and the number inserted.
+    """
+    cursor.execute("BEGIN;")
+    try:
+        read = _stage(cursor, table, path)
+        if table.name == "users":
+            inserted = _insert_users(cursor, table)
+        else:
+            _stage(cursor, TABLES[0], users_path)
+            inserted = _insert_user_rows(cursor, table)
+        cursor.execute("COMMIT;")
+    except Exception:
+        cursor.execute("ROLLBACK;")
+        raise
+
+    return read, inserted
+
+
+def export_tables(directory: str, names: list[str] | None = None):
+    os.makedirs(directory, exist_ok=True)
+    manifest = read_manifest(directory)
+
+    with DatabaseConnection().get_cursor(statement_timeout_ms=0) as cursor:
+        for table in reversed(select_tables(names)):
+            path = os.path.join(directory, table.filename)
+            if table.name in manifest["exported"] and os.path.exists(path):
+                logger.info(f"{table.name} already exported, skipping")
+                continue
+
+            started = time.perf_counter()
+            rows = export_table(cursor, table, path)
+            manifest["exported"][table.name] = {
+                "file": table.filename,
+                "rows": rows,
+                "columns": list(table.columns),
+            }
+            write_manifest(directory, manifest)
+            logger.info(
+                f"Exported {rows} {table.name} in {time.perf_counter() - started:.2f}s"
+            )
+
+
+def import_tables(directory: str, names: list[str] | None = None):
+    manifest = read_manifest(directory)
+    users = manifest["exported"].get("users")
+    if users is None:
+        raise FileNotFoundError(f"users were not exported to {directory}")
+    users_path = os.path.join(directory, users["file"])
+
+    with DatabaseConnection().get_cursor(statement_timeout_ms=0) as cursor:
+        for table in select_tables(names):
+            if table.name in manifest["imported"]:
+                logger.info(f"{table.name} already imported, skipping")
+                continue
+
+            exported = manifest["exported"].get(table.name)
+            if exported is None:
+                raise FileNotFoundError(f"{table.name} was not exported to {directory}")
+            if exported["columns"] != list(table.columns):
+                raise ValueError(
+                    f"{table.name} was exported with columns {exported['columns']}"
+                )
+
+            started = time.perf_counter()
+            read, inserted = import_table(
+                cursor, table, os.path.join(directory, exported["file"]), users_path
+            )
+            manifest["imported"][table.name] = {"rows": read, "inserted": inserted}
+            write_manifest(directory, manifest)
+            logger.info(
+                f"Imported {inserted} of {read} {table.name} in {time.perf_counter() - started:.2f}s"
+            )
@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+
+
+@dataclass
+class CacheMetrics:
+    max_size: int
+    ttl_seconds: float
+    size: int
+    hits: int
+    misses: int
+    evictions: int  # entries dropped to stay within max_size
+    invalidations: int
+
+
+class TTLCache[K: Hashable, V]:
+    """
+    Thread safe LRU cache whose entries also expire ttl seconds after being
+    stored. Values are passed through copy on the way in and out, so callers
+    mutating what they got never alter the cached entry.
+
+    The cache only sees writes made by this process, ttl bounds how long a
+    write from another process (the bot or the API) can go unnoticed.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        copy: Callable[[V], V] = lambda value: value,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._copy = copy
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[K, tuple[V, float]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return self._copy(entry[0])
+
+    def put(self, key: K, value: V):
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (self._copy(value), time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, key: K):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._invalidations += len(self._entries)
+            self._entries.clear()
+
+    def metrics(self) -> CacheMetrics:
+        with self._lock:
+            return CacheMetrics(
+                max_size=self.max_size,
+                ttl_seconds=self.ttl,
+                size=len(self._entries),
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                invalidations=self._invalidations,
+            )
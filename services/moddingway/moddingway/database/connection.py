@@ -1,77 +1,292 @@
 import logging
-import os
 import threading
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from dataclasses import dataclass
 
 import psycopg2
-from psycopg2.extensions import cursor
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, connection, cursor
 
 from moddingway.settings import get_settings
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# Backoff between reconnect attempts, doubled after every failure
+RECONNECT_BACKOFF_BASE = 0.5
+RECONNECT_BACKOFF_MAX = 8.0
+
+
+class PoolTimeoutError(RuntimeError):
+    """Raised when no connection became available within the pool timeout"""
+
+
+class PooledConnection(connection):
+    """
+    psycopg2 connection that keeps track of when it was last returned to the pool,
+    of the pool generation it was opened in and of the statements prepared on it
+    (see statements.py)
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.last_used_at = time.monotonic()
+        self.generation = 0
+        self.prepared_statements: set[str] = set()
+
+
+@dataclass
+class PoolMetrics:
+    min_size: int
+    max_size: int
+    size: int  # open connections, in use or idle
+    in_use: int
+    idle: int
+    waiters: int  # threads currently blocked waiting for a connection
+    checkouts: int
+    timeouts: int
+    reconnects: int
+    total_wait_seconds: float
+    max_wait_seconds: float
+
 
 class DatabaseConnection:
     """
-    Singleton class for managing database connection
+    Singleton class managing a pool of database connections
     """
 
     _instance = None
     _connect_lock = threading.Lock()
 
-    # Prevent multiple instances of the connection to be created
+    # Prevent multiple instances of the pool to be created
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
             cls._instance = super().__new__(cls, *args, **kwargs)
-            cls._instance._connection = None
+            cls._instance._reset_pool()
         return cls._instance
 
+    def _reset_pool(self):
+        self._condition = threading.Condition(self._connect_lock)
+        self._idle: list[PooledConnection] = []
+        # bumped by disconnect(), connections of an older generation are closed
+        # instead of being returned to the pool
+        self._generation = 0
+        self._size = 0
+        self._in_use = 0
+        self._waiters = 0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._reconnects = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
     # This is run on startup
     def connect(self):
+        """
+        Open the minimum number of pooled connections
+        """
+        with self._condition:
+            missing = max(settings.postgres_pool_min_size - self._size, 0)
+            self._size += missing
+            generation = self._generation
+
+        opened = []
         try:
-            self._connection = psycopg2.connect(
-                host=settings.postgres_host,
-                port=settings.postgres_port,
-                dbname=settings.database_name,
-                user=settings.postgres_username,
-                password=settings.postgres_password,
-            )
-            self._connection.set_session(autocommit=True)
+            for _ in range(missing):
+                opened.append(self._open_connection(generation))
         except Exception as e:
+            with self._condition:
+                self._size -= missing - len(opened)
+                self._idle.extend(opened)
             logger.error(f"Failed to connect to database: {e}", exc_info=e)
             raise ValueError(f"Failed to connect to database: {e}") from e
 
-    def create_tables(self):
+        with self._condition:
+            self._idle.extend(opened)
+            self._condition.notify_all()
+
+    def disconnect(self):
         """
-        Created the tables the application relies on. This only needs to be run on startup
+        Close every idle connection. Connections still checked out are closed
+        as soon as they are returned instead of going back to the pool.
         """
-        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-        script_file_path = os.path.join(base_dir, "postgres", "create_tables.sql")
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._generation += 1
 
-        if not os.path.exists(script_file_path):
-            logger.error(
-                "create_tables.sql not found at %s", os.path.abspath(script_file_path)
-            )
-            raise FileNotFoundError(script_file_path)
+        for conn in idle:
+            try:
+                if not conn.closed:
+                    conn.close()
+            except Exception:
+                logger.exception("Error while closing DB connection")
 
-        with self.get_cursor() as cursor:
-            with open(script_file_path, encoding="utf-8") as fd:
-                script = fd.read()
-                cursor.execute(script)
+    def metrics(self) -> PoolMetrics:
+        with self._condition:
+            return PoolMetrics(
+                min_size=settings.postgres_pool_min_size,
+                max_size=settings.postgres_pool_max_size,
+                size=self._size,
+                in_use=self._in_use,
+                idle=len(self._idle),
+                waiters=self._waiters,
+                checkouts=self._checkouts,
+                timeouts=self._timeouts,
+                reconnects=self._reconnects,
+                total_wait_seconds=self._total_wait,
+                max_wait_seconds=self._max_wait,
+            )
 
-    def disconnect(self):
+    @contextmanager
+    def get_cursor(self, statement_timeout_ms: int | None = None) -> Generator[cursor]:
         """
-        Close the underlying connection if open.
+        Check a connection out of the pool and yield a cursor on it. The
+        connection is returned to the pool once the block exits.
+
+        statement_timeout_ms overrides the default statement timeout for the
+        duration of this checkout only.
         """
-        with self._connect_lock:
+        conn = self._checkout()
+        try:
+            with conn.cursor() as cur:
+                if statement_timeout_ms is not None:
+                    cur.execute("SET statement_timeout = %s", (statement_timeout_ms,))
+                yield cur
+        finally:
+            # a lost server connection is flagged through conn.closed
+            self._release(conn, reset_timeout=statement_timeout_ms is not None)
+
+    def _checkout(self) -> PooledConnection:
+        started = time.monotonic()
+        deadline = started + settings.postgres_pool_timeout
+        conn: PooledConnection | None = None
+
+        with self._condition:
+            while True:
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if self._size < settings.postgres_pool_max_size:
+                    # reserve a slot, the connection is opened outside the lock
+                    self._size += 1
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"No database connection available after {settings.postgres_pool_timeout}s"
+                    )
+
+                self._waiters += 1
+                try:
+                    self._condition.wait(remaining)
+                finally:
+                    self._waiters -= 1
+
+            waited = time.monotonic() - started
+            generation = self._generation
+            self._in_use += 1
+            self._checkouts += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+
+        try:
+            if conn is None:
+                conn = self._open_connection(generation)
+            elif not self._is_healthy(conn):
+                logger.warning("Discarding unhealthy database connection")
+                self._close_quietly(conn)
+                conn = self._open_connection(generation)
+                with self._condition:
+                    self._reconnects += 1
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._in_use -= 1
+                self._condition.notify()
+            raise
+
+        return conn
+
+    def _release(self, conn: PooledConnection, reset_timeout: bool = False):
+        broken = False
+        if not conn.closed:
             try:
-                if self._connection is not None and not self._connection.closed:
-                    self._connection.close()
-            except Exception:
-                logger.exception("Error while closing DB connection")
+                with conn.cursor() as cur:
+                    if conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+                        # a script left a transaction open, do not leak it to the next user
+                        cur.execute("ROLLBACK")
+                    if reset_timeout:
+                        cur.execute("RESET statement_timeout")
+            except psycopg2.Error:
+                broken = True
+
+        with self._condition:
+            self._in_use -= 1
+            # opened before the last disconnect()
+            stale = conn.generation != self._generation
+            if broken or stale or conn.closed:
+                self._size -= 1
+            else:
+                conn.last_used_at = time.monotonic()
+                self._idle.append(conn)
+            self._condition.notify()
+
+        if broken or stale:
+            self._close_quietly(conn)
 
-    def get_cursor(self) -> cursor:
-        with self._connect_lock:
-            if self._connection is None or getattr(self._connection, "closed", True):
-                self.connect()
-            return self._connection.cursor()
+    def _is_healthy(self, conn: PooledConnection) -> bool:
+        if conn.closed:
+            return False
+
+        idle_for = time.monotonic() - conn.last_used_at
+        if idle_for < settings.postgres_pool_health_check_idle:
+            return True
+
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _open_connection(self, generation: int) -> PooledConnection:
+        attempts = max(settings.postgres_connect_retries, 1)
+        attempt = 0
+        while True:
+            try:
+                conn = psycopg2.connect(
+                    host=settings.postgres_host,
+                    port=settings.postgres_port,
+                    dbname=settings.database_name,
+                    user=settings.postgres_username,
+                    password=settings.postgres_password,
+                    options=f"-c statement_timeout={settings.postgres_statement_timeout_ms}",
+                    connection_factory=PooledConnection,
+                )
+                conn.set_session(autocommit=True)
+                conn.generation = generation
+                return conn
+            except psycopg2.OperationalError as e:
+                attempt += 1
+                if attempt >= attempts:
+                    raise
+
+                backoff = min(
+                    RECONNECT_BACKOFF_BASE * 2 ** (attempt - 1), RECONNECT_BACKOFF_MAX
+                )
+                logger.warning(
+                    f"Database connection attempt {attempt}/{attempts} failed, retrying in {backoff}s: {e}"
+                )
+                time.sleep(backoff)
+
+    @staticmethod
+    def _close_quietly(conn: PooledConnection):
+        try:
+            if not conn.closed:
+                conn.close()
+        except Exception:
+            logger.exception("Error while closing DB connection")
@@ -0,0 +1,185 @@
+"""
+Cached row counts for the paginated listings.
+
+Every listing registers a named predicate (a FROM/WHERE clause). Its total is
+kept in a TTL cache so most page requests skip counting altogether. A stale
+entry keeps being served while an exact count is refreshed in the background.
+On a miss, unfiltered tables large enough to make COUNT(*) expensive answer
+with the planner's pg_class.reltuples estimate first. Smaller or filtered
+predicates take the exact total from the page query itself
+(see paging.fetch_page).
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from psycopg2.extensions import cursor
+
+from moddingway.settings import get_settings
+
+from .connection import DatabaseConnection
+from .paging import fetch_page, fetch_page_rows
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Count:
+    value: int
+    exact: bool  # False when the value is a planner estimate
+
+
+@dataclass(frozen=True)
+class CountedSource:
+    source: str  # FROM clause, optionally followed by a WHERE clause
+    params: tuple = ()
+    table: str | None = None  # set for unfiltered tables, enables reltuples estimates
+
+
+COUNTED_SOURCES = {
+    "users": CountedSource("effectiveUsers", table="users"),
+    "mods": CountedSource("effectiveUsers WHERE userrole = %s", (2,)),
+    "banned_users": CountedSource("effectiveUsers WHERE isBanned = %s", (True,)),
+    "forms": CountedSource("forms f", table="forms"),
+}
+
+
+class CountCache:
+    """
+    TTL cache of Count per counted source name, refreshed with exact counts on
+    a single background thread
+    """
+
+    def __init__(self, ttl: float, estimate_threshold: int):
+        self.ttl = ttl
+        self.estimate_threshold = estimate_threshold
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[Count, float]] = {}
+        self._refreshing: set[str] = set()
+        self._refresher = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="moddingway-counts"
+        )
+
+    def lookup(self, cursor: cursor, name: str) -> Count | None:
+        """
+        Return the cached or estimated count for name, or None when the
+        caller should compute an exact one and store() it
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+
+        if entry is not None:
+            count, stored_at = entry
+            if time.monotonic() - stored_at >= self.ttl or not count.exact:
+                self._schedule_refresh(name)
+            return count
+
+        counted = COUNTED_SOURCES[name]
+        if counted.table is None:
+            return None
+
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass;",
+            (counted.table,),
+        )
+        res = cursor.fetchone()
+        # reltuples is -1 until the table is first vacuumed or analyzed
+        if res is None or res[0] < self.estimate_threshold:
+            return None
+
+        estimate = Count(value=res[0], exact=False)
+        self.store(name, estimate)
+        self._schedule_refresh(name)
+        return estimate
+
+    def store(self, name: str, count: Count):
+        with self._lock:
+            self._entries[name] = (count, time.monotonic())
+
+    def invalidate(self, *names: str):
+        """
+        Drop the cached counts of names, or every count if none is given
+        """
+        with self._lock:
+            if not names:
+                self._entries.clear()
+            for name in names:
+                self._entries.pop(name, None)
+
+    def _schedule_refresh(self, name: str):
+        with self._lock:
+            if name in self._refreshing:
+                return
+            self._refreshing.add(name)
+
+        self._refresher.submit(self._refresh, name)
+
+    def _refresh(self, name: str):
+        counted = COUNTED_SOURCES[name]
+        try:
+            with DatabaseConnection().get_cursor() as cursor:
+                cursor.execute(
+                    f"SELECT COUNT(*) FROM {counted.source};", counted.params
+                )
+                res = cursor.fetchone()
+            self.store(name, Count(value=res[0], exact=True))
+        except Exception:
+            logger.exception(f"Failed to refresh row count of {name}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(name)
+
+
+count_cache = CountCache(
+    ttl=settings.count_cache_ttl,
+    estimate_threshold=settings.count_estimate_threshold,
+)
+
+
+def get_count(name: str) -> Count:
+    """
+    Return the total of a counted source, counting it exactly on a cache miss
+    """
+    with DatabaseConnection().get_cursor() as cursor:
+        count = count_cache.lookup(cursor, name)
+        if count is not None:
+            return count
+
+        counted = COUNTED_SOURCES[name]
+        cursor.execute(f"SELECT COUNT(*) FROM {counted.source};", counted.params)
+        count = Count(value=cursor.fetchone()[0], exact=True)
+
+    count_cache.store(name, count)
+    return count
+
+
+def fetch_counted_page(
+    cursor: cursor,
+    name: str,
+    columns: str,
+    order_by: str,
+    limit: int,
+    offset: int,
+) -> tuple[list[tuple], Count]:
+    """
+    paging.fetch_page over a counted source. The window count is skipped
+    whenever the cache can answer, otherwise its exact total fills the cache.
+    """
+    counted = COUNTED_SOURCES[name]
+    count = count_cache.lookup(cursor, name)
+    if count is not None:
+        rows = fetch_page_rows(
+            cursor, columns, counted.source, order_by, counted.params, limit, offset
+        )
+        return rows, count
+
+    rows, total = fetch_page(
+        cursor, columns, counted.source, order_by, counted.params, limit, offset
+    )
+    count = Count(value=total, exact=True)
+    count_cache.store(name, count)
+    return rows, count
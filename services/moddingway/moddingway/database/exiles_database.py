@@ -3,7 +3,7 @@ from datetime import UTC, datetime
 
 from moddingway.constants import ExileStatus
 
-from . import DatabaseConnection
+from . import DatabaseConnection, statements
 from .models import Exile, PendingExile
 
 logger = logging.getLogger(__name__)
@@ -75,43 +75,51 @@ def remove_user_exiles(user_id):
             return None
 
 
+GET_PENDING_UNEXILES = statements.register(
+    "get_pending_unexiles",
+    """
+    SELECT e.exileID, u.userID, u.discordUserID, e.endTimestamp
+    FROM exiles e
+    JOIN users u ON e.userID = u.userID
+    WHERE e.exileStatus = %s AND e.endTimestamp < %s;
+    """,
+)
+
+
 def get_pending_unexiles() -> list[PendingExile]:
     conn = DatabaseConnection()
 
     with conn.get_cursor() as cursor:
-        query = """
-        SELECT e.exileID, u.userID, u.discordUserID, e.endTimestamp
-        FROM exiles e
-        JOIN users u ON e.userID = u.userID
-        WHERE e.exileStatus = %s AND e.endTimestamp < %s;
-        """
-
         params = (
             ExileStatus.TIMED_EXILED,
             datetime.now(UTC),
         )
 
-        cursor.execute(query, params)
+        GET_PENDING_UNEXILES.execute(cursor, params)
         res = cursor.fetchall()
 
         return [PendingExile(*x) for x in res]
 
 
+GET_USER_ACTIVE_EXILE = statements.register(
+    "get_user_active_exile",
+    """
+    SELECT e.exileID, u.userID, u.discordUserID, e.endTimestamp
+    FROM exiles e
+    JOIN users u ON e.userID = u.userID
+    WHERE u.userID = %s AND  e.exileStatus = %s
+    LIMIT 1;
+    """,
+)
+
+
 def get_user_active_exile(user_id) -> PendingExile | None:
     conn = DatabaseConnection()
 
     with conn.get_cursor() as cursor:
-        query = """
-        SELECT e.exileID, u.userID, u.discordUserID, e.endTimestamp
-        FROM exiles e
-        JOIN users u ON e.userID = u.userID
-        WHERE u.userID = %s AND  e.exileStatus = %s
-        LIMIT 1;
-        """
-
         params = (user_id, ExileStatus.TIMED_EXILED)
 
-        cursor.execute(query, params)
+        GET_USER_ACTIVE_EXILE.execute(cursor, params)
         res = cursor.fetchone()
 
         if res is not None:
@@ -0,0 +1,157 @@
+"""
+Checks that the hot queries are planned on the indexes meant for them:
+
+    python -m moddingway.database.index_check
+
+Every query is run through EXPLAIN (FORMAT JSON) against the database
+configured through the usual environment variables, and its plan is searched
+for one of the expected indexes. Sequential scans are disabled for the
+duration of the check, a development database holds so few rows that the
+planner would otherwise always prefer them. The process exits with status 1
+when a query misses its index, for instance after a migration dropped it or a
+query was rewritten.
+"""
+
+import logging
+import sys
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from psycopg2.extensions import cursor
+
+from moddingway.constants import ExileStatus
+
+from . import (
+    DatabaseConnection,
+    exiles_database,
+    notes_database,
+    roles_database,
+    strikes_database,
+    users_database,
+)
+from .counts import COUNTED_SOURCES
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class HotQuery:
+    name: str
+    query: str
+    params: tuple
+    indexes: tuple[str, ...]  # the plan must use at least one of these, lower case
+
+
+HOT_QUERIES = [
+    HotQuery(
+        users_database.GET_USER.name,
+        users_database.GET_USER.query,
+        ("0",),
+        ("index_discorduserid", "users_discorduserid_discordguildid_key"),
+    ),
+    HotQuery(
+        exiles_database.GET_PENDING_UNEXILES.name,
+        exiles_database.GET_PENDING_UNEXILES.query,
+        (ExileStatus.TIMED_EXILED, datetime.now(UTC)),
+        ("index_exiles_exilestatus_endtimestamp",),
+    ),
+    HotQuery(
+        exiles_database.GET_USER_ACTIVE_EXILE.name,
+        exiles_database.GET_USER_ACTIVE_EXILE.query,
+        (0, ExileStatus.TIMED_EXILED),
+        ("index_exiles_userid_exilestatus",),
+    ),
+    HotQuery(
+        strikes_database.LIST_STRIKES.name,
+        strikes_database.LIST_STRIKES.query,
+        (0,),
+        ("index_strikes_userid_createdtimestamp",),
+    ),
+    HotQuery(
+        notes_database.LIST_NOTES.name,
+        notes_database.LIST_NOTES.query,
+        (0,),
+        ("index_notes_userid_createdtimestamp",),
+    ),
+    HotQuery(
+        notes_database.LIST_WARNINGS.name,
+        notes_database.LIST_WARNINGS.query,
+        (0,),
+        (
+            "index_notes_warnings_userid_createdtimestamp",
+            "index_notes_userid_createdtimestamp",
+        ),
+    ),
+    HotQuery(
+        roles_database.GET_STICKY_ROLES.name,
+        roles_database.GET_STICKY_ROLES.query,
+        (0,),
+        ("index_roles_userid",),
+    ),
+    HotQuery(
+        "banned_users_page",
+        f"SELECT * FROM {COUNTED_SOURCES['banned_users'].source} ORDER BY userID LIMIT 50",
+        COUNTED_SOURCES["banned_users"].params,
+        ("index_users_banned_userid",),
+    ),
+]
+
+
+def plan_indexes(plan: dict) -> set[str]:
+    """
+    Names of every index scanned by plan or any of its sub plans, lower case
+    """
+    indexes = set()
+    if "Index Name" in plan:
+        indexes.add(plan["Index Name"].lower())
+    for sub_plan in plan.get("Plans", []):
+        indexes |= plan_indexes(sub_plan)
+    return indexes
+
+
+def explain_indexes(cursor: cursor, hot_query: HotQuery) -> set[str]:
+    query = hot_query.query.strip().rstrip(";")
+    cursor.execute(f"EXPLAIN (FORMAT JSON) {query}", hot_query.params)
+    # psycopg2 decodes the json column, a single document wrapping the plan
+    return plan_indexes(cursor.fetchone()[0][0]["Plan"])
+
+
+def check_hot_queries(cursor: cursor) -> list[str]:
+    """
+    Returns the names of the hot queries whose plan misses their index
+    """
+    failures = []
+    cursor.execute("BEGIN;")
+    try:
+        cursor.execute("SET LOCAL enable_seqscan = off;")
+        for hot_query in HOT_QUERIES:
+            used = explain_indexes(cursor, hot_query)
+            if used.isdisjoint(hot_query.indexes):
+                logger.error(
+                    f"{hot_query.name} does not use {' or '.join(hot_query.indexes)}, plan scans {sorted(used) or 'no index'}"
+                )
+                failures.append(hot_query.name)
+            else:
+                logger.info(f"{hot_query.name} uses {', '.join(sorted(used))}")
+    finally:
+        cursor.execute("ROLLBACK;")
+
+    return failures
+
+
+def main() -> int:
+    conn = DatabaseConnection()
+    conn.connect()
+
+    try:
+        with conn.get_cursor() as cursor:
+            failures = check_hot_queries(cursor)
+    finally:
+        conn.disconnect()
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    sys.exit(main())
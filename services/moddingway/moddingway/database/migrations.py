@@ -0,0 +1,243 @@
+"""
+Versioned schema migrations.
+
+Migrations live in postgres/migrations as NNN_name.sql files, the statements
+applying the migration come first, followed by the separator line and the
+statements reverting it:
+
+    CREATE INDEX ...;
+
+    ---- create above / drop below ----
+
+    DROP INDEX ...;
+
+A migration whose revert section is empty, like the baseline 001, is
+irreversible and rollback() refuses to go past it.
+
+The schemaMigrations table records every applied version. migrate() only runs
+the versions missing from it, each one in its own transaction together with
+its schemaMigrations row. Concurrent runners (the bot and the API starting at
+the same time) are serialized with an advisory lock.
+
+    python -m moddingway.database.migrations [up|down [steps]|status]
+"""
+
+import logging
+import os
+import re
+import sys
+from dataclasses import dataclass
+from itertools import pairwise
+
+from psycopg2.extensions import cursor
+
+from .connection import DatabaseConnection
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    "postgres",
+    "migrations",
+)
+SEPARATOR = "---- create above / drop below ----"
+MIGRATION_FILE = re.compile(r"^(\d+)_(\w+)\.sql$")
+
+# arbitrary key of the advisory lock held while migrating
+MIGRATION_LOCK_ID = 7_420_001
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    up: str
+    down: str
+
+
+def parse_migration(filename: str, script: str) -> Migration:
+    match = MIGRATION_FILE.match(filename)
+    if match is None:
+        raise ValueError(f"{filename} is not named NNN_name.sql")
+
+    up, separator, down = script.partition(SEPARATOR)
+    if not separator:
+        raise ValueError(f"{filename} is missing the '{SEPARATOR}' line")
+
+    return Migration(
+        version=int(match.group(1)),
+        name=match.group(2),
+        up=up.strip(),
+        down=down.strip(),
+    )
+
+
+def load_migrations(directory: str = MIGRATIONS_DIR) -> list[Migration]:
+    """
+    Read every migration of directory, sorted by version
+    """
+    migrations = []
+    for filename in os.listdir(directory):
+        if not filename.endswith(".sql"):
+            continue
+        with open(os.path.join(directory, filename), encoding="utf-8") as fd:
+            migrations.append(parse_migration(filename, fd.read()))
+
+    migrations.sort(key=lambda migration: migration.version)
+    for previous, current in pairwise(migrations):
+        if previous.version == current.version:
+            raise ValueError(f"Duplicate migration version {current.version}")
+    return migrations
+
+
+def _strip_comments(script: str) -> str:
+    return "\n".join(
+        line for line in script.splitlines() if not line.strip().startswith("--")
+    ).strip()
+
+
+def pending_migrations(
+    migrations: list[Migration], applied: set[int]
+) -> list[Migration]:
+    return [migration for migration in migrations if migration.version not in applied]
+
+
+def _ensure_version_table(cursor: cursor):
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schemaMigrations (
+            version INT NOT NULL,
+            name TEXT NOT NULL,
+            appliedTimestamp TIMESTAMP NOT NULL DEFAULT (now() AT TIME ZONE 'utc'),
+            PRIMARY KEY(version)
+        );
+        """
+    )
+
+
+def _applied_versions(cursor: cursor) -> set[int]:
+    cursor.execute("SELECT version FROM schemaMigrations;")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def _run_in_transaction(cursor: cursor, script: str, record: tuple[str, tuple]):
+    cursor.execute("BEGIN;")
+    try:
+        cursor.execute(script)
+        cursor.execute(*record)
+        cursor.execute("COMMIT;")
+    except Exception:
+        cursor.execute("ROLLBACK;")
+        raise
+
+
+def migrate(directory: str = MIGRATIONS_DIR) -> list[int]:
+    """
+    Apply the migrations that were not applied yet, in version order. Returns
+    the versions that were applied. This is run on startup.
+    """
+    migrations = load_migrations(directory)
+    applied_now = []
+
+    with DatabaseConnection().get_cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_lock(%s);", (MIGRATION_LOCK_ID,))
+        try:
+            _ensure_version_table(cursor)
+            applied = _applied_versions(cursor)
+            for migration in pending_migrations(migrations, applied):
+                logger.info(f"Applying migration {migration.version} {migration.name}")
+                _run_in_transaction(
+                    cursor,
+                    migration.up,
+                    (
+                        "INSERT INTO schemaMigrations (version, name) VALUES (%s, %s);",
+                        (migration.version, migration.name),
+                    ),
+                )
+                applied_now.append(migration.version)
+        finally:
+            cursor.execute("SELECT pg_advisory_unlock(%s);", (MIGRATION_LOCK_ID,))
+
+    if not applied_now:
+        logger.info("Database schema is up to date")
+    return applied_now
+
+
+def rollback(steps: int = 1, directory: str = MIGRATIONS_DIR) -> list[int]:
+    """
+    Revert the last steps applied migrations, newest first. Returns the
+    versions that were reverted.
+    """
+    migrations = {
+        migration.version: migration for migration in load_migrations(directory)
+    }
+    reverted = []
+
+    with DatabaseConnection().get_cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_lock(%s);", (MIGRATION_LOCK_ID,))
+        try:
+            _ensure_version_table(cursor)
+            to_revert = sorted(_applied_versions(cursor), reverse=True)[:steps]
+            # checked up front, so a refused rollback reverts nothing
+            for version in to_revert:
+                migration = migrations.get(version)
+                if migration is None:
+                    raise ValueError(f"No migration file for applied version {version}")
+                if not _strip_comments(migration.down):
+                    raise ValueError(
+                        f"Migration {version} {migration.name} is irreversible"
+                    )
+
+            for version in to_revert:
+                migration = migrations[version]
+                logger.info(f"Reverting migration {version} {migration.name}")
+                _run_in_transaction(
+                    cursor,
+                    migration.down,
+                    ("DELETE FROM schemaMigrations WHERE version = %s;", (version,)),
+                )
+                reverted.append(version)
+        finally:
+            cursor.execute("SELECT pg_advisory_unlock(%s);", (MIGRATION_LOCK_ID,))
+
+    return reverted
+
+
+def status(directory: str = MIGRATIONS_DIR) -> list[tuple[Migration, bool]]:
+    """
+    Every known migration along with whether it is applied
+    """
+    with DatabaseConnection().get_cursor() as cursor:
+        _ensure_version_table(cursor)
+        applied = _applied_versions(cursor)
+
+    return [
+        (migration, migration.version in applied)
+        for migration in load_migrations(directory)
+    ]
+
+
+def main(args: list[str]):
+    command = args[0] if args else "up"
+    conn = DatabaseConnection()
+    conn.connect()
+
+    try:
+        if command == "up":
+            migrate()
+        elif command == "down":
+            reverted = rollback(int(args[1]) if len(args) > 1 else 1)
+            logger.info(f"Reverted {len(reverted)} migration(s)")
+        elif command == "status":
+            for migration, applied in status():
+                state = "applied" if applied else "pending"
+                logger.info(f"{migration.version:03d} {migration.name:<32}{state}")
+        else:
+            raise SystemExit(f"Unknown command {command}, expected up, down or status")
+    finally:
+        conn.disconnect()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main(sys.argv[1:])
@@ -1,6 +1,7 @@
 from .announcement import Announcement, AnnouncementRevision
 from .banform import BanForm
 from .exile import Exile
+from .moderation_event import ModerationEvent
 from .note import Note
 from .pending_exile import PendingExile
 from .strike import Strike
@@ -0,0 +1,18 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel
+
+from moddingway.constants import ModerationEventType
+
+
+class ModerationEvent(BaseModel):
+    event_type: ModerationEventType
+    actor_id: str | None = (
+        None  # discord id of the moderator, None for automatic actions
+    )
+    target_id: str | None = None  # discord id of the affected user
+    related_entity_id: int | None = None  # exile, strike, note or form id
+    reason: str | None = None
+    details: dict[str, Any] = {}
+    created_timestamp: datetime
@@ -0,0 +1,40 @@
+import logging
+
+from psycopg2.extras import Json, execute_values
+
+from . import DatabaseConnection
+from .models import ModerationEvent
+
+logger = logging.getLogger(__name__)
+
+
+def add_moderation_events(events: list[ModerationEvent]):
+    """
+    Append events to the moderation event log with a single multi-row insert
+    """
+    if len(events) == 0:
+        return
+
+    conn = DatabaseConnection()
+
+    with conn.get_cursor() as cursor:
+        query = """
+        INSERT INTO moderationEvents
+        (eventType, actorID, targetID, relatedEntityID, reason, details, createdTimestamp)
+        VALUES %s
+        """
+
+        rows = [
+            (
+                event.event_type.value,
+                event.actor_id,
+                event.target_id,
+                event.related_entity_id,
+                event.reason,
+                Json(event.details),
+                event.created_timestamp,
+            )
+            for event in events
+        ]
+
+        execute_values(cursor, query, rows, page_size=len(rows))
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from datetime import datetime
 
-from . import DatabaseConnection
+from . import DatabaseConnection, statements
 from .models import Note
 
 
@@ -62,21 +62,25 @@ def add_note(note: Note) -> int:
         return res[0]
 
 
+LIST_NOTES = statements.register(
+    "list_notes",
+    """
+    select n.noteid, n.isWarning, n.note, n.createdby, n.lastEditedBy, n.lastEditedTimestamp
+    from notes n
+    join users u on u.userID = n.userID
+    where u.userId = %s
+    order by n.createdtimestamp asc
+    """,
+)
+
+
 def list_notes(user_id: int) -> list[NoteDisplay]:
     conn = DatabaseConnection()
 
     with conn.get_cursor() as cursor:
-        query = """
-        select n.noteid, n.isWarning, n.note, n.createdby, n.lastEditedBy, n.lastEditedTimestamp
-        from notes n
-        join users u on u.userID = n.userID
-        where u.userId = %s
-        order by n.createdtimestamp asc
-        """
-
         params = (user_id,)
 
-        cursor.execute(query, params)
+        LIST_NOTES.execute(cursor, params)
         rows = cursor.fetchall()
 
         return [convert_row_to_note_display(row) for row in rows]
@@ -139,21 +143,25 @@ def update_note(
         return rows_affected == 1
 
 
+LIST_WARNINGS = statements.register(
+    "list_warnings",
+    """
+    select n.noteid, n.isWarning, n.note, n.createdby, n.lastEditedBy, n.lastEditedTimestamp
+    from notes n
+    join users u on u.userID = n.userID
+    where u.userId = %s and n.isWarning = true
+    order by n.createdtimestamp asc
+    """,
+)
+
+
 def list_warnings(user_id: int) -> list[NoteDisplay]:
     conn = DatabaseConnection()
 
     with conn.get_cursor() as cursor:
-        query = """
-        select n.noteid, n.isWarning, n.note, n.createdby, n.lastEditedBy, n.lastEditedTimestamp
-        from notes n
-        join users u on u.userID = n.userID
-        where u.userId = %s and n.isWarning = true
-        order by n.createdtimestamp asc
-        """
-
         params = (user_id,)
 
-        cursor.execute(query, params)
+        LIST_WARNINGS.execute(cursor, params)
         rows = cursor.fetchall()
 
         return [convert_row_to_note_display(row) for row in rows]
@@ -0,0 +1,65 @@
+"""
+Offset pagination returning a page and the total row count in a single
+statement, using a COUNT(*) OVER() window over the filtered rows.
+"""
+
+from collections.abc import Sequence
+
+from psycopg2.extensions import cursor
+
+
+def fetch_page(
+    cursor: cursor,
+    columns: str,
+    source: str,
+    order_by: str,
+    params: Sequence,
+    limit: int,
+    offset: int,
+) -> tuple[list[tuple], int]:
+    """
+    Run SELECT columns FROM source ORDER BY order_by LIMIT limit OFFSET offset
+    and return the rows along with the number of rows source matches.
+
+    columns, source and order_by are interpolated into the query, they must be
+    literals from the calling module and never user input. params are bound to
+    the placeholders in source.
+    """
+    query = f"""
+    SELECT {columns}, COUNT(*) OVER()
+    FROM {source}
+    ORDER BY {order_by}
+    LIMIT %s OFFSET %s;
+    """
+
+    cursor.execute(query, (*params, limit, offset))
+
+    res = cursor.fetchall()
+
+    if res:
+        return [row[:-1] for row in res], res[0][-1]
+    if offset == 0:
+        return [], 0
+
+    # requested past the last page, no row was left to carry the total
+    cursor.execute(f"SELECT COUNT(*) FROM {source};", params)
+    return [], cursor.fetchone()[0]
+
+
+def fetch_page_rows(
+    cursor: cursor,
+    columns: str,
+    source: str,
+    order_by: str,
+    params: Sequence,
+    limit: int,
+    offset: int,
+) -> list[tuple]:
+    """
+    fetch_page without the total, for callers that already know it
+    """
+    cursor.execute(
+        f"SELECT {columns} FROM {source} ORDER BY {order_by} LIMIT %s OFFSET %s;",
+        (*params, limit, offset),
+    )
+    return cursor.fetchall()
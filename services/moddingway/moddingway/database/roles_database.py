@@ -1,6 +1,6 @@
 import logging
 
-from . import DatabaseConnection
+from . import DatabaseConnection, statements
 
 logger = logging.getLogger(__name__)
 
@@ -34,16 +34,20 @@ def remove_sticky_roles(user_id: int):
         return res
 
 
+GET_STICKY_ROLES = statements.register(
+    "get_sticky_roles",
+    """
+    SELECT roleID FROM roles WHERE userID = %s
+    """,
+)
+
+
 def get_sticky_roles(user_id: int):
     conn = DatabaseConnection()
     with conn.get_cursor() as cursor:
-        query = """
-            SELECT roleID FROM roles WHERE userID = %s
-        """
-
         params = (user_id,)
 
-        cursor.execute(query, params)
+        GET_STICKY_ROLES.execute(cursor, params)
         res = cursor.fetchall()
         if res is not None:
             return [x[0] for x in res]
@@ -0,0 +1,92 @@
+"""
+Server side prepared statements for the hot read queries.
+
+Statements are registered once at import time with the usual %s placeholders
+and prepared lazily, the first time they run on each pooled connection.
+Later calls only send EXECUTE, so Postgres skips parsing and planning. A new
+connection, after a reconnect for instance, starts with nothing prepared.
+A session reset on the server side (DISCARD ALL) is caught and the statement
+is prepared again.
+
+    GET_USER = statements.register("get_user", "SELECT ... WHERE id = %s")
+
+    GET_USER.execute(cursor, (user_id,))
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+
+from psycopg2 import errors
+from psycopg2.extensions import cursor
+
+from .connection import PooledConnection
+
+logger = logging.getLogger(__name__)
+
+STATEMENT_NAME = re.compile(r"^[a-z_][a-z0-9_]*$")
+# SQLSTATE of a missing prepared statement, psycopg2 only creates the error
+# classes at runtime
+InvalidSqlStatementName = errors.lookup("26000")
+
+
+@dataclass(frozen=True)
+class PreparedStatement:
+    name: str
+    query: str  # with %s placeholders, executed as is outside of the pool
+    _prepare_sql: str = field(init=False, repr=False)
+    _execute_sql: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        parts = self.query.strip().rstrip(";").split("%s")
+        body = parts[0] + "".join(
+            f"${index}{part}" for index, part in enumerate(parts[1:], start=1)
+        )
+        arguments = ", ".join(["%s"] * (len(parts) - 1))
+
+        object.__setattr__(self, "_prepare_sql", f"PREPARE {self.name} AS {body}")
+        object.__setattr__(
+            self,
+            "_execute_sql",
+            f"EXECUTE {self.name} ({arguments})"
+            if arguments
+            else f"EXECUTE {self.name}",
+        )
+
+    def execute(self, cursor: cursor, params: tuple = ()):
+        conn = cursor.connection
+        if not isinstance(conn, PooledConnection):
+            cursor.execute(self.query, params)
+            return
+
+        if self.name not in conn.prepared_statements:
+            self._prepare(cursor)
+
+        try:
+            cursor.execute(self._execute_sql, params)
+        except InvalidSqlStatementName:
+            # the server session lost its prepared statements
+            logger.warning(
+                f"Prepared statement {self.name} was missing, preparing it again"
+            )
+            conn.prepared_statements.clear()
+            self._prepare(cursor)
+            cursor.execute(self._execute_sql, params)
+
+    def _prepare(self, cursor: cursor):
+        cursor.execute(self._prepare_sql)
+        cursor.connection.prepared_statements.add(self.name)
+
+
+registry: dict[str, PreparedStatement] = {}
+
+
+def register(name: str, query: str) -> PreparedStatement:
+    if not STATEMENT_NAME.match(name):
+        raise ValueError(f"Invalid prepared statement name {name}")
+    if name in registry:
+        raise ValueError(f"Prepared statement {name} is already registered")
+
+    statement = PreparedStatement(name, query)
+    registry[name] = statement
+    return statement
@@ -1,20 +1,41 @@
-from . import DatabaseConnection
-from .models import Strike
-
-
-def add_strike(strike: Strike) -> int:
+from . import DatabaseConnection, statements, users_database
+from .models import Strike, User
+
+
+def add_strike(
+    strike: Strike, temporary_points: int, permanent_points: int
+) -> tuple[int, User]:
+    """
+    Insert the strike and add its points to the user in one statement, returns
+    the strike id and the updated user. The user row stays locked until the
+    statement commits, so concurrent strikes on a user cannot lose points.
+    """
     conn = DatabaseConnection()
 
     with conn.get_cursor() as cursor:
         query = """
-            INSERT INTO strikes
-            (userID, severity, reason, createdTimestamp, createdBy, lastEditedTimestamp, lastEditedBy)
-            VALUES
-            (%s, %s, %s, %s, %s, %s, %s)
-            RETURNING strikeId
+            WITH updated AS (
+                UPDATE users SET
+                temporaryPoints = decayedTemporaryPoints(temporaryPoints, lastInfractionTimestamp, isBanned) + %s,
+                permanentPoints = permanentPoints + %s,
+                lastInfractionTimestamp = %s
+                WHERE userID = %s
+                RETURNING userID, discordUserID, discordGuildID, userRole, temporaryPoints, permanentPoints, lastInfractionTimestamp, isBanned
+            ), inserted AS (
+                INSERT INTO strikes
+                (userID, severity, reason, createdTimestamp, createdBy, lastEditedTimestamp, lastEditedBy)
+                SELECT userID, %s, %s, %s, %s, %s, %s
+                FROM updated
+                RETURNING strikeId
+            )
+            SELECT u.*, i.strikeId
+            FROM updated u, inserted i
         """
 
         params = (
+            temporary_points,
+            permanent_points,
+            strike.created_timestamp,
             strike.user_id,
             strike.severity,
             strike.reason,
@@ -30,24 +51,28 @@ def add_strike(strike: Strike) -> int:
         if res is None:
             raise ValueError("Failed to add strike to DB")
 
-        return res[0]
+        return res[8], users_database.cache_user_row(res[:8])
+
+
+LIST_STRIKES = statements.register(
+    "list_strikes",
+    """
+    select s.strikeid, s.severity, s.reason, s.createdby, s.createdtimestamp
+    from strikes s
+    join users u on u.userID = s.userID
+    where u.userId = %s
+    order by s.createdtimestamp asc
+    """,
+)
 
 
 def list_strikes(user_id: int) -> list[tuple]:
     conn = DatabaseConnection()
 
     with conn.get_cursor() as cursor:
-        query = """
-        select s.strikeid, s.severity, s.reason, s.createdby, s.createdtimestamp
-        from strikes s
-        join users u on u.userID = s.userID
-        where u.userId = %s
-        order by s.createdtimestamp asc
-        """
-
         params = (user_id,)
 
-        cursor.execute(query, params)
+        LIST_STRIKES.execute(cursor, params)
         res = cursor.fetchall()
 
         return res
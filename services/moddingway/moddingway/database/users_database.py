@@ -1,86 +1,155 @@
 import logging
+from dataclasses import dataclass
 
-from moddingway.constants import UserRole
 from moddingway.settings import get_settings
 
-from . import DatabaseConnection
+from . import DatabaseConnection, statements
+from .cache import TTLCache
+from .counts import Count, count_cache, fetch_counted_page, get_count
 from .models import User
 
 settings = get_settings()
 
 logger = logging.getLogger(__name__)
 
+# users keyed by discordUserID, every write below goes through it
+user_cache: TTLCache[str, User] = TTLCache(
+    max_size=settings.user_cache_size,
+    ttl=settings.user_cache_ttl,
+    copy=lambda user: user.model_copy(),
+)
+
+
+@dataclass
+class BanCorrections:
+    banned: int  # known users flagged as banned
+    unbanned: int
+    created: int  # banned users that had no record yet
+
+
+def _row_to_user(row: tuple) -> User:
+    return User(
+        user_id=row[0],
+        discord_user_id=row[1],
+        discord_guild_id=row[2],
+        user_role=row[3],
+        temporary_points=row[4],
+        permanent_points=row[5],
+        last_infraction_timestamp=row[6],
+        is_banned=row[7],
+    )
+
+
+def cache_user_row(row: tuple) -> User:
+    """
+    Map a row holding the full user record and write it through the user cache
+    """
+    user = _row_to_user(row)
+    user_cache.put(user.discord_user_id, user)
+    return user
+
+
+def cache_returned_user(res: tuple | None) -> User | None:
+    """
+    cache_user_row for a RETURNING row that may be missing
+    """
+    if res is None:
+        return None
+
+    return cache_user_row(res)
+
+
+GET_USER = statements.register(
+    "get_user",
+    """
+    SELECT
+    u.userid, u.discordUserId, u.discordGuildId, u.userRole, u.temporaryPoints, u.permanentPoints, u.lastInfractionTimestamp, u.isBanned
+    FROM effectiveUsers u
+    where u.discorduserid = %s
+    """,
+)
+
 
 def get_user(discord_user_id: int) -> User | None:
+    cached_user = user_cache.get(str(discord_user_id))
+    if cached_user is not None:
+        return cached_user
+
     conn = DatabaseConnection()
 
     with conn.get_cursor() as cursor:
-        query = """
-        SELECT
-        u.userid, u.discordUserId, u.discordGuildId, u.userRole, u.temporaryPoints, u.permanentPoints, u.lastInfractionTimestamp, u.isBanned
-        FROM users u
-        where u.discorduserid = %s
-        """
-
         params = (str(discord_user_id),)
 
-        cursor.execute(query, params)
+        GET_USER.execute(cursor, params)
 
         res = cursor.fetchone()
 
         if res:
-            return User(
-                user_id=res[0],
-                discord_user_id=res[1],
-                discord_guild_id=res[2],
-                user_role=res[3],
-                temporary_points=res[4],
-                permanent_points=res[5],
-                last_infraction_timestamp=res[6],
-                is_banned=res[7],
-            )
+            user = _row_to_user(res)
+            user_cache.put(user.discord_user_id, user)
+            return user
 
 
-def get_users(limit: int, offset: int) -> list[User]:
+def get_users_page(limit: int, offset: int) -> tuple[list[User], Count]:
+    """
+    Return a page of users ordered by userID along with the total user count
+    """
+    conn = DatabaseConnection()
+
+    with conn.get_cursor() as cursor:
+        rows, total = fetch_counted_page(
+            cursor, "users", columns="*", order_by="userID", limit=limit, offset=offset
+        )
+
+        return [_row_to_user(row) for row in rows], total
+
+
+def get_users_after(after_user_id: int, limit: int) -> list[User]:
+    """
+    Keyset pagination over users, returns up to limit users with a userID
+    greater than after_user_id. Walks the primary key index, so every page
+    costs the same regardless of how deep it is.
+    """
     conn = DatabaseConnection()
 
     with conn.get_cursor() as cursor:
         query = """
-        SELECT * FROM users
-        LIMIT %s OFFSET %s;
+        SELECT * FROM effectiveUsers
+        WHERE userID > %s
+        ORDER BY userID
+        LIMIT %s;
         """
 
-        params = (limit, offset)
+        params = (after_user_id, limit)
 
         cursor.execute(query, params)
 
-        res = cursor.fetchall()
+        return [_row_to_user(row) for row in cursor.fetchall()]
+
+
+def get_or_create_user(discord_user_id: int) -> tuple[User, bool]:
+    """
+    Return the user record of discord_user_id, creating it if it does not
+    exist yet, along with whether it was created. A single upsert, so
+    concurrent events for a new user cannot insert it twice.
+    """
+    cached_user = user_cache.get(str(discord_user_id))
+    if cached_user is not None:
+        return cached_user, False
 
-        if res:
-            return [
-                User(
-                    user_id=row[0],
-                    discord_user_id=row[1],
-                    discord_guild_id=row[2],
-                    user_role=row[3],
-                    temporary_points=row[4],
-                    permanent_points=row[5],
-                    last_infraction_timestamp=row[6],
-                    is_banned=row[7],
-                )
-                for row in res
-            ]
-        return []
-
-
-def add_user(discord_user_id: int) -> User:
     conn = DatabaseConnection()
 
     with conn.get_cursor() as cursor:
+        # the update makes RETURNING yield the row when it already exists and
+        # stores its decayed points, xmax is only 0 on a freshly inserted row
         query = """
             INSERT INTO users (discordUserId, discordGuildId)
             VALUES (%s, %s)
-            RETURNING userId
+            ON CONFLICT (discordUserId, discordGuildId)
+            DO UPDATE SET
+            temporaryPoints = decayedTemporaryPoints(users.temporaryPoints, users.lastInfractionTimestamp, users.isBanned),
+            lastInfractionTimestamp = decayedLastInfraction(users.temporaryPoints, users.lastInfractionTimestamp, users.isBanned)
+            RETURNING userID, discordUserID, discordGuildID, userRole, temporaryPoints, permanentPoints, lastInfractionTimestamp, isBanned, (xmax = 0)
         """
 
         params = (str(discord_user_id), str(settings.guild_id))
@@ -92,16 +161,13 @@ def add_user(discord_user_id: int) -> User:
         if res is None:
             raise ValueError("Failed to create user record in DB")
 
-        logger.info(f"Created user record in DB with id {res[0]}")
-        return User(
-            user_id=res[0],
-            discord_user_id=str(discord_user_id),
-            discord_guild_id=str(settings.guild_id),
-            user_role=UserRole.USER,
-            temporary_points=0,
-            permanent_points=0,
-            is_banned=False,
-        )
+    user = _row_to_user(res)
+    created = res[8]
+    if created:
+        logger.info(f"Created user record in DB with id {user.user_id}")
+        count_cache.invalidate("users")
+    user_cache.put(user.discord_user_id, user)
+    return user, created
 
 
 def update_user_strike_points(user: User):
@@ -114,6 +180,7 @@ def update_user_strike_points(user: User):
             permanentPoints = %s,
             lastInfractionTimestamp = %s
             WHERE userId = %s
+            RETURNING userID, discordUserID, discordGuildID, userRole, temporaryPoints, permanentPoints, lastInfractionTimestamp, isBanned
         """
 
         params = (
@@ -125,38 +192,11 @@ def update_user_strike_points(user: User):
 
         cursor.execute(query, params)
 
+        cache_returned_user(cursor.fetchone())
 
-def decrement_old_strike_points() -> int:
-    conn = DatabaseConnection()
-
-    with conn.get_cursor() as cursor:
-        query = """
-            UPDATE users SET
-            temporarypoints = temporarypoints - 1,
-            lastinfractiontimestamp = lastinfractiontimestamp + INTERVAL '90 day'
-            WHERE temporarypoints  > 0
-            AND lastinfractiontimestamp < current_date - INTERVAL '90 day'
-            AND isBanned = false
-        """
-
-        cursor.execute(query)
-
-        return cursor.rowcount
-
-
-def get_user_count() -> int:
-    conn = DatabaseConnection()
-
-    with conn.get_cursor() as cursor:
-        query = """
-            SELECT COUNT(*)
-            FROM users
-        """
-
-        cursor.execute(query)
 
-        result = cursor.fetchall()
-        return result[0][0]
+def get_user_count() -> Count:
+    return get_count("users")
 
 
 def decrement_user_strike_points(
@@ -167,9 +207,11 @@ def decrement_user_strike_points(
     with conn.get_cursor() as cursor:
         query = """
             UPDATE users SET
-            temporarypoints = GREATEST(temporarypoints - %s, 0),
-            permanentPoints = GREATEST(permanentPoints - %s, 0)
+            temporarypoints = GREATEST(decayedTemporaryPoints(temporaryPoints, lastInfractionTimestamp, isBanned) - %s, 0),
+            permanentPoints = GREATEST(permanentPoints - %s, 0),
+            lastInfractionTimestamp = decayedLastInfraction(temporaryPoints, lastInfractionTimestamp, isBanned)
             WHERE userID = %s
+            RETURNING userID, discordUserID, discordGuildID, userRole, temporaryPoints, permanentPoints, lastInfractionTimestamp, isBanned
         """
 
         params = (
@@ -179,54 +221,40 @@ def decrement_user_strike_points(
         )
         cursor.execute(query, params)
 
+        cache_returned_user(cursor.fetchone())
+
+
+def get_mod_count() -> Count:
+    return get_count("mods")
 
-def get_mod_count() -> int:
+
+def get_mods_page(limit: int, offset: int) -> tuple[list[User], Count]:
     conn = DatabaseConnection()
 
     with conn.get_cursor() as cursor:
-        query = """
-            SELECT COUNT(*)
-            FROM users
-            WHERE userrole = %s
-        """
-        params = (2,)
-        cursor.execute(query, params)
+        rows, total = fetch_counted_page(
+            cursor, "mods", columns="*", order_by="userID", limit=limit, offset=offset
+        )
 
-        result = cursor.fetchall()
-        return result[0][0]
+        return [_row_to_user(row) for row in rows], total
 
 
-def get_mods(limit: int, offset: int) -> list[User]:
+def get_mods_after(after_user_id: int, limit: int) -> list[User]:
     conn = DatabaseConnection()
 
     with conn.get_cursor() as cursor:
         query = """
-        SELECT * FROM users
-        WHERE userrole = %s
-        LIMIT %s OFFSET %s;
+        SELECT * FROM effectiveUsers
+        WHERE userrole = %s AND userID > %s
+        ORDER BY userID
+        LIMIT %s;
         """
 
-        params = (2, limit, offset)
+        params = (2, after_user_id, limit)
 
         cursor.execute(query, params)
 
-        res = cursor.fetchall()
-
-        if res:
-            return [
-                User(
-                    user_id=row[0],
-                    discord_user_id=row[1],
-                    discord_guild_id=row[2],
-                    user_role=row[3],
-                    temporary_points=row[4],
-                    permanent_points=row[5],
-                    last_infraction_timestamp=row[6],
-                    is_banned=row[7],
-                )
-                for row in res
-            ]
-        return []
+        return [_row_to_user(row) for row in cursor.fetchall()]
 
 
 def update_user(user: User):
@@ -240,6 +268,7 @@ def update_user(user: User):
             lastInfractionTimestamp = %s,
             isBanned = %s
             WHERE userId = %s
+            RETURNING userID, discordUserID, discordGuildID, userRole, temporaryPoints, permanentPoints, lastInfractionTimestamp, isBanned
         """
 
         params = (
@@ -252,51 +281,125 @@ def update_user(user: User):
 
         cursor.execute(query, params)
 
+        cache_returned_user(cursor.fetchone())
+
+    count_cache.invalidate("banned_users")
 
-def get_banned_users(limit: int, offset: int) -> list[User]:
+
+def get_banned_users_page(limit: int, offset: int) -> tuple[list[User], Count]:
+    conn = DatabaseConnection()
+
+    with conn.get_cursor() as cursor:
+        rows, total = fetch_counted_page(
+            cursor,
+            "banned_users",
+            columns="*",
+            order_by="userID",
+            limit=limit,
+            offset=offset,
+        )
+
+        return [_row_to_user(row) for row in rows], total
+
+
+def get_banned_users_after(after_user_id: int, limit: int) -> list[User]:
     conn = DatabaseConnection()
 
     with conn.get_cursor() as cursor:
         query = """
-        SELECT * FROM users
-        WHERE isBanned = %s
-        LIMIT %s OFFSET %s;
+        SELECT * FROM effectiveUsers
+        WHERE isBanned = %s AND userID > %s
+        ORDER BY userID
+        LIMIT %s;
         """
 
-        params = (True, limit, offset)
+        params = (True, after_user_id, limit)
 
         cursor.execute(query, params)
 
-        res = cursor.fetchall()
+        return [_row_to_user(row) for row in cursor.fetchall()]
 
-        if res:
-            return [
-                User(
-                    user_id=row[0],
-                    discord_user_id=row[1],
-                    discord_guild_id=row[2],
-                    user_role=row[3],
-                    temporary_points=row[4],
-                    permanent_points=row[5],
-                    last_infraction_timestamp=row[6],
-                    is_banned=row[7],
-                )
-                for row in res
-            ]
-        return []
-
-
-def get_banned_count() -> int:
+
+def get_banned_count() -> Count:
+    return get_count("banned_users")
+
+
+def get_banned_discord_user_ids() -> set[str]:
     conn = DatabaseConnection()
 
     with conn.get_cursor() as cursor:
         query = """
-            SELECT COUNT(*)
-            FROM users
-            WHERE isBanned = %s
+        SELECT discordUserID FROM users
+        WHERE isBanned AND discordGuildID = %s
         """
-        params = (True,)
+
+        params = (str(settings.guild_id),)
+
         cursor.execute(query, params)
 
-        result = cursor.fetchall()
-        return result[0][0]
+        return {row[0] for row in cursor.fetchall()}
+
+
+def apply_ban_corrections(
+    banned_ids: list[str], unbanned_ids: list[str]
+) -> BanCorrections:
+    """
+    Set isBanned on every user of banned_ids and clear it on every user of
+    unbanned_ids in a single statement, whatever the number of users. Banned
+    users without a record are created.
+    """
+    conn = DatabaseConnection()
+
+    with conn.get_cursor() as cursor:
+        query = """
+            WITH corrections AS (
+                SELECT * FROM unnest(%s::varchar[], %s::bool[]) AS c(discordUserID, isBanned)
+            ),
+            updated AS (
+                UPDATE users u
+                SET isBanned = c.isBanned,
+                temporaryPoints = decayedTemporaryPoints(u.temporaryPoints, u.lastInfractionTimestamp, u.isBanned),
+                lastInfractionTimestamp = decayedLastInfraction(u.temporaryPoints, u.lastInfractionTimestamp, u.isBanned)
+                FROM corrections c
+                WHERE u.discordUserID = c.discordUserID
+                AND u.discordGuildID = %s
+                AND u.isBanned <> c.isBanned
+                RETURNING u.discordUserID, u.isBanned
+            ),
+            inserted AS (
+                INSERT INTO users (discordUserID, discordGuildID, isBanned)
+                SELECT c.discordUserID, %s, true
+                FROM corrections c
+                WHERE c.isBanned
+                ON CONFLICT (discordUserID, discordGuildID) DO NOTHING
+                RETURNING discordUserID
+            )
+            SELECT discordUserID, isBanned, false FROM updated
+            UNION ALL
+            SELECT discordUserID, true, true FROM inserted
+        """
+
+        params = (
+            banned_ids + unbanned_ids,
+            [True] * len(banned_ids) + [False] * len(unbanned_ids),
+            str(settings.guild_id),
+            str(settings.guild_id),
+        )
+
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+
+    corrections = BanCorrections(banned=0, unbanned=0, created=0)
+    for discord_user_id, is_banned, created in rows:
+        user_cache.invalidate(discord_user_id)
+        if created:
+            corrections.created += 1
+        elif is_banned:
+            corrections.banned += 1
+        else:
+            corrections.unbanned += 1
+
+    count_cache.invalidate("banned_users")
+    if corrections.created:
+        count_cache.invalidate("users")
+    return corrections
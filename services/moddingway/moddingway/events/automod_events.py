@@ -0,0 +1,49 @@
+from datetime import datetime
+
+import discord
+from discord.ext.commands import Bot
+
+from moddingway.workers.forum_automod import (
+    forget_pins,
+    message_scheduler,
+    schedule_message,
+    schedule_thread,
+    thread_scheduler,
+)
+
+
+def register_automod_events(bot: Bot):
+    # a listener rather than an event, so Bot.on_message keeps handling commands
+    @bot.listen()
+    async def on_message(message: discord.Message):
+        if isinstance(message.channel, discord.Thread):
+            schedule_thread(message.channel, message.created_at)
+        else:
+            schedule_message(message)
+
+    @bot.event
+    async def on_raw_message_delete(payload: discord.RawMessageDeleteEvent):
+        message_scheduler.cancel((payload.channel_id, payload.message_id))
+
+    @bot.event
+    async def on_raw_bulk_message_delete(payload: discord.RawBulkMessageDeleteEvent):
+        for message_id in payload.message_ids:
+            message_scheduler.cancel((payload.channel_id, message_id))
+
+    @bot.event
+    async def on_guild_channel_pins_update(
+        channel: discord.abc.GuildChannel | discord.Thread, last_pin: datetime | None
+    ):
+        forget_pins(channel.id)
+
+    @bot.event
+    async def on_thread_create(thread: discord.Thread):
+        schedule_thread(thread)
+
+    @bot.event
+    async def on_thread_update(before: discord.Thread, after: discord.Thread):
+        schedule_thread(after)
+
+    @bot.event
+    async def on_raw_thread_delete(payload: discord.RawThreadDeleteEvent):
+        thread_scheduler.cancel(payload.thread_id)
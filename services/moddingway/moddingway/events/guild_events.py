@@ -0,0 +1,31 @@
+import logging
+
+import discord
+from discord.ext.commands import Bot
+
+from moddingway.util import role_index
+
+logger = logging.getLogger(__name__)
+
+
+def register_guild_events(bot: Bot):
+    @bot.event
+    async def on_guild_available(guild: discord.Guild):
+        role_index.rebuild(guild)
+        logger.debug(f"Indexed {len(guild.roles)} roles of guild {guild.id}")
+
+    @bot.event
+    async def on_guild_unavailable(guild: discord.Guild):
+        role_index.forget(guild)
+
+    @bot.event
+    async def on_guild_role_create(role: discord.Role):
+        role_index.rebuild(role.guild)
+
+    @bot.event
+    async def on_guild_role_update(before: discord.Role, after: discord.Role):
+        role_index.rebuild(after.guild)
+
+    @bot.event
+    async def on_guild_role_delete(role: discord.Role):
+        role_index.rebuild(role.guild)
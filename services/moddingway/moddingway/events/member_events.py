@@ -4,8 +4,9 @@ from datetime import UTC, datetime
 from discord import Guild, User
 from discord.ext.commands import Bot
 
-from moddingway.constants import Role
-from moddingway.database import users_database
+from moddingway.constants import ModerationEventType, Role
+from moddingway.database.aio import users_database
+from moddingway.moderation_log import moderation_log
 from moddingway.settings import get_settings
 from moddingway.util import (
     create_interaction_embed_context,
@@ -13,6 +14,7 @@ from moddingway.util import (
     get_log_channel,
     log_info_and_add_field,
 )
+from moddingway.workers.ban_reconciliation import ban_events
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
@@ -66,13 +68,11 @@ def register_events(bot: Bot):
     async def on_member_ban(guild: Guild, user: User):
         logger.info(f"Ban member {user.id}")
 
-        db_user = users_database.get_user(user.id)
-        if db_user is None:
-            db_user = users_database.add_user(user.id)
-
-        db_user.is_banned = True
-
-        users_database.update_user(db_user)
+        async with ban_events.event_write(user.id):
+            db_user, _ = await users_database.get_or_create_user(user.id)
+            db_user.is_banned = True
+            await users_database.update_user(db_user)
+        moderation_log.record(ModerationEventType.BAN, user.id)
 
         # Addition of logging embed
         log_channel = get_log_channel(guild)
@@ -98,13 +98,12 @@ def register_events(bot: Bot):
     @bot.event
     async def on_member_unban(guild: Guild, user: User):
         logger.info(f"Unban member {user.id}")
-        db_user = users_database.get_user(user.id)
-        if db_user is None:
-            db_user = users_database.add_user(user.id)
-
-        db_user.is_banned = False
 
-        users_database.update_user(db_user)
+        async with ban_events.event_write(user.id):
+            db_user, _ = await users_database.get_or_create_user(user.id)
+            db_user.is_banned = False
+            await users_database.update_user(db_user)
+        moderation_log.record(ModerationEventType.UNBAN, user.id)
 
         # Addition of logging embed
         log_channel = get_log_channel(guild)
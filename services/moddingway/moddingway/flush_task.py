@@ -0,0 +1,40 @@
+import asyncio
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+
+class FlushTask:
+    """
+    Background task of a buffer flushed in batches. It is started on the
+    running loop the first time something is buffered, run receives the event
+    used to wake it up before its next interval.
+    """
+
+    def __init__(
+        self, name: str, run: Callable[[asyncio.Event], Coroutine[Any, Any, None]]
+    ):
+        self.name = name
+        self._run = run
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    def ensure_started(self) -> asyncio.Event:
+        """
+        Start the task if it is not running, returns the event waking it up
+        """
+        if (
+            self._wakeup is not None
+            and self._task is not None
+            and not self._task.done()
+        ):
+            return self._wakeup
+
+        wakeup = asyncio.Event()
+        self._wakeup = wakeup
+        self._task = asyncio.create_task(self._run(wakeup), name=self.name)
+        return wakeup
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+from collections.abc import Iterator
+
+import discord
+
+from moddingway.flush_task import FlushTask
+
+logger = logging.getLogger(__name__)
+
+# Discord's limits on the embeds of a single message
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARACTERS_PER_MESSAGE = 6000
+HTTP_TOO_MANY_REQUESTS = 429
+
+
+class LogSink:
+    """
+    Queue of embeds for the log channels. Callers hand over embeds without
+    waiting on Discord, a background task sends them every flush_interval
+    seconds, packing up to 10 embeds into each message. Sends that still hit
+    a 429 after discord.py's own retries are retried with a backoff.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 1.0,
+        max_pending: int = 1000,
+        max_attempts: int = 5,
+    ):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        self._pending: list[tuple[discord.abc.Messageable, discord.Embed]] = []
+        self._flush_task = FlushTask("log-sink", self._run)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def submit(self, channel: discord.abc.Messageable, embed: discord.Embed):
+        if len(self._pending) >= self.max_pending:
+            logger.error(f"Log sink is full, dropping embed: {embed.description}")
+            return
+
+        self._pending.append((channel, embed))
+        self._flush_task.ensure_started().set()
+
+    async def flush(self):
+        """
+        Send every pending embed now. Embeds stay pending until their batch is
+        sent or given up on, so a flush cancelled at shutdown loses nothing.
+        """
+        channels: dict[
+            int,
+            tuple[
+                discord.abc.Messageable,
+                list[tuple[discord.abc.Messageable, discord.Embed]],
+            ],
+        ] = {}
+        for entry in self._pending:
+            channels.setdefault(id(entry[0]), (entry[0], []))[1].append(entry)
+
+        for channel, entries in channels.values():
+            for batch in _batch_entries(entries):
+                await self._send(channel, [embed for _, embed in batch])
+                done = {id(entry) for entry in batch}
+                self._pending = [
+                    entry for entry in self._pending if id(entry) not in done
+                ]
+
+    async def close(self):
+        self._flush_task.stop()
+        await self.flush()
+
+    async def _run(self, has_pending: asyncio.Event):
+        while True:
+            await has_pending.wait()
+            # let the embeds of a burst pile up before sending them
+            await asyncio.sleep(self.flush_interval)
+            has_pending.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Log sink flush failed")
+
+    async def _send(
+        self, channel: discord.abc.Messageable, embeds: list[discord.Embed]
+    ):
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                await channel.send(embeds=embeds)
+                return
+            except discord.HTTPException as e:
+                if e.status != HTTP_TOO_MANY_REQUESTS or attempt == self.max_attempts:
+                    logger.error(
+                        f"Failed to send {len(embeds)} log embeds: {e}", exc_info=e
+                    )
+                    return
+                await asyncio.sleep(2**attempt)
+            except Exception as e:
+                logger.error(
+                    f"Failed to send {len(embeds)} log embeds: {e}", exc_info=e
+                )
+                return
+
+
+def _batch_entries[T](
+    entries: list[tuple[T, discord.Embed]],
+) -> Iterator[list[tuple[T, discord.Embed]]]:
+    batch: list[tuple[T, discord.Embed]] = []
+    characters = 0
+    for entry in entries:
+        embed = entry[1]
+        if batch and (
+            len(batch) == MAX_EMBEDS_PER_MESSAGE
+            or characters + len(embed) > MAX_EMBED_CHARACTERS_PER_MESSAGE
+        ):
+            yield batch
+            batch = []
+            characters = 0
+        batch.append(entry)
+        characters += len(embed)
+
+    if batch:
+        yield batch
+
+
+log_sink = LogSink()
@@ -0,0 +1,101 @@
+import asyncio
+import logging
+from contextvars import ContextVar
+from datetime import UTC, datetime
+
+from moddingway.constants import ModerationEventType
+from moddingway.database.aio import moderation_events_database
+from moddingway.database.models import ModerationEvent
+from moddingway.flush_task import FlushTask
+
+logger = logging.getLogger(__name__)
+
+# discord id of the moderator whose command is running, set by
+# commands.helper.create_logging_embed
+moderation_actor: ContextVar[int | None] = ContextVar("moderation_actor", default=None)
+
+
+class ModerationLog:
+    """
+    Buffers moderation events and appends them to the moderationEvents table
+    in batches from a background task, recording an event never waits on the
+    database. A failed write is retried on the next flush, as long as the
+    buffer stays under max_pending events.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 2.0,
+        batch_size: int = 500,
+        max_pending: int = 10000,
+    ):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self._pending: list[ModerationEvent] = []
+        self._flush_task = FlushTask("moderation-log", self._run)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def record(
+        self,
+        event_type: ModerationEventType,
+        target_id: int | str | None = None,
+        related_entity_id: int | None = None,
+        reason: str | None = None,
+        actor_id: int | str | None = None,
+        **details,
+    ):
+        """
+        Queue an event, the actor defaults to the moderator running the
+        current command
+        """
+        if actor_id is None:
+            actor_id = moderation_actor.get()
+
+        event = ModerationEvent(
+            event_type=event_type,
+            actor_id=None if actor_id is None else str(actor_id),
+            target_id=None if target_id is None else str(target_id),
+            related_entity_id=related_entity_id,
+            reason=reason,
+            details=details,
+            created_timestamp=datetime.now(UTC),
+        )
+
+        if len(self._pending) >= self.max_pending:
+            logger.error(f"Moderation log is full, dropping event {event}")
+            return
+
+        self._pending.append(event)
+        has_pending = self._flush_task.ensure_started()
+        if len(self._pending) >= self.batch_size:
+            has_pending.set()
+
+    async def flush(self):
+        while self._pending:
+            batch = self._pending[: self.batch_size]
+            try:
+                await moderation_events_database.add_moderation_events(batch)
+            except Exception:
+                logger.exception(f"Failed to write {len(batch)} moderation events")
+                return
+            del self._pending[: len(batch)]
+
+    async def close(self):
+        self._flush_task.stop()
+        await self.flush()
+
+    async def _run(self, has_pending: asyncio.Event):
+        while True:
+            # flush every interval, or as soon as a full batch is waiting
+            try:
+                await asyncio.wait_for(has_pending.wait(), self.flush_interval)
+            except TimeoutError:
+                pass
+            has_pending.clear()
+            await self.flush()
+
+
+moderation_log = ModerationLog()
@@ -0,0 +1,67 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+HTTP_TOO_MANY_REQUESTS = 429
+
+
+class AdaptivePacer:
+    """
+    Spaces out a stream of Discord requests, additive decrease of the delay
+    while requests go through, multiplicative increase once they get throttled.
+
+    discord.py does not expose the rate limit headers to callers, it honours
+    them itself by sleeping before or retrying a request. A call that takes
+    longer than slow_call is therefore read as having hit a rate limit, as is
+    a 429 surfacing as an HTTPException. The pacer is safe to share between
+    tasks, the delay is kept between any two calls made through it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        min_delay: float = 0.0,
+        max_delay: float = 5.0,
+        step: float = 0.1,
+        backoff: float = 2.0,
+        slow_call: float = 1.0,
+    ):
+        self.name = name
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.step = step
+        self.backoff = backoff
+        self.slow_call = slow_call
+        self.delay = min_delay
+        self._next_call = 0.0
+
+    async def call[T](self, func: Callable[..., Awaitable[T]], *args, **kwargs) -> T:
+        now = time.monotonic()
+        wait = self._next_call - now
+        # reserve the slot before sleeping so concurrent callers queue up behind
+        self._next_call = max(now, self._next_call) + self.delay
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        started = time.monotonic()
+        try:
+            result = await func(*args, **kwargs)
+        except discord.HTTPException as e:
+            if e.status == HTTP_TOO_MANY_REQUESTS:
+                self.throttled()
+            raise
+
+        if time.monotonic() - started >= self.slow_call:
+            self.throttled()
+        else:
+            self.delay = max(self.min_delay, self.delay - self.step)
+        return result
+
+    def throttled(self):
+        self.delay = min(self.max_delay, max(self.delay * self.backoff, self.step))
+        logger.debug(f"{self.name} pacer throttled, delay is now {self.delay:.2f}s")
@@ -0,0 +1,112 @@
+import asyncio
+import heapq
+import itertools
+import logging
+from collections.abc import Awaitable, Callable, Hashable
+from datetime import UTC, datetime
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineScheduler[K: Hashable]:
+    """
+    Keeps one deadline per key and sleeps until the earliest one, then hands
+    every key that is due to the handler in a single batch. Rescheduling a key
+    replaces its previous deadline, cancelled and replaced entries are dropped
+    lazily when they reach the top of the heap.
+
+    Naive datetimes are read as UTC, matching the TIMESTAMP columns.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._deadlines: dict[K, float] = {}
+        self._heap: list[tuple[float, int, K]] = []
+        self._counter = itertools.count()
+        self._changed: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def schedule(self, key: K, deadline: datetime):
+        if deadline.tzinfo is None:
+            deadline = deadline.replace(tzinfo=UTC)
+
+        at = deadline.timestamp()
+        if self._deadlines.get(key) == at:
+            return
+
+        self._deadlines[key] = at
+        heapq.heappush(self._heap, (at, next(self._counter), key))
+        if self._heap[0][2] == key and self._changed is not None:
+            self._changed.set()
+
+    def cancel(self, key: K):
+        # the heap entry is skipped once it surfaces
+        self._deadlines.pop(key, None)
+
+    def next_deadline(self) -> datetime | None:
+        self._discard_stale()
+        if not self._heap:
+            return None
+        return datetime.fromtimestamp(self._heap[0][0], UTC)
+
+    def start(self, handler: Callable[[list[K]], Awaitable[object]]):
+        """
+        Start waking up for deadlines on the running loop, does nothing if
+        the scheduler is already running
+        """
+        if self._task is not None and not self._task.done():
+            return
+
+        self._changed = asyncio.Event()
+        self._task = asyncio.create_task(
+            self._run(handler, self._changed), name=f"{self.name}-scheduler"
+        )
+        logger.info(f"{self.name} scheduler started with {len(self)} deadlines")
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def pop_due(self, now: datetime | None = None) -> list[K]:
+        at = (now or datetime.now(UTC)).timestamp()
+        due = []
+        while self._heap and self._heap[0][0] <= at:
+            deadline, _, key = heapq.heappop(self._heap)
+            if self._deadlines.get(key) == deadline:
+                del self._deadlines[key]
+                due.append(key)
+        return due
+
+    def _discard_stale(self):
+        while self._heap and self._deadlines.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    async def _run(
+        self,
+        handler: Callable[[list[K]], Awaitable[object]],
+        changed: asyncio.Event,
+    ):
+        while True:
+            due = self.pop_due()
+            if due:
+                try:
+                    await handler(due)
+                except Exception:
+                    logger.exception(f"{self.name} scheduler handler failed")
+                continue
+
+            changed.clear()
+            next_deadline = self.next_deadline()
+            timeout = (
+                None
+                if next_deadline is None
+                else (next_deadline - datetime.now(UTC)).total_seconds()
+            )
+            try:
+                await asyncio.wait_for(changed.wait(), timeout)
+            except TimeoutError:
+                pass
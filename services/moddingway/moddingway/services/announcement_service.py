@@ -2,7 +2,7 @@ import logging
 
 import discord
 
-from moddingway.database import announcements_database
+from moddingway.database.aio import announcements_database
 from moddingway.database.models import AnnouncementRevision
 from moddingway.settings import get_settings
 from moddingway.util import log_info_and_add_field
@@ -22,11 +22,13 @@ async def add_announcement(
         version=0, content=announcement_text, author_id=author.id
     )
 
-    new_id = announcements_database.insert_announcement(
+    new_id = await announcements_database.insert_announcement(
         announcement_rev=announcement_rev
     )
 
-    announcement_json = announcements_database.get_announcement(announcement_id=new_id)
+    announcement_json = await announcements_database.get_announcement(
+        announcement_id=new_id
+    )
 
     if announcement_json:
         log_info_and_add_field(
@@ -41,7 +43,7 @@ async def add_announcement(
 
 async def publish_announcement(logging_embed, channel, announcement_id):
 
-    announcement_json = announcements_database.get_announcement(
+    announcement_json = await announcements_database.get_announcement(
         announcement_id=announcement_id
     )
     if announcement_json:
@@ -53,7 +55,7 @@ async def publish_announcement(logging_embed, channel, announcement_id):
         )  # put it in embed so it can support 4k characters
         sent_message = await channel.send(embed=publish_embed)
         if sent_message:
-            announcements_database.set_sent(
+            await announcements_database.set_sent(
                 announcement_id=announcement_id,
                 discord_msg_link=str(channel.id) + "/" + str(sent_message.id),
             )
@@ -64,5 +66,5 @@ async def publish_announcement(logging_embed, channel, announcement_id):
 
 
 async def list_announcements_service(status: bool | None = None):
-    announcement_list = announcements_database.select_announcements_bulk(status)
+    announcement_list = await announcements_database.select_announcements_bulk(status)
     return announcement_list
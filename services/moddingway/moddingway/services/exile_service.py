@@ -5,12 +5,15 @@ import re
 import discord
 
 from moddingway import util
-from moddingway.constants import ExileStatus, Role
-from moddingway.database import exiles_database, roles_database, users_database
+from moddingway.constants import ExileStatus, ModerationEventType, Role
+from moddingway.database.aio import exiles_database, roles_database, users_database
 from moddingway.database.models import Exile
+from moddingway.moderation_log import moderation_log
+from moddingway.scheduler import DeadlineScheduler
 from moddingway.settings import get_settings
 from moddingway.util import (
-    add_and_remove_role,
+    RolePlan,
+    get_guild_role,
     log_info_and_add_field,
     log_info_and_embed,
     send_dm,
@@ -20,6 +23,9 @@ from moddingway.util import (
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# exile ids of timed exiles, driven by workers.autounexile
+unexile_scheduler = DeadlineScheduler[int]("unexile")
+
 
 async def exile_user(
     logging_embed: discord.Embed,
@@ -27,12 +33,28 @@ async def exile_user(
     duration: datetime.timedelta,
     reason: str,
 ) -> str | None:
-    db_user = users_database.get_user(user.id)
-    if db_user:
-        currentExile = exiles_database.get_user_active_exile(db_user.user_id)
+    db_user, created = await users_database.get_or_create_user(user.id)
+    if created:
+        log_info_and_embed(
+            logging_embed,
+            logger,
+            "User not found in database, creating new record",
+        )
+    else:
+        currentExile = await exiles_database.get_user_active_exile(db_user.user_id)
         if not util.user_has_role(user, Role.VERIFIED) and currentExile:
             new_endTimestamp = currentExile.end_timestamp + duration
-            exiles_database.update_exile_end(currentExile.exile_id, new_endTimestamp)
+            await exiles_database.update_exile_end(
+                currentExile.exile_id, new_endTimestamp
+            )
+            unexile_scheduler.schedule(currentExile.exile_id, new_endTimestamp)
+            moderation_log.record(
+                ModerationEventType.EXILE_EXTENDED,
+                user.id,
+                currentExile.exile_id,
+                reason,
+                end_timestamp=new_endTimestamp.isoformat(),
+            )
             log_info_and_add_field(
                 logging_embed,
                 logger,
@@ -50,13 +72,6 @@ async def exile_user(
             error_message,
         )
         return error_message
-    if db_user is None:
-        log_info_and_embed(
-            logging_embed,
-            logger,
-            "User not found in database, creating new record",
-        )
-        db_user = users_database.add_user(user.id)
 
     # add exile entry into DB
     start_timestamp = datetime.datetime.now(datetime.UTC)
@@ -75,31 +90,28 @@ async def exile_user(
         start_timestamp=start_timestamp,
         end_timestamp=end_timestamp,
     )
-    exile_id = exiles_database.add_exile(exile)
+    exile_id = await exiles_database.add_exile(exile)
+    unexile_scheduler.schedule(exile_id, end_timestamp)
 
     logger.info(f"Created exile with ID {exile_id}")
     logging_embed.set_footer(text=f"Exile ID: {exile_id}")
 
-    roles_to_save: list[discord.Role] = []
+    # change user role, sticky roles are stripped by the same role edit
+    role_plan = RolePlan(user)
+    role_plan.remove(get_guild_role(user.guild, Role.VERIFIED))
+    role_plan.add(get_guild_role(user.guild, Role.EXILED))
 
-    # change user role
-    await add_and_remove_role(
-        user, role_to_add=Role.EXILED, role_to_remove=Role.VERIFIED
-    )
-
-    # check for any sticky roles to strip
+    # check for any sticky roles to strip, saved first so they can be restored
     try:
-        for role in user.roles:
-            if role.id in settings.sticky_roles:
-                discord_role = user.guild.get_role(role.id)
-                if discord_role is not None:
-                    roles_to_save.append(discord_role)
+        roles_to_save = [
+            role for role in user.roles if role.id in settings.sticky_roles
+        ]
 
         if len(roles_to_save) > 0:
-            await user.remove_roles(*roles_to_save)
-            roles_database.add_sticky_roles(
+            await roles_database.add_sticky_roles(
                 db_user.user_id, [role.id for role in roles_to_save]
             )
+            role_plan.remove(*roles_to_save)
     except Exception as e:
         log_info_and_add_field(
             logging_embed,
@@ -108,6 +120,8 @@ async def exile_user(
             f"Sticky roles could not be completely removed, {e}",
         )
 
+    await role_plan.apply()
+
     # message user
     await send_dm(
         logging_embed,
@@ -128,10 +142,18 @@ async def exile_user(
         "Result",
         f"<@{user.id}> was successfully exiled",
     )
+    moderation_log.record(
+        ModerationEventType.EXILE,
+        user.id,
+        exile_id,
+        reason,
+        start_timestamp=start_timestamp.isoformat(),
+        end_timestamp=end_timestamp.isoformat(),
+    )
 
 
 async def delete_exile_by_id(logging_embed: discord.Embed, exile_id: int):
-    status = exiles_database.get_exile_status(exile_id)
+    status = await exiles_database.get_exile_status(exile_id)
     if status == ExileStatus.TIMED_EXILED:
         log_info_and_add_field(
             logging_embed,
@@ -141,7 +163,7 @@ async def delete_exile_by_id(logging_embed: discord.Embed, exile_id: int):
         )
         return "Selected exile is active, cannot be deleted"
     elif status == ExileStatus.UNEXILED:
-        result = exiles_database.delete_exile(exile_id)
+        result = await exiles_database.delete_exile(exile_id)
         if result:
             log_info_and_add_field(
                 logging_embed,
@@ -178,8 +200,34 @@ async def unexile_user(
         )
         return error_message
 
+    role_plan = RolePlan(user)
+    role_plan.remove(get_guild_role(user.guild, Role.EXILED))
+    role_plan.add(get_guild_role(user.guild, Role.VERIFIED))
+
+    # check for any sticky roles to restore with the same role edit
+    db_user = await users_database.get_user(user.id)
+    restored_sticky_roles = False
+    if db_user is not None:
+        try:
+            for role in await roles_database.get_sticky_roles(db_user.user_id):
+                discord_role = user.guild.get_role(int(role))
+                if discord_role is not None:
+                    role_plan.add(discord_role)
+                    restored_sticky_roles = True
+                else:
+                    logger.error(
+                        "Role %s was not found in the server, skipping...", role
+                    )
+        except Exception as e:
+            log_info_and_add_field(
+                logging_embed,
+                logger,
+                "Error",
+                f"Sticky roles could not be completely restored, {e}",
+            )
+
     # unexile user
-    await add_and_remove_role(user, Role.VERIFIED, Role.EXILED)
+    await role_plan.apply()
 
     # message user
     await send_dm(
@@ -190,7 +238,6 @@ async def unexile_user(
     )
 
     # update exile record
-    db_user = users_database.get_user(user.id)
     if db_user is None:
         error_message = (
             "User has been unexiled, but no user record was found in the database"
@@ -203,7 +250,7 @@ async def unexile_user(
         )
         return error_message
 
-    exile = exiles_database.get_user_active_exile(db_user.user_id)
+    exile = await exiles_database.get_user_active_exile(db_user.user_id)
 
     if exile is None:
         # This should only happen when someone was manually exiled then unexiled through the bot
@@ -211,44 +258,40 @@ async def unexile_user(
             f"No active exile associated with user ID {db_user.user_id} was found. Skipping DB actions..."
         )
     else:
-        exiles_database.update_exile_status(exile.exile_id, ExileStatus.UNEXILED)
+        await exiles_database.update_exile_status(exile.exile_id, ExileStatus.UNEXILED)
+        unexile_scheduler.cancel(exile.exile_id)
         logging_embed.set_footer(text=f"Exile ID: {exile.exile_id}")
 
-    # check for any sticky roles to restore
-    try:
-        roles_to_restore: list[discord.Role] = []
-        for role in roles_database.get_sticky_roles(db_user.user_id):
-            discord_role = user.guild.get_role(int(role))
-            if discord_role is not None:
-                roles_to_restore.append(discord_role)
-            else:
-                logger.error("Role %s was not found in the server, skipping...", role)
-
-        if len(roles_to_restore) > 0:
-            await user.add_roles(*roles_to_restore)
-            roles_database.remove_sticky_roles(db_user.user_id)
-    except Exception as e:
-        log_info_and_add_field(
-            logging_embed,
-            logger,
-            "Error",
-            f"Sticky roles could not be completely removed, {e}",
-        )
+    if restored_sticky_roles:
+        try:
+            await roles_database.remove_sticky_roles(db_user.user_id)
+        except Exception as e:
+            log_info_and_add_field(
+                logging_embed,
+                logger,
+                "Error",
+                f"Restored sticky roles could not be cleared, {e}",
+            )
 
     log_info_and_add_field(
         logging_embed, logger, "Result", f"<@{user.id}> was successfully unexiled"
     )
+    moderation_log.record(
+        ModerationEventType.UNEXILE,
+        user.id,
+        None if exile is None else exile.exile_id,
+    )
 
 
 TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 
 async def get_user_exiles(user: discord.User) -> str:
-    db_user = users_database.get_user(user.id)
+    db_user = await users_database.get_user(user.id)
     if db_user is None:
         return "User not found in database"
 
-    exile_list = exiles_database.get_user_exiles(db_user.user_id)
+    exile_list = await exiles_database.get_user_exiles(db_user.user_id)
 
     if len(exile_list) == 0:
         return "No exiles found for user"
@@ -276,7 +319,7 @@ async def get_user_exiles(user: discord.User) -> str:
 
 
 async def get_active_exiles() -> str:
-    exile_list = exiles_database.get_all_active_exiles()
+    exile_list = await exiles_database.get_all_active_exiles()
     logger.info("Database query completed.")
     if len(exile_list) == 0:
         return "No active exiles found"
@@ -3,8 +3,10 @@ from datetime import datetime
 
 import discord
 
-from moddingway.database import notes_database, users_database
+from moddingway.constants import ModerationEventType
+from moddingway.database.aio import notes_database, users_database
 from moddingway.database.models import Note
+from moddingway.moderation_log import moderation_log
 from moddingway.util import (
     log_info_and_add_field,
     log_info_and_embed,
@@ -23,14 +25,13 @@ async def add_note(
     is_warning=False,
 ):
     # find user in DB
-    db_user = users_database.get_user(user.id)
-    if db_user is None:
+    db_user, created = await users_database.get_or_create_user(user.id)
+    if created:
         log_info_and_embed(
             logging_embed,
             logger,
             "User not found in database, creating new record",
         )
-        db_user = users_database.add_user(user.id)
 
     # create note
     note_timestamp = datetime.now()
@@ -52,8 +53,15 @@ async def add_note(
             context="Note",
         )
 
-    note.note_id = notes_database.add_note(note)
+    note.note_id = await notes_database.add_note(note)
     logging_embed.set_footer(text=f"Note ID: {note.note_id}")
+    moderation_log.record(
+        ModerationEventType.WARNING if is_warning else ModerationEventType.NOTE,
+        user.id,
+        note.note_id,
+        note_text,
+        actor_id=author.id,
+    )
 
     log_info_and_add_field(
         logging_embed,
@@ -66,7 +74,7 @@ async def add_note(
 async def get_note_by_id(
     note_id: int,
 ) -> str:
-    db_note = notes_database.get_note(note_id)
+    db_note = await notes_database.get_note(note_id)
     if db_note:
         db_note.content = (
             f"[warning] {db_note.content}" if db_note.is_warning else db_note.content
@@ -80,11 +88,11 @@ async def get_note_by_id(
 async def get_user_notes(
     user: discord.User,
 ) -> str:
-    db_user = users_database.get_user(user.id)
+    db_user = await users_database.get_user(user.id)
     if db_user is None:
         return "User not found in database"
 
-    note_list = notes_database.list_notes(db_user.user_id)
+    note_list = await notes_database.list_notes(db_user.user_id)
 
     if len(note_list) == 0:
         return f"No notes found for user <@{user.id}>"
@@ -106,11 +114,11 @@ async def get_user_notes(
 async def get_user_warnings(
     user: discord.User,
 ) -> str:
-    db_user = users_database.get_user(user.id)
+    db_user = await users_database.get_user(user.id)
     if db_user is None:
         return "User not found in database"
 
-    note_list = notes_database.list_warnings(db_user.user_id)
+    note_list = await notes_database.list_warnings(db_user.user_id)
 
     if len(note_list) == 0:
         return f"No warnings found for user <@{user.id}>"
@@ -132,7 +140,7 @@ async def delete_user_note(
     logging_embed: discord.Embed,
     note_id: int,
 ) -> str:
-    note_row = notes_database.get_note(note_id)
+    note_row = await notes_database.get_note(note_id)
     if note_row is None:
         log_info_and_add_field(
             logging_embed,
@@ -142,7 +150,7 @@ async def delete_user_note(
         )
         return "Note not found in database, no action will be taken"
 
-    result = notes_database.delete_note(note_id)
+    result = await notes_database.delete_note(note_id)
 
     if result:
         logging_embed.set_footer(text=f"Note ID: {note_id}")
@@ -173,7 +181,7 @@ async def update_user_note(
     new_note: str,
     note_id: int,
 ) -> str:
-    db_note = notes_database.get_note(note_id)
+    db_note = await notes_database.get_note(note_id)
     if db_note is None:
         log_info_and_add_field(
             logging_embed,
@@ -184,7 +192,7 @@ async def update_user_note(
         return "Note not found in database"
     old_note = db_note.content
     note_update_timestamp = datetime.now()
-    result = notes_database.update_note(
+    result = await notes_database.update_note(
         new_note, str(last_author.id), note_update_timestamp, note_id
     )
     if result:
@@ -9,10 +9,12 @@ from moddingway.constants import (
     PERMANENT_BAN_STRIKE_THRESHOLD,
     SERIOUS_INFRACTION_POINTS,
     THRESHOLDS_PUNISHMENT,
+    ModerationEventType,
     StrikeSeverity,
 )
-from moddingway.database import strikes_database, users_database
+from moddingway.database.aio import strikes_database, users_database
 from moddingway.database.models import Strike, User
+from moddingway.moderation_log import moderation_log
 from moddingway.util import (
     log_info_and_add_field,
     log_info_and_embed,
@@ -33,14 +35,13 @@ async def add_strike(
     author: discord.Member,
 ):
     # find user in DB
-    db_user = users_database.get_user(user.id)
-    if db_user is None:
+    db_user, created = await users_database.get_or_create_user(user.id)
+    if created:
         log_info_and_embed(
             logging_embed,
             logger,
             "User not found in database, creating new record",
         )
-        db_user = users_database.add_user(user.id)
 
     # create strike
     strike_timestamp = datetime.now()
@@ -53,14 +54,23 @@ async def add_strike(
         last_edited_timestamp=strike_timestamp,
         last_edited_by=str(author.id),
     )
-    strike.strike_id = strikes_database.add_strike(strike)
+    # insert strike and increment user points together
+    temporary_points, permanent_points = _get_strike_point_penalty(severity)
+    strike.strike_id, db_user = await strikes_database.add_strike(
+        strike, temporary_points, permanent_points
+    )
     logging_embed.set_footer(text=f"Strike ID: {strike.strike_id}")
-
-    # increment user points, update
-    db_user.last_infraction_timestamp = strike_timestamp
-    previous_points = db_user.get_strike_points()
-    _apply_strike_point_penalty(db_user, severity)
-    users_database.update_user_strike_points(db_user)
+    moderation_log.record(
+        ModerationEventType.STRIKE,
+        user.id,
+        strike.strike_id,
+        reason,
+        actor_id=author.id,
+        severity=severity.name,
+        temporary_points=temporary_points,
+        permanent_points=permanent_points,
+    )
+    previous_points = db_user.get_strike_points() - temporary_points - permanent_points
 
     log_info_and_add_field(
         logging_embed,
@@ -84,11 +94,11 @@ async def add_strike(
 async def get_user_strikes(
     user: discord.User,
 ) -> str:
-    db_user = users_database.get_user(user.id)
+    db_user = await users_database.get_user(user.id)
     if db_user is None:
         return "User not found in database"
 
-    strike_list = strikes_database.list_strikes(db_user.user_id)
+    strike_list = await strikes_database.list_strikes(db_user.user_id)
 
     if len(strike_list) == 0:
         return "No strikes found for user"
@@ -112,42 +122,37 @@ async def get_user_strikes(
 
 
 async def delete_strike(logging_embed: discord.Embed, strike_id: int) -> str:
-    deleted_strike = strikes_database.delete_strike(strike_id)
+    deleted_strike = await strikes_database.delete_strike(strike_id)
 
     if deleted_strike is None:
         return "Strike not found, no change will be made"
 
     user_id = deleted_strike[1]
     severity = StrikeSeverity(int(deleted_strike[2]))
-    temporary_points_to_remove = 0
-    permanent_points_to_remove = 0
-
-    if severity == StrikeSeverity.SERIOUS:
-        permanent_points_to_remove = _get_severity_points(severity)
-    else:
-        temporary_points_to_remove = _get_severity_points(severity)
+    temporary_points_to_remove, permanent_points_to_remove = _get_strike_point_penalty(
+        severity
+    )
 
-    users_database.decrement_user_strike_points(
+    await users_database.decrement_user_strike_points(
         int(user_id), temporary_points_to_remove, permanent_points_to_remove
     )
+    moderation_log.record(
+        ModerationEventType.STRIKE_DELETED,
+        related_entity_id=strike_id,
+        user_id=int(user_id),
+        severity=severity.name,
+    )
 
     return f"Successfully deleted strike {strike_id}"
 
 
-def _apply_strike_point_penalty(db_user: User, severity: StrikeSeverity):
-    match severity:
-        case StrikeSeverity.MINOR:
-            db_user.temporary_points = (
-                db_user.temporary_points + MINOR_INFRACTION_POINTS
-            )
-        case StrikeSeverity.MODERATE:
-            db_user.temporary_points = (
-                db_user.temporary_points + MODERATE_INFRACTION_POINTS
-            )
-        case StrikeSeverity.SERIOUS:
-            db_user.permanent_points = (
-                db_user.permanent_points + SERIOUS_INFRACTION_POINTS
-            )
+def _get_strike_point_penalty(severity: StrikeSeverity) -> tuple[int, int]:
+    """
+    Return the (temporary, permanent) points a strike of severity is worth
+    """
+    if severity == StrikeSeverity.SERIOUS:
+        return 0, _get_severity_points(severity)
+    return _get_severity_points(severity), 0
 
 
 def _get_severity_points(severity: StrikeSeverity) -> int:
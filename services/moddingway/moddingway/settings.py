@@ -25,6 +25,37 @@ class Settings(BaseModel):
     database_name: str = "moddingway"
     postgres_username: str = os.environ.get("POSTGRES_USER", "")
     postgres_password: str = os.environ.get("POSTGRES_PASSWORD", "")
+    postgres_pool_min_size: int = int(os.environ.get("POSTGRES_POOL_MIN_SIZE") or 1)
+    postgres_pool_max_size: int = int(os.environ.get("POSTGRES_POOL_MAX_SIZE") or 10)
+    postgres_pool_timeout: float = float(
+        os.environ.get("POSTGRES_POOL_TIMEOUT") or 10
+    )  # seconds to wait for a free connection before giving up
+    postgres_pool_health_check_idle: float = float(
+        os.environ.get("POSTGRES_POOL_HEALTH_CHECK_IDLE") or 30
+    )  # connections idle for longer than this (seconds) are pinged on checkout
+    postgres_statement_timeout_ms: int = int(
+        os.environ.get("POSTGRES_STATEMENT_TIMEOUT_MS") or 30000
+    )
+    postgres_connect_retries: int = int(os.environ.get("POSTGRES_CONNECT_RETRIES") or 5)
+    database_executor_queue_size: int = int(
+        os.environ.get("DATABASE_EXECUTOR_QUEUE_SIZE") or 100
+    )  # database calls allowed to wait for a worker thread before callers are held back
+    count_cache_ttl: float = float(
+        os.environ.get("COUNT_CACHE_TTL") or 60
+    )  # seconds a cached listing total is served before it is refreshed
+    count_estimate_threshold: int = int(
+        os.environ.get("COUNT_ESTIMATE_THRESHOLD") or 100000
+    )  # tables estimated above this many rows report an estimate until counted
+    user_cache_size: int = int(os.environ.get("USER_CACHE_SIZE") or 1024)
+    user_cache_ttl: float = float(
+        os.environ.get("USER_CACHE_TTL") or 60
+    )  # seconds, also bounds how stale writes made by another process can look
+    unexile_concurrency: int = int(
+        os.environ.get("UNEXILE_CONCURRENCY") or 5
+    )  # expired exiles processed in parallel, each one makes several Discord requests
+    automod_concurrency: int = int(
+        os.environ.get("AUTOMOD_CONCURRENCY") or 4
+    )  # automod channels processed in parallel, they share one rate limit pacer
     automod_inactivity: dict[int, int]  # key: channel id, value: inactive limit (days)
     channel_automod_inactivity: dict[
         int, int
@@ -7,6 +7,7 @@ from datetime import UTC, datetime, timedelta
 import discord
 
 from moddingway.constants import ERROR_MESSAGES, Role
+from moddingway.log_sink import log_sink
 from moddingway.settings import get_settings
 
 settings = get_settings()
@@ -59,7 +60,7 @@ async def create_interaction_embed_context(
         raise e
     finally:
         if isinstance(log_channel, discord.abc.Messageable):
-            await log_channel.send(embed=embed)
+            log_sink.submit(log_channel, embed)
 
 
 def log_info_and_embed(embed: discord.Embed, logger, message: str):
@@ -158,34 +159,87 @@ async def send_dm(
         )
 
 
-async def add_and_remove_role(
-    member: discord.Member, role_to_add: Role, role_to_remove: Role
-):
-    discord_role_to_add = None
-    discord_role_to_remove = None
+class RoleIndex:
+    """
+    Role name to discord.Role lookup per guild. Built on first use or when the
+    guild becomes available, and rebuilt by the guild role events.
+    """
 
-    for role in member.guild.roles:
-        if role.name == role_to_add.value:
-            discord_role_to_add = role
-        if role.name == role_to_remove.value:
-            discord_role_to_remove = role
+    def __init__(self):
+        self._guilds: dict[int, dict[str, discord.Role]] = {}
 
-    if discord_role_to_add is None:
-        # This role does not exist, likely a misconfiguration of the server
-        raise Exception(f"Role {role_to_add.value} not found in server")
+    def rebuild(self, guild: discord.Guild):
+        roles: dict[str, discord.Role] = {}
+        for role in guild.roles:
+            # like discord.utils.get, the lowest role wins when names collide
+            roles.setdefault(role.name, role)
+        self._guilds[guild.id] = roles
+
+    def forget(self, guild: discord.Guild):
+        self._guilds.pop(guild.id, None)
 
-    if discord_role_to_remove is None:
+    def get(self, guild: discord.Guild, role: Role) -> discord.Role | None:
+        if guild.id not in self._guilds:
+            self.rebuild(guild)
+        return self._guilds[guild.id].get(role.value)
+
+
+role_index = RoleIndex()
+
+
+def get_guild_role(guild: discord.Guild, role: Role) -> discord.Role:
+    discord_role = role_index.get(guild, role)
+    if discord_role is None:
         # This role does not exist, likely a misconfiguration of the server
-        raise Exception(f"Role {role_to_remove.value} not found in server")
+        raise Exception(f"Role {role.value} not found in server")
+    return discord_role
+
 
-    await member.remove_roles(discord_role_to_remove)
-    await member.add_roles(discord_role_to_add)
+class RolePlan:
+    """
+    Collects the role changes of a member and applies the resulting role set
+    with a single member.edit call, instead of one request per add or remove
+    """
+
+    def __init__(self, member: discord.Member):
+        self.member = member
+        # @everyone is implicit and cannot be part of the edited role list
+        self._initial = {role.id for role in member.roles if not role.is_default()}
+        self._roles = {role.id: role for role in member.roles if not role.is_default()}
+
+    def add(self, *roles: discord.Role):
+        for role in roles:
+            self._roles[role.id] = role
+
+    def remove(self, *roles: discord.Role):
+        for role in roles:
+            self._roles.pop(role.id, None)
+
+    @property
+    def roles(self) -> list[discord.Role]:
+        return list(self._roles.values())
+
+    @property
+    def changed(self) -> bool:
+        return self._initial != self._roles.keys()
+
+    async def apply(self, reason: str | None = None):
+        if self.changed:
+            await self.member.edit(roles=self.roles, reason=reason)
+
+
+async def add_and_remove_role(
+    member: discord.Member, role_to_add: Role, role_to_remove: Role
+):
+    role_plan = RolePlan(member)
+    role_plan.remove(get_guild_role(member.guild, role_to_remove))
+    role_plan.add(get_guild_role(member.guild, role_to_add))
+    await role_plan.apply()
 
 
 def user_has_role(user: discord.Member, role: Role) -> bool:
-    return any(
-        discord_role for discord_role in user.roles if discord_role.name == role.value
-    )
+    discord_role = role_index.get(user.guild, role)
+    return discord_role is not None and user.get_role(discord_role.id) is not None
 
 
 def calculate_time_delta(delta_string: str | None) -> timedelta | None:
@@ -284,7 +338,7 @@ async def find_and_assign_role(
     """
     try:
         # Find the role by name using the enum value
-        role = discord.utils.get(member.guild.roles, name=role_enum.value)
+        role = role_index.get(member.guild, role_enum)
 
         if role is None:
             error_msg = f"Role '{role_enum.value}' not found in the server."
@@ -1,10 +1,10 @@
 from .autounexile import autounexile_users
+from .ban_reconciliation import reconcile_bans
 from .forum_automod import autodelete_posts, autodelete_threads
-from .strike_decrement import decrement_strikes
 
 
 def start_tasks(self):
     autounexile_users.start(self)
     autodelete_threads.start(self)
-    decrement_strikes.start(self)
     autodelete_posts.start(self)
+    reconcile_bans.start(self)
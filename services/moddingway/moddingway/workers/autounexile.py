@@ -1,10 +1,13 @@
+import asyncio
 import logging
+import time
 
 from discord.ext import tasks
 
 from moddingway.constants import ExileStatus
-from moddingway.database import exiles_database
-from moddingway.services.exile_service import unexile_user
+from moddingway.database.aio import exiles_database
+from moddingway.database.models import PendingExile
+from moddingway.services.exile_service import unexile_scheduler, unexile_user
 from moddingway.settings import get_settings
 
 from .helper import create_autounexile_embed
@@ -12,46 +15,97 @@ from .helper import create_autounexile_embed
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# exiles are unexiled by unexile_scheduler as they expire, this sweep only
+# picks up exiles created or changed outside of this process
+RECONCILIATION_SWEEP_MINUTES = 30.0
 
-@tasks.loop(minutes=1.0)
+
+@tasks.loop(minutes=RECONCILIATION_SWEEP_MINUTES)
 async def autounexile_users(self):
+    unexile_scheduler.start(lambda _: unexile_pending_users(self))
+
     try:
-        exiles = exiles_database.get_pending_unexiles()
+        exiles = await exiles_database.get_all_active_exiles()
+    except Exception:
+        logger.info("Failed to get active exiles.")
+        logger.info("Ended auto unexile reconciliation with errors.")
+        return
+
+    for exile in exiles:
+        if exile.end_timestamp is not None:
+            unexile_scheduler.schedule(exile.exile_id, exile.end_timestamp)
+
+    next_deadline = unexile_scheduler.next_deadline()
+    logger.info(
+        f"Auto Unexile reconciled {len(unexile_scheduler)} timed exiles, next one expires at {next_deadline}."
+    )
+    return "Auto Unexile reconciliation completed."
+
+
+async def unexile_pending_users(self):
+    # the database stays the source of truth, exiles ended in the meantime are skipped
+    try:
+        exiles = await exiles_database.get_pending_unexiles()
     except Exception:
         logger.info("Failed to get pending exiles.")
         logger.info("Ended auto unexile worker task with errors.")
         return
 
-    for exile in exiles:
-        logger.info(f"Auto Unexile running on user id {exile.user_id}.")
-        try:
-            error_message = None
-            member = self.get_guild(settings.guild_id).get_member(exile.discord_id)
-
-            async with create_autounexile_embed(
-                self, member, exile.discord_id, str(exile.exile_id), exile.end_timestamp
-            ) as autounexile_embed:
-                if member is None:
-                    error_message = (
-                        f"<@{exile.discord_id}> was not found in the server."
-                    )
-                    logger.error(f"{error_message}")
-                    raise Exception(error_message)
-
-                error_message = await unexile_user(autounexile_embed, member)
-            if error_message is not None:
-                raise Exception(error_message)
-        except Exception:
-            logger.info(
-                f"Auto Unexile failed, updating exile status of exile."
-                f"{exile.exile_id}, user {exile.discord_id} to unknown"
-            )
-            logger.info("Ended auto unexile worker task with errors.")
-            exiles_database.update_exile_status(exile.exile_id, ExileStatus.UNKNOWN)
+    started = time.perf_counter()
+    slots = asyncio.Semaphore(settings.unexile_concurrency)
+
+    async def unexile_with_slot(exile: PendingExile) -> bool:
+        async with slots:
+            return await _unexile_pending_user(self, exile)
+
+    results = await asyncio.gather(*(unexile_with_slot(exile) for exile in exiles))
+
+    failed = results.count(False)
+    logger.info(
+        f"Auto Unexile processed {len(exiles)} exiles in {time.perf_counter() - started:.2f}s, {failed} failed."
+    )
+    if failed:
+        logger.info("Ended auto unexile worker task with errors.")
 
     return "Auto Unexile task completed."
 
 
+async def _unexile_pending_user(self, exile: PendingExile) -> bool:
+    """
+    Unexile a single user, failures are contained to their own exile
+    """
+    logger.info(f"Auto Unexile running on user id {exile.user_id}.")
+    try:
+        error_message = None
+        member = self.get_guild(settings.guild_id).get_member(exile.discord_id)
+
+        async with create_autounexile_embed(
+            self, member, exile.discord_id, str(exile.exile_id), exile.end_timestamp
+        ) as autounexile_embed:
+            if member is None:
+                error_message = f"<@{exile.discord_id}> was not found in the server."
+                logger.error(f"{error_message}")
+                raise Exception(error_message)
+
+            error_message = await unexile_user(autounexile_embed, member)
+        if error_message is not None:
+            raise Exception(error_message)
+        return True
+    except Exception:
+        logger.info(
+            f"Auto Unexile failed, updating exile status of exile."
+            f"{exile.exile_id}, user {exile.discord_id} to unknown"
+        )
+
+    try:
+        await exiles_database.update_exile_status(exile.exile_id, ExileStatus.UNKNOWN)
+    except Exception:
+        logger.exception(f"Failed to update exile status of exile {exile.exile_id}")
+    return False
+
+
 @autounexile_users.before_loop
 async def before_autounexile_users():
-    logger.info("Auto Unexile started, task running every 1 minute.")
+    logger.info(
+        f"Auto Unexile started, exiles are unexiled as they expire and reconciled every {RECONCILIATION_SWEEP_MINUTES:g} minutes."
+    )
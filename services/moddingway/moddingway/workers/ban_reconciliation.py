@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import time
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from weakref import WeakKeyDictionary
+
+from discord.ext import tasks
+
+from moddingway.database.aio import users_database
+from moddingway.settings import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# on_member_ban and on_member_unban keep isBanned current while the bot is up,
+# this catches the bans and unbans made while it was down
+BAN_RECONCILIATION_HOURS = 6
+
+
+class BanEventTracker:
+    """
+    Keeps the ban and unban events from being overwritten by a reconciliation
+    working from a ban list paged before them. Events write under the same
+    lock as the corrections, and the users they touch while a reconciliation
+    runs are left out of its corrections.
+    """
+
+    def __init__(self):
+        self._touched: set[str] | None = None
+        # asyncio primitives are bound to the loop they are used on
+        self._locks: WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock] = (
+            WeakKeyDictionary()
+        )
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if loop not in self._locks:
+            self._locks[loop] = asyncio.Lock()
+        return self._locks[loop]
+
+    @asynccontextmanager
+    async def event_write(self, discord_user_id: int) -> AsyncGenerator[None]:
+        """
+        Wrap the database write of a ban or unban event
+        """
+        async with self._get_lock():
+            if self._touched is not None:
+                self._touched.add(str(discord_user_id))
+            yield
+
+    @asynccontextmanager
+    async def tracking(self) -> AsyncGenerator[set[str]]:
+        """
+        Collect the discord ids touched by events for the duration of a run
+        """
+        self._touched = set()
+        try:
+            yield self._touched
+        finally:
+            self._touched = None
+
+    @asynccontextmanager
+    async def exclusive(self) -> AsyncGenerator[None]:
+        async with self._get_lock():
+            yield
+
+
+ban_events = BanEventTracker()
+
+
+@tasks.loop(hours=BAN_RECONCILIATION_HOURS)
+async def reconcile_bans(self):
+    guild = self.get_guild(settings.guild_id)
+    if guild is None:
+        logger.error("Guild not found.")
+        return "Guild not found."
+
+    started = time.perf_counter()
+    async with ban_events.tracking() as touched:
+        try:
+            banned_in_db = await users_database.get_banned_discord_user_ids()
+            guild_bans = {str(entry.user.id) async for entry in guild.bans(limit=None)}
+        except Exception as e:
+            logger.error("Failed to fetch bans for reconciliation", exc_info=e)
+            return "Failed to fetch bans for reconciliation"
+
+        # no event can write while the corrections are computed and applied,
+        # users whose event already landed since the reads keep its state
+        async with ban_events.exclusive():
+            to_ban = sorted(guild_bans - banned_in_db - touched)
+            to_unban = sorted(banned_in_db - guild_bans - touched)
+            if not to_ban and not to_unban:
+                logger.info(
+                    f"Ban list of {len(guild_bans)} users matches the database, checked in {time.perf_counter() - started:.2f}s"
+                )
+                return "Ban list matches the database"
+
+            try:
+                corrections = await users_database.apply_ban_corrections(
+                    to_ban, to_unban
+                )
+            except Exception as e:
+                logger.error("Failed to apply ban corrections", exc_info=e)
+                return "Failed to apply ban corrections"
+
+    result = f"Reconciled {len(guild_bans)} bans, banned {corrections.banned} users, unbanned {corrections.unbanned} users and created {corrections.created} users"
+    logger.info(f"{result} in {time.perf_counter() - started:.2f}s")
+    return result
+
+
+@reconcile_bans.before_loop
+async def before_reconcile_bans():
+    logger.info(
+        f"Ban Reconciliation started, task running every {BAN_RECONCILIATION_HOURS} hours."
+    )
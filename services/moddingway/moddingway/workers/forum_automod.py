@@ -1,8 +1,17 @@
+import asyncio
 import logging
-from datetime import UTC, datetime
+import time
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from weakref import WeakKeyDictionary
 
+import discord
 from discord.ext import tasks
+from discord.utils import snowflake_time, time_snowflake
 
+from moddingway.database.aio import automod_database
+from moddingway.pacing import AdaptivePacer
+from moddingway.scheduler import DeadlineScheduler
 from moddingway.settings import get_settings
 from moddingway.util import (
     create_interaction_embed_context,
@@ -11,19 +20,135 @@ from moddingway.util import (
 
 from .helper import (
     automod_channel,
+    automod_forum,
     automod_thread,
+    bulk_delete_messages,
     create_automod_embed,
     create_channel_automod_embed,
+    should_delete_thread,
 )
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# shared by both workers, every channel draws from the same rate limit budget
+automod_pacer = AdaptivePacer("automod")
+# threads are deleted by thread_scheduler as they go inactive, the daily sweep
+# only catches what the events missed and schedules the upcoming deadlines
+thread_scheduler = DeadlineScheduler[int]("thread automod")
+THREAD_SWEEP_HOURS = 24
+# messages of the channel automod are deleted by message_scheduler as they
+# expire, deadlines are rounded up so close messages share a bulk delete
+message_scheduler = DeadlineScheduler[tuple[int, int]]("message automod")
+MESSAGE_DELETE_COALESCE_SECONDS = 60
+# channels whose unexpired messages were scheduled since the bot started
+_scheduled_channels: set[int] = set()
+# key: channel id, value: snowflake before which every unpinned message is gone
+channel_watermarks: dict[int, int] = {}
+# key: channel id, value: ids of its pinned messages, dropped on every pins update
+pinned_message_ids: dict[int, set[int]] = {}
+_pins_updates: dict[int, int] = {}
+
+# caps the channels processed at once across both workers, one semaphore per
+# event loop since asyncio primitives are bound to the loop they are used on
+_automod_slots: WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    WeakKeyDictionary()
+)
+
+
+def _get_automod_slots() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    if loop not in _automod_slots:
+        _automod_slots[loop] = asyncio.Semaphore(settings.automod_concurrency)
+    return _automod_slots[loop]
+
+
+async def _fan_out(
+    channels: dict[int, int],
+    process: Callable[[int, int], Awaitable[bool]],
+) -> int:
+    """
+    Run process(channel_id, duration) for every channel concurrently and
+    return how many of them failed
+    """
+    slots = _get_automod_slots()
+
+    async def process_with_slot(channel_id: int, duration: int) -> bool:
+        async with slots:
+            return await process(channel_id, duration)
+
+    results = await asyncio.gather(
+        *(
+            process_with_slot(channel_id, duration)
+            for channel_id, duration in channels.items()
+        )
+    )
+    return results.count(False)
+
+
+def schedule_thread(thread: discord.Thread, last_activity: datetime | None = None):
+    """
+    Schedule the deletion of a thread of an automodded forum for when it
+    becomes inactive, last_activity defaults to its last message
+    """
+    duration = settings.automod_inactivity.get(thread.parent_id)
+    if duration is None:
+        return
+
+    if thread.flags.pinned:
+        thread_scheduler.cancel(thread.id)
+        return
+
+    if last_activity is None:
+        if not thread.last_message_id:
+            return
+        last_activity = snowflake_time(thread.last_message_id)
+
+    thread_scheduler.schedule(thread.id, last_activity + timedelta(days=duration))
+
+
+async def delete_due_threads(self, thread_ids: list[int]):
+    guild = self.get_guild(settings.guild_id)
+    if guild is None:
+        logger.error("Guild not found.")
+        return
+
+    gone = []
+    for thread_id in thread_ids:
+        try:
+            thread = guild.get_thread(thread_id) or await guild.fetch_channel(thread_id)
+        except discord.NotFound:
+            gone.append(thread_id)
+            continue
+        except Exception as e:
+            logger.error(f"Failed to fetch thread {thread_id}: {e}", exc_info=e)
+            continue
+        if not isinstance(thread, discord.Thread):
+            gone.append(thread_id)
+            continue
+
+        duration = settings.automod_inactivity.get(thread.parent_id)
+        if duration is None or thread.flags.pinned:
+            continue
+
+        if not should_delete_thread(thread, duration):
+            # activity the events did not see moved its deadline
+            schedule_thread(thread)
+            continue
+
+        # a failed deletion is retried by the next sweep
+        num_removed, _ = await automod_thread(thread, duration, 0, 0, automod_pacer)
+        if num_removed > 0:
+            gone.append(thread_id)
+
+    await automod_database.remove_threads(gone)
+
 
 # Worker for thread automodding
-@tasks.loop(hours=24)
+@tasks.loop(hours=THREAD_SWEEP_HOURS)
 async def autodelete_threads(self):
     logger.info("Started forum automod worker task.")
+    thread_scheduler.start(lambda thread_ids: delete_due_threads(self, thread_ids))
     guild = self.get_guild(settings.guild_id)
     if guild is None:
         logger.error("Guild not found.")
@@ -36,61 +161,145 @@ async def autodelete_threads(self):
         logger.info("Ended forum automod worker task with errors.")
         return
 
-    for channel_id, duration in settings.automod_inactivity.items():
-        num_removed = 0
-        num_errors = 0
-        try:
-            channel = guild.get_channel(channel_id)
-            if channel is None:
-                logger.error("Forum channel not found.")
-                logger.info("Ended forum automod worker task with errors.")
-                continue
-
-            async for thread in channel.archived_threads(limit=None):
-                num_removed, num_errors = await automod_thread(
-                    thread,
-                    duration,
-                    num_removed,
-                    num_errors,
-                )
+    started = time.perf_counter()
+    failed = await _fan_out(
+        settings.automod_inactivity,
+        lambda channel_id, duration: _autodelete_forum(
+            self, guild, channel_id, duration
+        ),
+    )
+    logger.info(
+        f"Forum automod processed {len(settings.automod_inactivity)} channels in {time.perf_counter() - started:.2f}s, {failed} failed. Next thread deadline is {thread_scheduler.next_deadline()}."
+    )
+    logger.info("Completed forum automod worker task.")
+    return "Forum automod task completed."
 
-            for thread in channel.threads:
-                num_removed, num_errors = await automod_thread(
-                    thread,
-                    duration,
-                    num_removed,
-                    num_errors,
-                )
 
-            if num_removed > 0 or num_errors > 0:
-                logger.info(
-                    f"Removed a total of {num_removed} threads from channel {channel_id}. {num_errors} failed removals."
-                )
-                async with create_automod_embed(
-                    self,
-                    channel_id,
-                    num_removed,
-                    num_errors,
-                    datetime.now(UTC),
-                ):
-                    pass
+async def _autodelete_forum(self, guild, channel_id: int, duration: int) -> bool:
+    started = time.perf_counter()
+    try:
+        channel = guild.get_channel(channel_id)
+        if channel is None:
+            logger.error(f"Forum channel {channel_id} not found.")
+            return False
 
-            else:
-                logger.info(
-                    f"No threads were marked for deletion in channel {channel_id}."
-                )
-        except Exception as e:
-            logger.error(e, exc_info=e)
-            async with create_interaction_embed_context(
-                get_log_channel(self),
-                user=self.user,
-                timestamp=datetime.now(UTC),
-                description=f"Automod task failed to process channel <#{channel_id}>: {e}",
+        num_removed, num_errors = await automod_forum(channel, duration, automod_pacer)
+
+        # schedule every thread going inactive before the next sweep
+        active_before = datetime.now(UTC) + timedelta(
+            hours=THREAD_SWEEP_HOURS, days=-duration
+        )
+        for thread_id, last_activity in await automod_database.get_expiring_threads(
+            channel_id, active_before
+        ):
+            thread_scheduler.schedule(
+                thread_id, last_activity + timedelta(days=duration)
+            )
+        elapsed = time.perf_counter() - started
+
+        if num_removed > 0 or num_errors > 0:
+            logger.info(
+                f"Removed a total of {num_removed} threads from channel {channel_id} in {elapsed:.2f}s. {num_errors} failed removals."
+            )
+            async with create_automod_embed(
+                self,
+                channel_id,
+                num_removed,
+                num_errors,
+                datetime.now(UTC),
             ):
                 pass
+
+        else:
+            logger.info(
+                f"No threads were marked for deletion in channel {channel_id} ({elapsed:.2f}s)."
+            )
+        return num_errors == 0
+    except Exception as e:
+        logger.error(e, exc_info=e)
+        async with create_interaction_embed_context(
+            get_log_channel(self),
+            user=self.user,
+            timestamp=datetime.now(UTC),
+            description=f"Automod task failed to process channel <#{channel_id}>: {e}",
+        ):
+            pass
+        return False
+
+
+def schedule_message(message: discord.Message):
+    """
+    Schedule the deletion of a message of an automodded channel for when it
+    expires
+    """
+    duration = settings.channel_automod_inactivity.get(message.channel.id)
+    if duration is None or message.pinned:
+        return
+
+    expires_at = message.created_at.timestamp() + duration * 60
+    # round up to the coalescing window
+    expires_at += -expires_at % MESSAGE_DELETE_COALESCE_SECONDS
+    message_scheduler.schedule(
+        (message.channel.id, message.id), datetime.fromtimestamp(expires_at, UTC)
+    )
+
+
+def forget_pins(channel_id: int):
+    """
+    Drop the cached pins of a channel, they are fetched again on its next flush
+    """
+    pinned_message_ids.pop(channel_id, None)
+    _pins_updates[channel_id] = _pins_updates.get(channel_id, 0) + 1
+
+
+async def _get_pinned_ids(channel) -> set[int]:
+    pinned = pinned_message_ids.get(channel.id)
+    if pinned is not None:
+        return pinned
+
+    updates = _pins_updates.get(channel.id, 0)
+    pinned = {message.id for message in await channel.pins()}
+    # a pins update received while fetching may not be reflected, refetch next time
+    if _pins_updates.get(channel.id, 0) == updates:
+        pinned_message_ids[channel.id] = pinned
+    return pinned
+
+
+async def delete_due_messages(self, keys: list[tuple[int, int]]):
+    guild = self.get_guild(settings.guild_id)
+    if guild is None:
+        logger.error("Guild not found.")
+        return
+
+    message_ids: dict[int, list[int]] = {}
+    for channel_id, message_id in keys:
+        message_ids.setdefault(channel_id, []).append(message_id)
+
+    for channel_id, ids in message_ids.items():
+        channel = guild.get_channel(channel_id)
+        if channel is None:
+            logger.error(f"Message channel {channel_id} not found.")
+            continue
+
+        try:
+            pinned = await _get_pinned_ids(channel)
+        except Exception as e:
+            logger.error(f"Failed to get pins of #{channel.name}: {e}", exc_info=e)
             continue
-    logger.info("Completed forum automod worker task.")
-    return "Forum automod task completed."
+
+        # failed deletions are retried by the next sweep
+        num_removed, num_errors = await bulk_delete_messages(
+            channel,
+            [
+                discord.Object(id=message_id)
+                for message_id in ids
+                if message_id not in pinned
+            ],
+            automod_pacer,
+        )
+        logger.info(
+            f"Removed {num_removed} expired messages from channel #{channel.name}. {num_errors} failed removals."
+        )
 
 
 # Worker for channel message automodding
@@ -109,57 +318,85 @@ async def autodelete_posts(self):
         logger.info("Ended channel automod worker task with errors.")
         return
 
-    for channel_id, duration in settings.channel_automod_inactivity.items():
-        try:
-            channel = guild.get_channel(channel_id)
-            if channel is None:
-                logger.error("Message channel not found.")
-                logger.info("Ended channel automod worker task with errors.")
-                continue
-
-            # Get channel messages
-            messages = channel.history(limit=None)
-
-            # Delete any messages longer than set duration
-            num_removed, num_errors = await automod_channel(
-                messages, duration, channel.name
-            )
+    message_scheduler.start(lambda keys: delete_due_messages(self, keys))
 
-            # Log interally if any messages are removed or failed to be removed
-            if num_removed > 0 or num_errors > 0:
-                logger.info(
-                    f"Removed a total of {num_removed} messages from channel #{channel.name}. {num_errors} failed removals."
-                )
-
-                # Log externally to monitor channel if any messages are failed to be removed
-                if num_errors > 0:
-                    async with create_channel_automod_embed(
-                        self,
-                        channel_id,
-                        num_removed,
-                        num_errors,
-                        datetime.now(UTC),
-                    ):
-                        pass
-
-            else:
-                logger.info(
-                    f"No messages were marked for deletion in channel {channel_id}."
-                )
-        except Exception as e:
-            logger.error(e, exc_info=e)
-            async with create_interaction_embed_context(
-                get_log_channel(self),
-                user=self.user,
-                timestamp=datetime.now(UTC),
-                description=f"Automod task failed to process channel <#{channel_id}>: {e}",
-            ):
-                pass
-            continue
+    started = time.perf_counter()
+    failed = await _fan_out(
+        settings.channel_automod_inactivity,
+        lambda channel_id, duration: _autodelete_channel(
+            self, guild, channel_id, duration
+        ),
+    )
+    logger.info(
+        f"Channel automod processed {len(settings.channel_automod_inactivity)} channels in {time.perf_counter() - started:.2f}s, {failed} failed."
+    )
     logger.info("Completed channel automod worker task.")
     return "Channel automod task completed."
 
 
+async def _autodelete_channel(self, guild, channel_id: int, duration: int) -> bool:
+    started = time.perf_counter()
+    try:
+        channel = guild.get_channel(channel_id)
+        if channel is None:
+            logger.error(f"Message channel {channel_id} not found.")
+            return False
+
+        # Delete any messages older than set duration, messages before the
+        # watermark were handled by an earlier run
+        cutoff = datetime.now(UTC) - timedelta(minutes=duration)
+        num_removed, num_errors = await automod_channel(
+            channel,
+            cutoff,
+            automod_pacer,
+            after=channel_watermarks.get(channel_id),
+        )
+        if num_errors == 0:
+            channel_watermarks[channel_id] = time_snowflake(cutoff)
+
+        if channel_id not in _scheduled_channels:
+            # later messages are scheduled as they are sent
+            async for message in channel.history(limit=None, after=cutoff):
+                schedule_message(message)
+            _scheduled_channels.add(channel_id)
+        elapsed = time.perf_counter() - started
+
+        # Log interally if any messages are removed or failed to be removed
+        if num_removed > 0 or num_errors > 0:
+            logger.info(
+                f"Removed a total of {num_removed} messages from channel #{channel.name} in {elapsed:.2f}s. {num_errors} failed removals."
+            )
+
+            # Log externally to monitor channel if any messages are failed to be removed
+            if num_errors > 0:
+                async with create_channel_automod_embed(
+                    self,
+                    channel_id,
+                    num_removed,
+                    num_errors,
+                    datetime.now(UTC),
+                ):
+                    pass
+
+        else:
+            logger.info(
+                f"No messages were marked for deletion in channel {channel_id} ({elapsed:.2f}s)."
+            )
+        return num_errors == 0
+    except Exception as e:
+        logger.error(e, exc_info=e)
+        async with create_interaction_embed_context(
+            get_log_channel(self),
+            user=self.user,
+            timestamp=datetime.now(UTC),
+            description=f"Automod task failed to process channel <#{channel_id}>: {e}",
+        ):
+            pass
+        return False
+
+
 @autodelete_threads.before_loop
 async def before_autodelete_threads():
-    logger.info("Forum Automod started, task running every 24 hours.")
+    logger.info(
+        f"Forum Automod started, threads are deleted as they go inactive and swept every {THREAD_SWEEP_HOURS} hours."
+    )
@@ -1,10 +1,14 @@
-import asyncio
 import logging
+from collections.abc import Sequence
 from datetime import UTC, datetime, timedelta
 
 import discord
 from discord.utils import snowflake_time
 
+from moddingway.constants import ModerationEventType
+from moddingway.database.aio import automod_database
+from moddingway.moderation_log import moderation_log
+from moddingway.pacing import AdaptivePacer
 from moddingway.settings import get_settings
 from moddingway.util import (
     create_interaction_embed_context,
@@ -14,6 +18,10 @@ from moddingway.util import (
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# Discord's limits on bulk message deletion
+BULK_DELETE_MAX_MESSAGES = 100
+BULK_DELETE_MAX_AGE = timedelta(days=14)
+
 
 def create_autounexile_embed(
     self,
@@ -56,27 +64,99 @@ async def automod_thread(
     duration: int,
     num_removed: int,
     num_errors: int,
+    pacer: AdaptivePacer | None = None,
 ):
     if thread.flags.pinned:
         # skip the for loop if the thread is pinned
         return num_removed, num_errors
 
-    should_delete = _should_delete_thread(thread, duration)
+    should_delete = should_delete_thread(thread, duration)
 
     if not should_delete:
         return num_removed, num_errors
 
     # Execute deletion
     try:
-        await thread.delete()
+        if pacer is None:
+            await thread.delete()
+        else:
+            await pacer.call(thread.delete)
         logger.info(f"Thread {thread.id} has been deleted successfully")
+        moderation_log.record(
+            ModerationEventType.AUTOMOD_THREAD_DELETED,
+            thread.owner_id,
+            channel_id=thread.parent_id,
+            thread_id=thread.id,
+        )
         return num_removed + 1, num_errors
     except Exception as e:
         logger.error(f"Unexpected error for thread {thread.id}: {e}", exc_info=e)
         return num_removed, num_errors + 1
 
 
-def _should_delete_thread(
+def _thread_activity(thread: discord.Thread) -> tuple[int, datetime | None, bool]:
+    last_activity = (
+        snowflake_time(thread.last_message_id) if thread.last_message_id else None
+    )
+    return thread.id, last_activity, thread.flags.pinned
+
+
+async def automod_forum(
+    channel: discord.ForumChannel, duration: int, pacer: AdaptivePacer
+):
+    """
+    Delete the threads of channel inactive for duration days. Threads are
+    read from the automod thread index, only the active threads and the ones
+    archived since the previous run are fetched from Discord to refresh it.
+    """
+    now = datetime.now(UTC)
+    cutoff = now - timedelta(days=duration)
+    watermark = await automod_database.get_watermark(channel.id)
+
+    threads = {thread.id: thread for thread in channel.threads}
+    async for thread in channel.archived_threads(limit=None):
+        # newest archive first, anything archived before the previous run is
+        # already in the index
+        if watermark is not None and thread.archive_timestamp < watermark:
+            break
+        threads[thread.id] = thread
+
+    await automod_database.upsert_threads(
+        channel.id, [_thread_activity(thread) for thread in threads.values()]
+    )
+
+    num_removed = 0
+    num_errors = 0
+    gone = []
+    refreshed = []
+    for thread_id in await automod_database.get_expired_threads(channel.id, cutoff):
+        thread = threads.get(thread_id)
+        if thread is None:
+            try:
+                thread = await channel.guild.fetch_channel(thread_id)
+            except discord.NotFound:
+                gone.append(thread_id)
+                continue
+            if not isinstance(thread, discord.Thread):
+                gone.append(thread_id)
+                continue
+            refreshed.append(_thread_activity(thread))
+
+        previously_removed = num_removed
+        num_removed, num_errors = await automod_thread(
+            thread, duration, num_removed, num_errors, pacer
+        )
+        if num_removed > previously_removed:
+            gone.append(thread_id)
+
+    await automod_database.upsert_threads(channel.id, refreshed)
+    await automod_database.remove_threads(gone)
+    await automod_database.set_watermark(channel.id, now)
+
+    return num_removed, num_errors
+
+
+def should_delete_thread(
     thread: discord.Thread,
     duration: int,
 ) -> bool:
@@ -91,30 +171,97 @@ def _should_delete_thread(
     return False
 
 
-async def automod_channel(messages, duration: int, channel: str):
+async def bulk_delete_messages(
+    channel: discord.TextChannel,
+    messages: Sequence[discord.abc.Snowflake],
+    pacer: AdaptivePacer,
+):
+    """
+    Delete messages younger than 14 days in bulk deletes of up to 100 messages
+    """
+    num_removed = 0
+    num_errors = 0
+    for start in range(0, len(messages), BULK_DELETE_MAX_MESSAGES):
+        batch = messages[start : start + BULK_DELETE_MAX_MESSAGES]
+        try:
+            await pacer.call(channel.delete_messages, batch)
+            logger.info(
+                f"{len(batch)} messages have been bulk deleted from #{channel.name}"
+            )
+            num_removed += len(batch)
+            moderation_log.record(
+                ModerationEventType.AUTOMOD_MESSAGES_DELETED,
+                channel_id=channel.id,
+                message_ids=[message.id for message in batch],
+            )
+        except Exception as e:
+            logger.error(
+                f"Unexpected error bulk deleting {len(batch)} messages: {e}",
+                exc_info=e,
+            )
+            num_errors += len(batch)
+
+    return num_removed, num_errors
+
+
+async def automod_channel(
+    channel: discord.TextChannel,
+    cutoff: datetime,
+    pacer: AdaptivePacer,
+    after: int | None = None,
+):
+    """
+    Delete the unpinned messages of channel sent before cutoff. Only messages
+    sent after the after snowflake are scanned, messages younger than 14 days
+    are removed with bulk deletes of up to 100 messages.
+    """
     num_removed = 0
     num_errors = 0
+    # leave some slack for the time the scan takes, Discord rejects the whole
+    # bulk delete if any message is past the limit
+    bulk_cutoff = datetime.now(UTC) - BULK_DELETE_MAX_AGE + timedelta(minutes=5)
+    batch: list[discord.Message] = []
+
+    async def flush():
+        nonlocal num_removed, num_errors
+        removed, errors = await bulk_delete_messages(channel, batch, pacer)
+        num_removed += removed
+        num_errors += errors
+        batch.clear()
 
-    async for message in messages:
+    async for message in channel.history(
+        limit=None,
+        before=cutoff,
+        after=discord.Object(id=after) if after is not None else None,
+        oldest_first=False,
+    ):
         # Skip any pinned messages
         if message.pinned:
             continue
 
-        # Delete message if older than 150 minutes
-        now = datetime.now(UTC)
-        time_since = now - snowflake_time(message.id)
-        if time_since > timedelta(minutes=duration):
-            try:
-                await message.delete()
-                logger.info(
-                    f"Message {message.id} has been deleted successfully from #{channel}"
-                )
-                num_removed += 1
-                await asyncio.sleep(1)
-            except Exception as e:
-                logger.error(
-                    f"Unexpected error for message {message.id}: {e}", exc_info=e
-                )
-                num_errors += 1
+        if snowflake_time(message.id) > bulk_cutoff:
+            batch.append(message)
+            if len(batch) == BULK_DELETE_MAX_MESSAGES:
+                await flush()
+            continue
+
+        try:
+            await pacer.call(message.delete)
+            logger.info(
+                f"Message {message.id} has been deleted successfully from #{channel.name}"
+            )
+            num_removed += 1
+            moderation_log.record(
+                ModerationEventType.AUTOMOD_MESSAGES_DELETED,
+                message.author.id,
+                channel_id=channel.id,
+                message_ids=[message.id],
+            )
+        except Exception as e:
+            logger.error(f"Unexpected error for message {message.id}: {e}", exc_info=e)
+            num_errors += 1
+
+    if batch:
+        await flush()
 
     return num_removed, num_errors
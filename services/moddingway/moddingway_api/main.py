@@ -1,12 +1,16 @@
 import logging
 from contextlib import asynccontextmanager
+from dataclasses import asdict
 
 import anyio
 from fastapi import FastAPI
 from fastapi.responses import RedirectResponse
 from fastapi_pagination import add_pagination
 
-from moddingway.database import DatabaseConnection
+from moddingway.database import DatabaseConnection, migrations
+from moddingway.database.aio import executor
+from moddingway.database.users_database import user_cache
+from moddingway.moderation_log import moderation_log
 from moddingway_api.routes import (
     banform_router,
     banneduser_router,
@@ -20,12 +24,13 @@ async def lifespan(app: FastAPI):
     configure_logging()
     database_connection = DatabaseConnection()
     await anyio.to_thread.run_sync(database_connection.connect)  # ty: ignore[unresolved-attribute]
-    await anyio.to_thread.run_sync(database_connection.create_tables)  # ty: ignore[unresolved-attribute]
+    await anyio.to_thread.run_sync(migrations.migrate)  # ty: ignore[unresolved-attribute]
     app.state.db = database_connection
 
     try:
         yield
     finally:
+        await moderation_log.close()
         try:
             app.state.db.disconnect()
         except Exception:
@@ -50,6 +55,15 @@ def health_check():
     return {"status": "ok"}
 
 
+@app.get("/health/db")
+def database_health_check():
+    return {
+        "pool": asdict(DatabaseConnection().metrics()),
+        "executor": asdict(executor.metrics()),
+        "user_cache": asdict(user_cache.metrics()),
+    }
+
+
 app.include_router(user_router, tags=["user"])
 app.include_router(mod_router, tags=["mod"])
 app.include_router(banneduser_router, tags=["ban"])
@@ -1,16 +1,24 @@
 import logging
 from datetime import UTC, datetime
+from typing import Annotated
 
-from fastapi import APIRouter, HTTPException
-from fastapi_pagination import Page
+from fastapi import APIRouter, Depends, HTTPException
 
-from moddingway.constants import MAX_APPEAL_REASON_LENGTH
-from moddingway.database import banforms_database, users_database
+from moddingway.constants import MAX_APPEAL_REASON_LENGTH, ModerationEventType
+from moddingway.database.aio import banforms_database, users_database
 from moddingway.database.models import BanForm
+from moddingway.moderation_log import moderation_log
 from moddingway.settings import get_settings
 from moddingway_api.routes.banneduser_routes import unban_user
 from moddingway_api.schemas.ban_form_schema import FormRequest, UpdateRequest
-from moddingway_api.utils.paginate import paginate, parse_pagination_params
+from moddingway_api.schemas.counted_page_schema import CountedPage
+from moddingway_api.schemas.cursor_page_schema import CursorPage
+from moddingway_api.utils.paginate import (
+    CursorParams,
+    cursor_paginate,
+    decode_cursor,
+    paginate_query,
+)
 
 router = APIRouter(prefix="/banforms")
 settings = get_settings()
@@ -19,20 +27,36 @@ logger = logging.getLogger(__name__)
 
 
 @router.get("")
-async def get_ban_forms() -> Page[BanForm]:
-    page, size = parse_pagination_params()
-    limit = size
-    offset = (page - 1) * size
+async def get_ban_forms() -> CountedPage[BanForm]:
+    return await paginate_query(
+        banforms_database.get_ban_forms_page, transform=lambda db_form: db_form
+    )
+
 
-    db_form_list = banforms_database.get_ban_forms(limit, offset)
-    total_count = banforms_database.get_form_count()
+# declared before /{form_id} so "cursor" is not parsed as an id
+@router.get("/cursor")
+async def get_ban_forms_by_cursor(
+    params: Annotated[CursorParams, Depends()],
+) -> CursorPage[BanForm]:
+    db_form_list = await banforms_database.get_ban_forms_after(
+        decode_cursor(params.after), params.size + 1
+    )
+    total_count = (
+        await banforms_database.get_form_count() if params.include_total else None
+    )
 
-    return paginate(db_form_list, length_function=lambda _: total_count)
+    return cursor_paginate(
+        db_form_list,
+        params.size,
+        key=lambda db_form: db_form.form_id,
+        transform=lambda db_form: db_form,
+        total=total_count,
+    )
 
 
 @router.get("/{form_id}")
 async def get_ban_form_by_id(form_id: int) -> BanForm | None:
-    db_form = banforms_database.get_ban_form(form_id)
+    db_form = await banforms_database.get_ban_form(form_id)
 
     if not db_form:
         raise HTTPException(status_code=404, detail="Form not found")
@@ -50,7 +74,7 @@ async def get_ban_form_by_id(form_id: int) -> BanForm | None:
 
 @router.post("")
 async def submit_form(request: FormRequest):
-    db_user = users_database.get_user(int(request.user_id))
+    db_user = await users_database.get_user(int(request.user_id))
 
     if db_user:
         if not db_user.is_banned:
@@ -67,7 +91,7 @@ async def submit_form(request: FormRequest):
                 "detail": f"Appeal reason max length is {MAX_APPEAL_REASON_LENGTH} characters. Please shorten the appeal reason."
             }
 
-        result = banforms_database.add_form(form)
+        result = await banforms_database.add_form(form)
 
         if result:
             # TODO: logging to moddingway
@@ -80,16 +104,23 @@ async def submit_form(request: FormRequest):
 
 @router.patch("")
 async def update_form(request: UpdateRequest):
-    db_form = banforms_database.get_ban_form(int(request.form_id))
+    db_form = await banforms_database.get_ban_form(int(request.form_id))
     if not db_form:
         raise HTTPException(status_code=404, detail="Form not found")
 
-    result = banforms_database.update_form(
+    result = await banforms_database.update_form(
         request.form_id, request.approval, request.approver_id
     )
-    if result is not None and result[0]:
-        db_user = banforms_database.get_user_from_form(result[1])
-        if db_user:
+    if result is not None:
+        db_user = await banforms_database.get_user_from_form(result[1])
+        moderation_log.record(
+            ModerationEventType.FORM_DECISION,
+            db_user,
+            int(request.form_id),
+            actor_id=request.approver_id,
+            approval=request.approval,
+        )
+        if result[0] and db_user:
             try:
                 await unban_user(str(db_user))
             except Exception as e:
@@ -1,14 +1,21 @@
 import re
+from typing import Annotated
 
 import httpx
-from fastapi import APIRouter, HTTPException
-from fastapi_pagination import Page
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
-from moddingway.database import users_database
+from moddingway.database.aio import users_database
 from moddingway.settings import get_settings
 from moddingway_api.schemas.banned_user_schema import Banned
-from moddingway_api.utils.paginate import paginate, parse_pagination_params
+from moddingway_api.schemas.counted_page_schema import CountedPage
+from moddingway_api.schemas.cursor_page_schema import CursorPage
+from moddingway_api.utils.paginate import (
+    CursorParams,
+    cursor_paginate,
+    decode_cursor,
+    paginate_query,
+)
 
 router = APIRouter(prefix="/bannedUsers")
 settings = get_settings()
@@ -24,19 +31,31 @@ class BanRequest(BaseModel):
 
 
 @router.get("")
-async def get_banned_users() -> Page[Banned]:
-    page, size = parse_pagination_params()
-    limit = size
-    offset = (page - 1) * size
+async def get_banned_users() -> CountedPage[Banned]:
+    return await paginate_query(
+        users_database.get_banned_users_page,
+        transform=lambda db_banned: Banned(userID=str(db_banned.user_id)),
+    )
 
-    db_banned_list = users_database.get_banned_users(limit, offset)
-    total_count = users_database.get_banned_count()
 
-    banned_list = [
-        Banned(userID=str(db_banned.user_id)) for db_banned in db_banned_list
-    ]
+@router.get("/cursor")
+async def get_banned_users_by_cursor(
+    params: Annotated[CursorParams, Depends()],
+) -> CursorPage[Banned]:
+    db_banned_list = await users_database.get_banned_users_after(
+        decode_cursor(params.after), params.size + 1
+    )
+    total_count = (
+        await users_database.get_banned_count() if params.include_total else None
+    )
 
-    return paginate(banned_list, length_function=lambda _: total_count)
+    return cursor_paginate(
+        db_banned_list,
+        params.size,
+        key=lambda db_banned: db_banned.user_id,
+        transform=lambda db_banned: Banned(userID=str(db_banned.user_id)),
+        total=total_count,
+    )
 
 
 @router.post("")
@@ -1,16 +1,43 @@
-from fastapi import APIRouter, HTTPException
-from fastapi_pagination import Page
+from typing import Annotated
 
-from moddingway.database import users_database
+from fastapi import APIRouter, Depends, HTTPException
+
+from moddingway.database.aio import users_database
+from moddingway_api.schemas.counted_page_schema import CountedPage
+from moddingway_api.schemas.cursor_page_schema import CursorPage
 from moddingway_api.schemas.mod_schema import Mod
-from moddingway_api.utils.paginate import paginate, parse_pagination_params
+from moddingway_api.utils.paginate import (
+    CursorParams,
+    cursor_paginate,
+    decode_cursor,
+    paginate_query,
+)
 
 router = APIRouter(prefix="/mods")
 
 
+# declared before /{mod_id} so "cursor" is not parsed as an id
+@router.get("/cursor")
+async def get_mods_by_cursor(
+    params: Annotated[CursorParams, Depends()],
+) -> CursorPage[Mod]:
+    db_mod_list = await users_database.get_mods_after(
+        decode_cursor(params.after), params.size + 1
+    )
+    total_count = await users_database.get_mod_count() if params.include_total else None
+
+    return cursor_paginate(
+        db_mod_list,
+        params.size,
+        key=lambda db_mod: db_mod.user_id,
+        transform=lambda db_mod: Mod(modID=str(db_mod.user_id)),
+        total=total_count,
+    )
+
+
 @router.get("/{mod_id}")
 async def get_mod_by_id(mod_id: int) -> Mod | None:
-    db_user = users_database.get_user(mod_id)
+    db_user = await users_database.get_user(mod_id)
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
     if db_user.has_mod_permissions():
@@ -21,14 +48,8 @@ async def get_mod_by_id(mod_id: int) -> Mod | None:
 
 
 @router.get("")
-async def get_mods() -> Page[Mod]:
-    page, size = parse_pagination_params()
-    limit = size
-    offset = (page - 1) * size
-
-    db_mod_list = users_database.get_mods(limit, offset)
-    total_count = users_database.get_mod_count()
-
-    mod_list = [Mod(modID=str(db_mod.user_id)) for db_mod in db_mod_list]
-
-    return paginate(mod_list, length_function=lambda _: total_count)
+async def get_mods() -> CountedPage[Mod]:
+    return await paginate_query(
+        users_database.get_mods_page,
+        transform=lambda db_mod: Mod(modID=str(db_mod.user_id)),
+    )
@@ -1,16 +1,49 @@
-from fastapi import APIRouter, HTTPException
-from fastapi_pagination import Page
+from typing import Annotated
 
-from moddingway.database import users_database
+from fastapi import APIRouter, Depends, HTTPException
+
+from moddingway.database.aio import users_database
+from moddingway_api.schemas.counted_page_schema import CountedPage
+from moddingway_api.schemas.cursor_page_schema import CursorPage
 from moddingway_api.schemas.user_schema import User
-from moddingway_api.utils.paginate import paginate, parse_pagination_params
+from moddingway_api.utils.paginate import (
+    CursorParams,
+    cursor_paginate,
+    decode_cursor,
+    paginate_query,
+)
 
 router = APIRouter(prefix="/users")
 
 
+# declared before /{user_id} so "cursor" is not parsed as an id
+@router.get("/cursor")
+async def get_users_by_cursor(
+    params: Annotated[CursorParams, Depends()],
+) -> CursorPage[User]:
+    db_user_list = await users_database.get_users_after(
+        decode_cursor(params.after), params.size + 1
+    )
+    total_count = (
+        await users_database.get_user_count() if params.include_total else None
+    )
+
+    return cursor_paginate(
+        db_user_list,
+        params.size,
+        key=lambda db_user: db_user.user_id,
+        transform=lambda db_user: User(
+            userID=str(db_user.user_id),
+            isMod=db_user.has_mod_permissions(),
+            strikePoints=db_user.get_strike_points(),
+        ),
+        total=total_count,
+    )
+
+
 @router.get("/{user_id}")
 async def get_user_by_id(user_id: int) -> User | None:
-    db_user = users_database.get_user(user_id)
+    db_user = await users_database.get_user(user_id)
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
     user = User(
@@ -22,21 +55,12 @@ async def get_user_by_id(user_id: int) -> User | None:
 
 
 @router.get("")
-async def get_users() -> Page[User]:
-    page, size = parse_pagination_params()
-    limit = size
-    offset = (page - 1) * size
-
-    db_user_list = users_database.get_users(limit, offset)
-    total_count = users_database.get_user_count()
-
-    user_list = [
-        User(
+async def get_users() -> CountedPage[User]:
+    return await paginate_query(
+        users_database.get_users_page,
+        transform=lambda db_user: User(
             userID=str(db_user.user_id),
             isMod=db_user.has_mod_permissions(),
             strikePoints=db_user.get_strike_points(),
-        )
-        for db_user in db_user_list
-    ]
-
-    return paginate(user_list, length_function=lambda _: total_count)
+        ),
+    )
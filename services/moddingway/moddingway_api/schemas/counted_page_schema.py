@@ -0,0 +1,5 @@
+from fastapi_pagination import Page
+
+
+class CountedPage[T](Page[T]):
+    total_exact: bool = True  # False when total is a planner estimate
@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+
+class CursorPage[T](BaseModel):
+    items: list[T]
+    size: int
+    next_page: str | None = None  # cursor of the following page, None on the last page
+    total: int | None = None  # only filled in when requested with include_total
+    total_exact: bool | None = None  # False when total is a planner estimate
@@ -1,28 +1,91 @@
-from collections.abc import Callable, Sequence
-from typing import Any
+import base64
+import binascii
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from typing import Annotated, Any
 
+from fastapi import HTTPException, Query
 from fastapi_pagination.api import create_page
 from fastapi_pagination.utils import verify_params
 
+from moddingway.database.counts import Count
+from moddingway_api.schemas.cursor_page_schema import CursorPage
 
-def parse_pagination_params() -> tuple[int, int]:
-    params: Any
-    params, _ = verify_params(None, "limit-offset")
+CURSOR_PREFIX = "k:"
+CURSOR_PAGE_DEFAULT_SIZE = 50
+CURSOR_PAGE_MAX_SIZE = 100
 
-    return (params.page, params.size)
+
+@dataclass
+class CursorParams:
+    after: str | None = None  # next_page of the previous response
+    size: Annotated[int, Query(ge=1, le=CURSOR_PAGE_MAX_SIZE)] = (
+        CURSOR_PAGE_DEFAULT_SIZE
+    )
+    include_total: bool = False
 
 
-def paginate[T](
-    sequence: Sequence[T], length_function: Callable[[Sequence[T]], int]
+async def paginate_query[R, T](
+    fetch_page: Callable[[int, int], Awaitable[tuple[Sequence[R], Count]]],
+    transform: Callable[[R], T],
 ) -> Any:
+    """
+    Fetch the requested page and its total, fetch_page takes (limit, offset)
+    and returns (rows, total). Routes using it return a CountedPage.
+    """
     params: Any
     params, _ = verify_params(None, "limit-offset")
 
-    total = length_function(sequence)
+    rows, total = await fetch_page(params.size, (params.page - 1) * params.size)
 
-    # create page object with paginated items
     return create_page(
-        sequence,
+        [transform(row) for row in rows],
         params=params,
-        total=total,
+        total=total.value,
+        total_exact=total.exact,
+    )
+
+
+def encode_cursor(key: int) -> str:
+    return base64.urlsafe_b64encode(f"{CURSOR_PREFIX}{key}".encode()).decode()
+
+
+def decode_cursor(cursor: str | None) -> int:
+    """
+    Return the key a cursor points after, 0 (before every row) if no cursor was given
+    """
+    if cursor is None:
+        return 0
+
+    try:
+        decoded = base64.urlsafe_b64decode(cursor.encode()).decode()
+        if not decoded.startswith(CURSOR_PREFIX):
+            raise ValueError(decoded)
+        return int(decoded.removeprefix(CURSOR_PREFIX))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
+def cursor_paginate[R, T](
+    rows: Sequence[R],
+    size: int,
+    key: Callable[[R], int],
+    transform: Callable[[R], T],
+    total: Count | None = None,
+) -> CursorPage[T]:
+    """
+    Build a page out of rows fetched with a limit of size + 1, the extra row
+    only tells whether a following page exists
+    """
+    page_rows = rows[:size]
+    next_page = None
+    if len(rows) > size and page_rows:
+        next_page = encode_cursor(key(page_rows[-1]))
+
+    return CursorPage[T](
+        items=[transform(row) for row in page_rows],
+        size=size,
+        next_page=next_page,
+        total=total.value if total is not None else None,
+        total_exact=total.exact if total is not None else None,
     )
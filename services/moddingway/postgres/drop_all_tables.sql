@@ -1,4 +1,5 @@
 begin;
+drop view IF EXISTS effectiveUsers;
 drop table IF EXISTS forms;
 drop table IF EXISTS roles;
 drop table IF EXISTS notes;
@@ -7,5 +8,9 @@ drop table IF EXISTS exiles;
 drop table IF EXISTS users;
 drop table IF EXISTS commands;
 drop table IF EXISTS announcements;
+drop table IF EXISTS automodWatermarks;
+drop table IF EXISTS automodThreads;
+drop table IF EXISTS moderationEvents;
+drop table IF EXISTS schemaMigrations;
 
 commit;
@@ -1,5 +1,3 @@
-BEGIN;
-
 CREATE TABLE IF NOT EXISTS users (
 	userID INT GENERATED ALWAYS AS IDENTITY,
 	discordUserID VARCHAR(20) NOT NULL,
@@ -84,26 +82,36 @@ CREATE TABLE IF NOT EXISTS announcements (
 	sentFLAG BOOL NOT NULL DEFAULT FALSE,
 	PRIMARY KEY(announcementID)
 );
--- This can be removed after one deploy is run
-
--- Messy setup that allows us to do conditional logic in this postgres call
--- DO
--- $do$
--- BEGIN
---    IF exists (SELECT 1 	FROM information_schema.columns WHERE table_name='users' AND column_name='ismod') THEN
--- 		-- add role column
---    		alter table users add userRole SMALLINT NOT NULL default 1;
-
--- 		-- set current mods to mod role
--- 		update users set
--- 			userRole = 2
--- 			where ismod;
-
--- 		-- remove old column
--- 		alter table users drop column ismod;
---    END IF;
--- END;
--- $do$;
+
+CREATE TABLE IF NOT EXISTS automodWatermarks (
+	channelID VARCHAR(20) NOT NULL,
+	lastRunTimestamp TIMESTAMP NOT NULL,
+	PRIMARY KEY(channelID)
+);
+
+CREATE TABLE IF NOT EXISTS automodThreads (
+	threadID VARCHAR(20) NOT NULL,
+	channelID VARCHAR(20) NOT NULL,
+	lastActivityTimestamp TIMESTAMP,
+	isPinned BOOL NOT NULL DEFAULT FALSE,
+	PRIMARY KEY(threadID)
+);
+
+CREATE INDEX IF NOT EXISTS index_automodThreads_channelID_lastActivity ON automodThreads(channelID, lastActivityTimestamp);
+
+CREATE TABLE IF NOT EXISTS moderationEvents (
+	eventID BIGINT GENERATED ALWAYS AS IDENTITY,
+	eventType VARCHAR(32) NOT NULL,
+	actorID VARCHAR(20),
+	targetID VARCHAR(20),
+	relatedEntityID INT,
+	reason TEXT,
+	details JSONB NOT NULL DEFAULT '{}',
+	createdTimestamp TIMESTAMP NOT NULL,
+	PRIMARY KEY(eventID)
+);
+
+CREATE INDEX IF NOT EXISTS index_moderationEvents_targetID ON moderationEvents(targetID, createdTimestamp);
 
 -- This can be removed after one deploy is run (updating notes to add warnings)
 DO
@@ -125,4 +133,7 @@ CREATE TABLE IF NOT EXISTS commands (
 	PRIMARY KEY(commandID)
 );
 
-COMMIT;
+---- create above / drop below ----
+
+-- The baseline is irreversible, reverting it would drop every moderation table.
+-- Use postgres/drop_all_tables.sql to reset a local database instead.
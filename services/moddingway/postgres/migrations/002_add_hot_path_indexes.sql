@@ -0,0 +1,27 @@
+-- get_pending_unexiles, get_all_active_exiles
+CREATE INDEX IF NOT EXISTS index_exiles_exileStatus_endTimestamp ON exiles(exileStatus, endTimestamp);
+-- get_user_active_exile, get_user_exiles
+CREATE INDEX IF NOT EXISTS index_exiles_userID_exileStatus ON exiles(userID, exileStatus);
+-- list_strikes, strike point decay
+CREATE INDEX IF NOT EXISTS index_strikes_userID_createdTimestamp ON strikes(userID, createdTimestamp);
+-- get_user_notes
+CREATE INDEX IF NOT EXISTS index_notes_userID_createdTimestamp ON notes(userID, createdTimestamp);
+-- get_user_warnings
+CREATE INDEX IF NOT EXISTS index_notes_warnings_userID_createdTimestamp ON notes(userID, createdTimestamp) WHERE isWarning;
+-- get_sticky_roles, remove_sticky_roles
+CREATE INDEX IF NOT EXISTS index_roles_userID ON roles(userID);
+-- ban forms of a user
+CREATE INDEX IF NOT EXISTS index_forms_userID ON forms(userID);
+-- banned users listing
+CREATE INDEX IF NOT EXISTS index_users_banned_userID ON users(userID) WHERE isBanned;
+
+---- create above / drop below ----
+
+DROP INDEX IF EXISTS index_exiles_exileStatus_endTimestamp;
+DROP INDEX IF EXISTS index_exiles_userID_exileStatus;
+DROP INDEX IF EXISTS index_strikes_userID_createdTimestamp;
+DROP INDEX IF EXISTS index_notes_userID_createdTimestamp;
+DROP INDEX IF EXISTS index_notes_warnings_userID_createdTimestamp;
+DROP INDEX IF EXISTS index_roles_userID;
+DROP INDEX IF EXISTS index_forms_userID;
+DROP INDEX IF EXISTS index_users_banned_userID;
@@ -0,0 +1,66 @@
+-- Temporary points decay by one for every 90 days without an infraction.
+-- Reads go through effectiveUsers, which applies the decay on the fly. Writes
+-- store the decayed values, so users only change on disk when written anyway.
+-- Banned users do not decay.
+CREATE OR REPLACE FUNCTION strikeDecaySteps(
+	temporaryPoints INT,
+	lastInfractionTimestamp TIMESTAMP,
+	isBanned BOOL
+) RETURNS INT
+LANGUAGE SQL STABLE
+AS $$
+	SELECT CASE
+		WHEN isBanned OR lastInfractionTimestamp IS NULL OR temporaryPoints <= 0 THEN 0
+		-- one step per whole 90 days elapsed before today
+		ELSE LEAST(
+			temporaryPoints,
+			GREATEST(
+				CEIL(
+					EXTRACT(EPOCH FROM current_date - lastInfractionTimestamp)
+					/ EXTRACT(EPOCH FROM INTERVAL '90 day')
+				)::INT - 1,
+				0
+			)
+		)
+	END
+$$;
+
+CREATE OR REPLACE FUNCTION decayedTemporaryPoints(
+	temporaryPoints INT,
+	lastInfractionTimestamp TIMESTAMP,
+	isBanned BOOL
+) RETURNS INT
+LANGUAGE SQL STABLE
+AS $$
+	SELECT temporaryPoints - strikeDecaySteps(temporaryPoints, lastInfractionTimestamp, isBanned)
+$$;
+
+CREATE OR REPLACE FUNCTION decayedLastInfraction(
+	temporaryPoints INT,
+	lastInfractionTimestamp TIMESTAMP,
+	isBanned BOOL
+) RETURNS TIMESTAMP
+LANGUAGE SQL STABLE
+AS $$
+	SELECT lastInfractionTimestamp
+		+ strikeDecaySteps(temporaryPoints, lastInfractionTimestamp, isBanned) * INTERVAL '90 day'
+$$;
+
+CREATE OR REPLACE VIEW effectiveUsers AS
+SELECT
+	userID,
+	discordUserID,
+	discordGuildID,
+	userRole,
+	decayedTemporaryPoints(temporaryPoints, lastInfractionTimestamp, isBanned) AS temporaryPoints,
+	permanentPoints,
+	decayedLastInfraction(temporaryPoints, lastInfractionTimestamp, isBanned) AS lastInfractionTimestamp,
+	isBanned
+FROM users;
+
+---- create above / drop below ----
+
+DROP VIEW IF EXISTS effectiveUsers;
+DROP FUNCTION IF EXISTS decayedLastInfraction(INT, TIMESTAMP, BOOL);
+DROP FUNCTION IF EXISTS decayedTemporaryPoints(INT, TIMESTAMP, BOOL);
+DROP FUNCTION IF EXISTS strikeDecaySteps(INT, TIMESTAMP, BOOL);
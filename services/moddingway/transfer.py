@@ -0,0 +1,50 @@
+"""
+Bulk export and import of the moderation data:
+
+    python transfer.py export <directory> [--tables users strikes ...]
+    python transfer.py import <directory> [--tables users strikes ...]
+
+Run it again on the same directory to resume an interrupted transfer. See
+moddingway/database/bulk_transfer.py for the file layout.
+"""
+
+import argparse
+import logging
+
+from moddingway.database import DatabaseConnection, bulk_transfer, migrations
+from moddingway.settings import get_settings
+
+settings = get_settings()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("directory")
+    parser.add_argument(
+        "--tables",
+        nargs="+",
+        choices=[table.name for table in bulk_transfer.TABLES],
+        help="only transfer these tables, every table by default",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    logging.basicConfig(
+        level=settings.log_level,
+        format="%(asctime)s - %(name)s - %(levelname)s: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+    database_connection = DatabaseConnection()
+    database_connection.connect()
+    try:
+        if args.command == "export":
+            bulk_transfer.export_tables(args.directory, args.tables)
+        else:
+            migrations.migrate()
+            bulk_transfer.import_tables(args.directory, args.tables)
+    finally:
+        database_connection.disconnect()
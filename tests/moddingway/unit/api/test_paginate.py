@@ -0,0 +1,52 @@
+import pytest
+from fastapi import HTTPException
+
+from moddingway.database.counts import Count
+from moddingway_api.utils.paginate import cursor_paginate, decode_cursor, encode_cursor
+
+PAGE_SIZE = 2
+LAST_USER_ID = 5
+HTTP_BAD_REQUEST = 400
+
+
+def test_cursor_paginate__returns_cursor_of_last_item():
+    # Arrange
+    rows = [1, 2, 3]
+
+    # Act
+    page = cursor_paginate(rows, PAGE_SIZE, key=lambda row: row, transform=str)
+
+    # Assert
+    assert page.items == ["1", "2"]
+    assert decode_cursor(page.next_page) == PAGE_SIZE
+    assert page.total is None
+
+
+def test_cursor_paginate__last_page_has_no_cursor():
+    # Act
+    page = cursor_paginate(
+        [LAST_USER_ID],
+        PAGE_SIZE,
+        key=lambda row: row,
+        transform=str,
+        total=Count(1, exact=False),
+    )
+
+    # Assert
+    assert page.items == [str(LAST_USER_ID)]
+    assert page.next_page is None
+    assert page.total == 1
+    assert page.total_exact is False
+
+
+def test_decode_cursor__round_trip():
+    assert decode_cursor(encode_cursor(LAST_USER_ID)) == LAST_USER_ID
+    assert decode_cursor(None) == 0
+
+
+@pytest.mark.parametrize("cursor", ["zzz", "not-base64!", encode_cursor(1)[:-2]])
+def test_decode_cursor__invalid_cursor(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor)
+
+    assert exc_info.value.status_code == HTTP_BAD_REQUEST
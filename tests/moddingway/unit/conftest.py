@@ -4,7 +4,7 @@ import discord
 import pytest
 from pytest_mock.plugin import MockerFixture
 
-from moddingway import constants
+from moddingway import constants, moderation_log
 from moddingway.constants import UserRole
 from moddingway.database.models import User
 
@@ -18,13 +18,21 @@ def mock_datetime_now(mocker: MockerFixture, monkeypatch):
     monkeypatch.setattr(datetime, "datetime", datetime_mock)
 
 
+@pytest.fixture(autouse=True)
+def record_moderation_event(mocker: MockerFixture):
+    # moderation events are never written to the database by unit tests
+    return mocker.patch.object(moderation_log.moderation_log, "record")
+
+
 @pytest.fixture
 def create_role(mocker: MockerFixture):
     def __create_role(name: constants.Role):
-        mocked_role = mocker.Mock()
+        # a role has the same id wherever it shows up, like on Discord
+        mocked_role = mocker.Mock(id=list(constants.Role).index(name) + 1)
         # name is used specifically in the Mock constructor
         # we need to configure it outside the constructor
         mocked_role.name = name.value
+        mocked_role.is_default.return_value = False
 
         return mocked_role
 
@@ -60,6 +68,10 @@ def create_member(mocker: MockerFixture, naur_guild, create_role):
             id=id,
             add_roles=mocker.AsyncMock(),
             remove_roles=mocker.AsyncMock(),
+            edit=mocker.AsyncMock(),
+            get_role=lambda role_id: next(
+                (role for role in role_list if role.id == role_id), None
+            ),
         )
 
         mocked_member.create_dm = mocker.AsyncMock()
@@ -0,0 +1,80 @@
+import asyncio
+import threading
+
+import pytest
+from pytest_mock.plugin import MockerFixture
+
+from moddingway.database import aio
+from moddingway.database.aio import DatabaseExecutor
+
+DISCORD_USER_ID = 1234
+
+
+@pytest.mark.asyncio
+async def test_async_module__runs_off_event_loop(mocker: MockerFixture):
+    loop_thread = threading.get_ident()
+    calling_threads = []
+
+    def __get_user(discord_user_id):
+        calling_threads.append(threading.get_ident())
+        return discord_user_id
+
+    mocker.patch("moddingway.database.users_database.get_user", side_effect=__get_user)
+
+    res = await aio.users_database.get_user(DISCORD_USER_ID)
+
+    assert res == DISCORD_USER_ID
+    assert calling_threads
+    assert calling_threads[0] != loop_thread
+
+
+def test_async_module__rejects_non_functions():
+    with pytest.raises(AttributeError):
+        aio.users_database.User  # noqa: B018
+
+
+@pytest.mark.asyncio
+async def test_executor__bounds_pending_calls():
+    executor = DatabaseExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def __blocking_call():
+        nonlocal active, max_active
+        with lock:
+            active += 1
+            max_active = max(max_active, active)
+        release.wait(1)
+        with lock:
+            active -= 1
+
+    tasks = [asyncio.create_task(executor.run(__blocking_call)) for _ in range(4)]
+    await asyncio.sleep(0.05)
+
+    slots = executor._get_slots()
+    assert slots.locked()
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert max_active == 1
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_executor__records_latency_histogram():
+    executor = DatabaseExecutor(max_workers=1, max_queue=0)
+
+    await executor.run(lambda: None)
+    metrics = executor.metrics()
+
+    assert metrics.completed == 1
+    assert metrics.queued == 0
+    assert metrics.running == 0
+    assert metrics.latency_histogram["+Inf"] == 1
+    assert list(metrics.latency_histogram.values()) == sorted(
+        metrics.latency_histogram.values()
+    )
+    executor.shutdown()
@@ -0,0 +1,137 @@
+import gzip
+
+import pytest
+from pytest_mock.plugin import MockerFixture
+
+from moddingway.database import bulk_transfer
+
+CSV = b"userID,discordUserID\n1,123\n"
+ROWS = 1
+
+
+def test_select_tables__keeps_foreign_key_order():
+    # Act
+    tables = bulk_transfer.select_tables(["forms", "users"])
+
+    # Assert
+    assert [table.name for table in tables] == ["users", "forms"]
+
+
+def test_select_tables__rejects_unknown_tables():
+    with pytest.raises(ValueError):
+        bulk_transfer.select_tables(["users", "commands"])
+
+
+def test_manifest__round_trips(tmp_path):
+    # Arrange
+    manifest = bulk_transfer.read_manifest(str(tmp_path))
+    manifest["exported"]["users"] = {"file": "users.csv.gz", "rows": ROWS}
+
+    # Act
+    bulk_transfer.write_manifest(str(tmp_path), manifest)
+
+    # Assert
+    assert bulk_transfer.read_manifest(str(tmp_path)) == manifest
+
+
+def test_export_table__streams_compressed_copy(mocker: MockerFixture, tmp_path):
+    # Arrange
+    cursor = mocker.Mock(rowcount=ROWS)
+    cursor.copy_expert.side_effect = lambda sql, fd, size: fd.write(CSV)
+    path = tmp_path / "users.csv.gz"
+
+    # Act
+    rows = bulk_transfer.export_table(cursor, bulk_transfer.TABLES[0], str(path))
+
+    # Assert
+    assert rows == ROWS
+    assert gzip.decompress(path.read_bytes()) == CSV
+    assert not (tmp_path / "users.csv.gz.partial").exists()
+    assert cursor.copy_expert.call_args.args[0].startswith("COPY (SELECT userID,")
+
+
+def test_import_table__rolls_back_failed_table(mocker: MockerFixture, tmp_path):
+    # Arrange
+    path = tmp_path / "users.csv.gz"
+    path.write_bytes(gzip.compress(CSV))
+    cursor = mocker.Mock()
+    cursor.copy_expert.side_effect = RuntimeError("foreign key violation")
+
+    # Act
+    with pytest.raises(RuntimeError):
+        bulk_transfer.import_table(
+            cursor, bulk_transfer.TABLES[0], str(path), str(path)
+        )
+
+    # Assert
+    assert cursor.execute.call_args.args == ("ROLLBACK;",)
+
+
+def _executed(cursor) -> list[str]:
+    return [call.args[0] for call in cursor.execute.call_args_list]
+
+
+def test_import_table__regenerates_ids_and_maps_users(mocker: MockerFixture, tmp_path):
+    # Arrange
+    path = tmp_path / "table.csv.gz"
+    path.write_bytes(gzip.compress(CSV))
+    cursor = mocker.Mock()
+    cursor.fetchone.return_value = (0,)  # every exported user is known locally
+    users, strikes = bulk_transfer.TABLES[0], bulk_transfer.TABLES[1]
+
+    # Act
+    bulk_transfer.import_table(cursor, users, str(path), str(path))
+    bulk_transfer.import_table(cursor, strikes, str(path), str(path))
+
+    # Assert
+    inserts = [sql for sql in _executed(cursor) if "INSERT INTO" in sql]
+    users_insert, strikes_insert = inserts
+    # exported ids that collide with local rows are never written as is
+    assert "OVERRIDING SYSTEM VALUE" not in users_insert + strikes_insert
+    assert "INSERT INTO users (discordUserID," in users_insert
+    assert "ON CONFLICT (discordUserID, discordGuildID) DO NOTHING" in users_insert
+    assert "INSERT INTO strikes (userID," in strikes_insert
+    assert "SELECT u.userID," in strikes_insert
+    assert "u.discordUserID = su.discordUserID" in strikes_insert
+
+
+def test_import_table__refuses_rows_of_unknown_users(mocker: MockerFixture, tmp_path):
+    # Arrange
+    path = tmp_path / "table.csv.gz"
+    path.write_bytes(gzip.compress(CSV))
+    cursor = mocker.Mock()
+    cursor.fetchone.return_value = (ROWS,)
+
+    # Act
+    with pytest.raises(ValueError, match="strikes belong to users missing"):
+        bulk_transfer.import_table(
+            cursor, bulk_transfer.TABLES[1], str(path), str(path)
+        )
+
+    # Assert
+    assert not any("INSERT INTO" in sql for sql in _executed(cursor))
+    assert _executed(cursor)[-1] == "ROLLBACK;"
+
+
+def test_import_tables__skips_imported_tables(mocker: MockerFixture, tmp_path):
+    # Arrange
+    manifest = bulk_transfer.read_manifest(str(tmp_path))
+    for table in bulk_transfer.TABLES:
+        manifest["exported"][table.name] = {
+            "file": table.filename,
+            "rows": ROWS,
+            "columns": list(table.columns),
+        }
+    manifest["imported"]["users"] = {"rows": ROWS, "inserted": ROWS}
+    bulk_transfer.write_manifest(str(tmp_path), manifest)
+    mocker.patch("moddingway.database.bulk_transfer.DatabaseConnection")
+    mocked_import = mocker.patch(
+        "moddingway.database.bulk_transfer.import_table", return_value=(ROWS, ROWS)
+    )
+
+    # Act
+    bulk_transfer.import_tables(str(tmp_path), ["users", "strikes"])
+
+    # Assert
+    assert [call.args[1].name for call in mocked_import.call_args_list] == ["strikes"]
+    assert "strikes" in bulk_transfer.read_manifest(str(tmp_path))["imported"]
@@ -0,0 +1,51 @@
+from pytest_mock.plugin import MockerFixture
+
+from moddingway.database.cache import TTLCache
+
+MAX_SIZE = 2
+
+
+def test_ttl_cache__evicts_least_recently_used():
+    # Arrange
+    cache = TTLCache[str, int](max_size=MAX_SIZE, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+
+    # Act
+    cache.put("c", 3)
+
+    # Assert
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    metrics = cache.metrics()
+    assert metrics.evictions == 1
+    assert metrics.hits == MAX_SIZE
+    assert metrics.misses == 1
+
+
+def test_ttl_cache__expired_entry_is_a_miss(mocker: MockerFixture):
+    # Arrange
+    mocked_monotonic = mocker.patch(
+        "moddingway.database.cache.time.monotonic", return_value=0
+    )
+    cache = TTLCache[str, int](max_size=MAX_SIZE, ttl=60)
+    cache.put("a", 1)
+
+    # Act
+    mocked_monotonic.return_value = 60
+
+    # Assert
+    assert cache.get("a") is None
+    assert cache.metrics().size == 0
+
+
+def test_ttl_cache__returns_copies():
+    cache = TTLCache[str, list](max_size=MAX_SIZE, ttl=60, copy=list)
+    value = [1]
+    cache.put("a", value)
+    value.append(2)
+
+    cache.get("a").append(3)
+
+    assert cache.get("a") == [1]
@@ -0,0 +1,115 @@
+import psycopg2
+import pytest
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from pytest_mock.plugin import MockerFixture
+
+from moddingway.database import connection
+from moddingway.database.connection import DatabaseConnection, PoolTimeoutError
+
+POOL_MAX_SIZE = 2
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(DatabaseConnection, "_instance", None)
+    monkeypatch.setattr(connection.settings, "postgres_pool_min_size", 1)
+    monkeypatch.setattr(connection.settings, "postgres_pool_max_size", POOL_MAX_SIZE)
+    monkeypatch.setattr(connection.settings, "postgres_pool_timeout", 0.01)
+    monkeypatch.setattr(connection.settings, "postgres_pool_health_check_idle", 30)
+    return DatabaseConnection()
+
+
+@pytest.fixture
+def mock_connect(mocker: MockerFixture):
+    def __create_connection(*args, **kwargs):
+        mocked_connection = mocker.Mock(closed=0, last_used_at=0)
+        mocked_connection.info.transaction_status = TRANSACTION_STATUS_IDLE
+        mocked_connection.cursor.return_value.__enter__ = mocker.Mock(
+            return_value=mocked_connection.cursor.return_value
+        )
+        mocked_connection.cursor.return_value.__exit__ = mocker.Mock(return_value=False)
+        return mocked_connection
+
+    return mocker.patch(
+        "moddingway.database.connection.psycopg2.connect",
+        side_effect=__create_connection,
+    )
+
+
+def test_get_cursor__reuses_pooled_connection(pool, mock_connect):
+    pool.connect()
+
+    for _ in range(POOL_MAX_SIZE):
+        with pool.get_cursor():
+            pass
+
+    assert mock_connect.call_count == 1
+    metrics = pool.metrics()
+    assert metrics.checkouts == POOL_MAX_SIZE
+    assert metrics.in_use == 0
+    assert metrics.idle == 1
+
+
+def test_get_cursor__pool_exhausted(pool, mock_connect):
+    with pool.get_cursor(), pool.get_cursor():
+        with pytest.raises(PoolTimeoutError):
+            with pool.get_cursor():
+                pass
+
+        assert pool.metrics().in_use == POOL_MAX_SIZE
+
+    metrics = pool.metrics()
+    assert metrics.timeouts == 1
+    assert metrics.size == POOL_MAX_SIZE
+
+
+def test_get_cursor__replaces_closed_connection(pool, mock_connect):
+    pool.connect()
+    stale_connection = pool._idle[0]
+    stale_connection.closed = 2
+
+    with pool.get_cursor():
+        pass
+
+    assert pool._idle[0] is not stale_connection
+    assert pool.metrics().reconnects == 1
+    assert mock_connect.call_count == 1 + pool.metrics().reconnects
+
+
+def test_get_cursor__statement_timeout_is_reset(pool, mock_connect):
+    with pool.get_cursor(statement_timeout_ms=500) as cursor:
+        pass
+
+    executed = [call.args[0] for call in cursor.execute.call_args_list]
+    assert executed == ["SET statement_timeout = %s", "RESET statement_timeout"]
+
+
+def test_disconnect__closes_connections_returned_afterwards(pool, mock_connect):
+    pool.connect()
+    checked_out = pool._idle[0]
+
+    with pool.get_cursor():
+        pool.disconnect()
+
+    checked_out.close.assert_called_once()
+    metrics = pool.metrics()
+    assert metrics.idle == 0
+    assert metrics.size == 0
+
+
+def test_open_connection__retries_with_backoff(
+    pool, mock_connect, mocker: MockerFixture, monkeypatch
+):
+    monkeypatch.setattr(connection.settings, "postgres_connect_retries", 3)
+    mocked_sleep = mocker.patch("moddingway.database.connection.time.sleep")
+    healthy_connection = mock_connect.side_effect()
+    mock_connect.side_effect = [
+        psycopg2.OperationalError("down"),
+        psycopg2.OperationalError("still down"),
+        healthy_connection,
+    ]
+
+    res = pool._open_connection(0)
+
+    assert res is healthy_connection
+    assert [call.args[0] for call in mocked_sleep.call_args_list] == [0.5, 1.0]
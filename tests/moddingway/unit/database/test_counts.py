@@ -0,0 +1,79 @@
+import pytest
+from pytest_mock.plugin import MockerFixture
+
+from moddingway.database.counts import Count, CountCache, fetch_counted_page
+
+ESTIMATE_THRESHOLD = 1000
+LARGE_TABLE_ROWS = 50000
+TOTAL_ROWS = 7
+PAGE_SIZE = 2
+
+
+@pytest.fixture
+def cache(mocker: MockerFixture):
+    cache = CountCache(ttl=60, estimate_threshold=ESTIMATE_THRESHOLD)
+    mocker.patch.object(cache, "_schedule_refresh")
+    return cache
+
+
+def test_lookup__filtered_source_miss(cache, mocker: MockerFixture):
+    cursor = mocker.Mock()
+
+    assert cache.lookup(cursor, "banned_users") is None
+    cursor.execute.assert_not_called()
+
+
+def test_lookup__large_table_returns_estimate(cache, mocker: MockerFixture):
+    # Arrange
+    cursor = mocker.Mock()
+    cursor.fetchone.return_value = (LARGE_TABLE_ROWS,)
+
+    # Act
+    res = cache.lookup(cursor, "users")
+
+    # Assert
+    assert res == Count(value=LARGE_TABLE_ROWS, exact=False)
+    cache._schedule_refresh.assert_called_once_with("users")
+
+
+def test_lookup__small_table_is_counted_exactly(cache, mocker: MockerFixture):
+    cursor = mocker.Mock()
+    cursor.fetchone.return_value = (-1,)
+
+    assert cache.lookup(cursor, "users") is None
+    cache._schedule_refresh.assert_not_called()
+
+
+def test_lookup__stale_entry_is_served_while_refreshing(cache, mocker: MockerFixture):
+    # Arrange
+    cursor = mocker.Mock()
+    cache.store("mods", Count(value=TOTAL_ROWS, exact=True))
+    cache.ttl = 0
+
+    # Act
+    res = cache.lookup(cursor, "mods")
+
+    # Assert
+    assert res == Count(value=TOTAL_ROWS, exact=True)
+    cursor.execute.assert_not_called()
+    cache._schedule_refresh.assert_called_once_with("mods")
+
+
+def test_fetch_counted_page__fills_cache_from_page_query(cache, mocker: MockerFixture):
+    # Arrange
+    mocker.patch("moddingway.database.counts.count_cache", cache)
+    cursor = mocker.Mock()
+    cursor.fetchall.return_value = [(1, TOTAL_ROWS), (2, TOTAL_ROWS)]
+
+    # Act
+    rows, count = fetch_counted_page(
+        cursor, "mods", columns="*", order_by="userID", limit=PAGE_SIZE, offset=0
+    )
+    _, cached_count = fetch_counted_page(
+        cursor, "mods", columns="*", order_by="userID", limit=PAGE_SIZE, offset=0
+    )
+
+    # Assert
+    assert rows == [(1,), (2,)]
+    assert count == cached_count == Count(value=TOTAL_ROWS, exact=True)
+    assert "COUNT(*) OVER()" not in cursor.execute.call_args.args[0]
@@ -0,0 +1,120 @@
+import pytest
+from pytest_mock.plugin import MockerFixture
+
+from moddingway.database.index_check import HOT_QUERIES, plan_indexes
+from moddingway.database.migrations import (
+    SEPARATOR,
+    load_migrations,
+    parse_migration,
+    pending_migrations,
+    rollback,
+)
+
+VERSION = 3
+
+
+def test_parse_migration__splits_up_and_down():
+    # Arrange
+    script = f"CREATE INDEX a ON t(c);\n\n{SEPARATOR}\n\nDROP INDEX a;\n"
+
+    # Act
+    migration = parse_migration(f"{VERSION:03d}_add_a.sql", script)
+
+    # Assert
+    assert migration.version == VERSION
+    assert migration.name == "add_a"
+    assert migration.up == "CREATE INDEX a ON t(c);"
+    assert migration.down == "DROP INDEX a;"
+
+
+@pytest.mark.parametrize(
+    ("filename", "script"),
+    [
+        ("add_a.sql", f"SELECT 1;\n{SEPARATOR}\n"),
+        ("003_add_a.sql", "SELECT 1;\n"),
+    ],
+)
+def test_parse_migration__rejects_malformed_files(filename, script):
+    with pytest.raises(ValueError):
+        parse_migration(filename, script)
+
+
+def test_load_migrations__orders_shipped_migrations_by_version():
+    # Act
+    migrations = load_migrations()
+
+    # Assert
+    versions = [migration.version for migration in migrations]
+    assert versions == sorted(versions)
+    assert all(migration.up for migration in migrations)
+    assert all(migration.down for migration in migrations[1:])
+
+
+def test_rollback__refuses_to_revert_baseline(mocker: MockerFixture):
+    # Arrange
+    mocked_connection = mocker.patch(
+        "moddingway.database.migrations.DatabaseConnection"
+    )
+    cursor = (
+        mocked_connection.return_value.get_cursor.return_value.__enter__.return_value
+    )
+    cursor.fetchall.return_value = [
+        (migration.version,) for migration in load_migrations()
+    ]
+
+    # Act
+    with pytest.raises(ValueError, match="irreversible"):
+        rollback(steps=len(load_migrations()))
+
+    # Assert
+    executed = [call.args[0] for call in cursor.execute.call_args_list]
+    assert "BEGIN;" not in executed
+    assert executed[-1].startswith("SELECT pg_advisory_unlock")
+
+
+def test_pending_migrations__skips_applied_versions():
+    # Arrange
+    migrations = load_migrations()
+
+    # Act
+    pending = pending_migrations(migrations, {migrations[0].version})
+
+    # Assert
+    assert pending == migrations[1:]
+
+
+def test_hot_queries__expect_indexes_created_by_migrations():
+    # Arrange
+    created = " ".join(migration.up for migration in load_migrations()).lower()
+
+    # Assert
+    for hot_query in HOT_QUERIES:
+        assert any(
+            f"{index} on" in created or index.endswith("_key")
+            for index in hot_query.indexes
+        ), hot_query.name
+
+
+def test_plan_indexes__collects_nested_index_scans():
+    # Arrange
+    plan = {
+        "Node Type": "Nested Loop",
+        "Plans": [
+            {"Node Type": "Index Scan", "Index Name": "users_pkey"},
+            {
+                "Node Type": "Bitmap Heap Scan",
+                "Plans": [
+                    {
+                        "Node Type": "Bitmap Index Scan",
+                        "Index Name": "index_notes_userID_createdTimestamp",
+                    }
+                ],
+            },
+        ],
+    }
+
+    # Act
+    indexes = plan_indexes(plan)
+
+    # Assert
+    assert indexes == {"users_pkey", "index_notes_userid_createdtimestamp"}
@@ -0,0 +1,51 @@
+from pytest_mock.plugin import MockerFixture
+
+from moddingway.database.paging import fetch_page
+
+TOTAL_ROWS = 7
+PAGE_SIZE = 2
+
+
+def test_fetch_page__returns_rows_and_total(mocker: MockerFixture):
+    # Arrange
+    cursor = mocker.Mock()
+    cursor.fetchall.return_value = [(1, "a", TOTAL_ROWS), (2, "b", TOTAL_ROWS)]
+
+    # Act
+    rows, total = fetch_page(
+        cursor, "*", "users WHERE userrole = %s", "userID", (2,), PAGE_SIZE, 0
+    )
+
+    # Assert
+    assert rows == [(1, "a"), (2, "b")]
+    assert total == TOTAL_ROWS
+    cursor.execute.assert_called_once()
+    assert cursor.execute.call_args.args[1] == (2, PAGE_SIZE, 0)
+
+
+def test_fetch_page__past_last_page_counts_separately(mocker: MockerFixture):
+    # Arrange
+    cursor = mocker.Mock()
+    cursor.fetchall.return_value = []
+    cursor.fetchone.return_value = (TOTAL_ROWS,)
+
+    # Act
+    rows, total = fetch_page(cursor, "*", "users", "userID", (), PAGE_SIZE, 10)
+
+    # Assert
+    assert rows == []
+    assert total == TOTAL_ROWS
+    assert cursor.execute.call_args.args == ("SELECT COUNT(*) FROM users;", ())
+
+
+def test_fetch_page__empty_first_page_skips_count(mocker: MockerFixture):
+    # Arrange
+    cursor = mocker.Mock()
+    cursor.fetchall.return_value = []
+
+    # Act
+    rows, total = fetch_page(cursor, "*", "users", "userID", (), PAGE_SIZE, 0)
+
+    # Assert
+    assert (rows, total) == ([], 0)
+    cursor.execute.assert_called_once()
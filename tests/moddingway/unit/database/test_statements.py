@@ -0,0 +1,62 @@
+import pytest
+from pytest_mock.plugin import MockerFixture
+
+from moddingway.database.connection import PooledConnection
+from moddingway.database.statements import InvalidSqlStatementName, PreparedStatement
+
+QUERY = "SELECT roleID FROM roles WHERE userID = %s AND roleID <> %s;"
+PARAMS = (1, "2")
+
+
+@pytest.fixture
+def pooled_cursor(mocker: MockerFixture):
+    connection = mocker.Mock(spec=PooledConnection)
+    connection.prepared_statements = set()
+    return mocker.Mock(connection=connection)
+
+
+def test_execute__prepares_once_per_connection(pooled_cursor):
+    # Arrange
+    statement = PreparedStatement("test_roles", QUERY)
+
+    # Act
+    statement.execute(pooled_cursor, PARAMS)
+    statement.execute(pooled_cursor, PARAMS)
+
+    # Assert
+    assert [call.args for call in pooled_cursor.execute.call_args_list] == [
+        (
+            "PREPARE test_roles AS SELECT roleID FROM roles WHERE userID = $1 AND roleID <> $2",
+        ),
+        ("EXECUTE test_roles (%s, %s)", PARAMS),
+        ("EXECUTE test_roles (%s, %s)", PARAMS),
+    ]
+
+
+def test_execute__prepares_again_when_server_lost_it(pooled_cursor):
+    # Arrange
+    statement = PreparedStatement("test_roles", QUERY)
+    pooled_cursor.connection.prepared_statements.add("test_roles")
+    pooled_cursor.execute.side_effect = [
+        InvalidSqlStatementName("prepared statement does not exist"),
+        None,
+        None,
+    ]
+
+    # Act
+    statement.execute(pooled_cursor, PARAMS)
+
+    # Assert
+    executed = [call.args[0] for call in pooled_cursor.execute.call_args_list]
+    assert executed[1].startswith("PREPARE test_roles AS")
+    assert executed[2] == "EXECUTE test_roles (%s, %s)"
+    assert pooled_cursor.connection.prepared_statements == {"test_roles"}
+
+
+def test_execute__plain_query_outside_of_pool(mocker: MockerFixture):
+    statement = PreparedStatement("test_roles", QUERY)
+    cursor = mocker.Mock()
+
+    statement.execute(cursor, PARAMS)
+
+    cursor.execute.assert_called_once_with(QUERY, PARAMS)
@@ -0,0 +1,105 @@
+import pytest
+from pytest_mock.plugin import MockerFixture
+
+from moddingway.constants import UserRole
+from moddingway.database import users_database
+from moddingway.database.cache import TTLCache
+from moddingway.database.models import User
+
+CACHE_SIZE = 2
+DISCORD_USER_ID = 123456789
+STRIKE_POINTS = 3
+
+
+def _create_user(temporary_points: int = 0) -> User:
+    return User(
+        user_id=1,
+        discord_user_id=str(DISCORD_USER_ID),
+        discord_guild_id="1",
+        user_role=UserRole.USER,
+        temporary_points=temporary_points,
+        permanent_points=0,
+        is_banned=False,
+    )
+
+
+@pytest.fixture
+def user_cache(monkeypatch):
+    user_cache = TTLCache(
+        max_size=CACHE_SIZE, ttl=60, copy=lambda user: user.model_copy()
+    )
+    monkeypatch.setattr(users_database, "user_cache", user_cache)
+    return user_cache
+
+
+@pytest.fixture
+def mock_cursor(mocker: MockerFixture):
+    mocked_connection = mocker.patch(
+        "moddingway.database.users_database.DatabaseConnection"
+    )
+    return mocked_connection.return_value.get_cursor.return_value.__enter__.return_value
+
+
+def test_get_user__served_from_cache_after_write(user_cache, mock_cursor):
+    # Arrange
+    db_user = _create_user(temporary_points=STRIKE_POINTS)
+    mock_cursor.fetchone.return_value = tuple(db_user.model_dump().values())
+    users_database.update_user_strike_points(db_user)
+    mock_cursor.execute.reset_mock()
+
+    # Act
+    res = users_database.get_user(DISCORD_USER_ID)
+
+    # Assert
+    assert res == db_user
+    assert res is not db_user
+    mock_cursor.execute.assert_not_called()
+    assert user_cache.metrics().hits == 1
+
+
+@pytest.mark.parametrize("created", [True, False])
+def test_get_or_create_user__single_upsert(user_cache, mock_cursor, created):
+    # Arrange
+    db_user = _create_user()
+    mock_cursor.fetchone.return_value = (*db_user.model_dump().values(), created)
+
+    # Act
+    res = users_database.get_or_create_user(DISCORD_USER_ID)
+
+    # Assert
+    assert res == (db_user, created)
+    mock_cursor.execute.assert_called_once()
+    assert "ON CONFLICT" in mock_cursor.execute.call_args.args[0]
+    assert user_cache.get(str(DISCORD_USER_ID)) == db_user
+
+
+def test_get_or_create_user__cached_user_skips_database(user_cache, mock_cursor):
+    db_user = _create_user()
+    user_cache.put(db_user.discord_user_id, db_user)
+
+    res = users_database.get_or_create_user(DISCORD_USER_ID)
+
+    assert res == (db_user, False)
+    mock_cursor.execute.assert_not_called()
+
+
+def test_apply_ban_corrections__counts_and_invalidates(user_cache, mock_cursor):
+    # Arrange
+    user_cache.put(str(DISCORD_USER_ID), _create_user())
+    mock_cursor.fetchall.return_value = [
+        (str(DISCORD_USER_ID), True, False),
+        ("2", False, False),
+        ("3", True, True),
+    ]
+
+    # Act
+    corrections = users_database.apply_ban_corrections(
+        [str(DISCORD_USER_ID), "3"], ["2"]
+    )
+
+    # Assert
+    assert corrections == users_database.BanCorrections(banned=1, unbanned=1, created=1)
+    assert user_cache.get(str(DISCORD_USER_ID)) is None
+    mock_cursor.execute.assert_called_once()
+    params = mock_cursor.execute.call_args.args[1]
+    assert params[:2] == ([str(DISCORD_USER_ID), "3", "2"], [True, True, False])
@@ -23,7 +23,8 @@ async def test_exile_user__unverified(mocker: MockerFixture, create_member):
         is_banned=False,
     )
     mocker.patch(
-        "moddingway.database.users_database.get_user", return_value=mock_database_user
+        "moddingway.database.users_database.get_or_create_user",
+        return_value=(mock_database_user, False),
     )
     mocker.patch(
         "moddingway.database.exiles_database.get_user_active_exile", return_value=None
@@ -59,11 +60,9 @@ async def test_exile_user__verified_existing_user_dm_failed(
     mocker.patch(
         "moddingway.database.exiles_database.get_user_active_exile", return_value=None
     )
-    mocker.patch(
-        "moddingway.database.users_database.get_user", return_value=mock_database_user
-    )
-    create_user_mock = mocker.patch(
-        "moddingway.database.users_database.add_user", return_value=mock_database_user
+    get_or_create_user_mock = mocker.patch(
+        "moddingway.database.users_database.get_or_create_user",
+        return_value=(mock_database_user, False),
     )
     exile_id = 4001
     mocker.patch("moddingway.database.exiles_database.add_exile", return_value=exile_id)
@@ -81,7 +80,7 @@ async def test_exile_user__verified_existing_user_dm_failed(
 
     # Assert
     assert res is None
-    create_user_mock.assert_not_called()
+    get_or_create_user_mock.assert_called_once_with(mocked_member.id)
     mocked_logging_embed.set_footer.assert_called_with(text=f"Exile ID: {exile_id}")
     # TODO check exile create call to confirm data is correct
 
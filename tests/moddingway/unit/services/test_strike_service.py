@@ -136,7 +136,11 @@ async def test_get_user_strikes(
 
 @pytest.mark.asyncio
 async def test_add_strike(
-    create_db_user, create_member, create_embed, mocker: MockerFixture
+    create_db_user,
+    create_member,
+    create_embed,
+    record_moderation_event,
+    mocker: MockerFixture,
 ):
     mocked_db_user = create_db_user(user_id=1, temporary_points=0, get_strike_points=0)
 
@@ -149,11 +153,18 @@ async def test_add_strike(
     mocked_logging_embed.add_field = mocker.Mock()
     mocked_logging_embed.set_footer = mocker.Mock()
 
-    mocked_get_user = mocker.patch(
-        "moddingway.database.users_database.get_user", return_value=mocked_db_user
+    mocked_get_or_create_user = mocker.patch(
+        "moddingway.database.users_database.get_or_create_user",
+        return_value=(mocked_db_user, False),
+    )
+    mocked_updated_db_user = create_db_user(
+        user_id=1,
+        temporary_points=constants.MODERATE_INFRACTION_POINTS,
+        get_strike_points=constants.MODERATE_INFRACTION_POINTS,
     )
     mocked_add_strike = mocker.patch(
-        "moddingway.database.strikes_database.add_strike", return_value=1
+        "moddingway.database.strikes_database.add_strike",
+        return_value=(1, mocked_updated_db_user),
     )
 
     mocked_strike = mocker.Mock()
@@ -163,11 +174,6 @@ async def test_add_strike(
         return_value=mocked_strike,
     )
 
-    mocked_update_user_strike_points = mocker.patch(
-        "moddingway.database.users_database.update_user_strike_points",
-        return_value=None,
-    )
-
     mocked_punishment = mocker.Mock()
     mocked__apply_punishment = mocker.patch(
         "moddingway.services.strike_service._apply_punishment",
@@ -182,7 +188,7 @@ async def test_add_strike(
         author=mocked_author,
     )
 
-    mocked_get_user.assert_called_with(mocked_user.id)
+    mocked_get_or_create_user.assert_called_with(mocked_user.id)
 
     mocked_strike_class.assert_called_with(
         user_id=mocked_user.id,
@@ -194,10 +200,32 @@ async def test_add_strike(
         last_edited_by=str(mocked_author.id),
     )
 
-    mocked_add_strike.assert_called_with(mocked_strike)
-
-    mocked_update_user_strike_points.assert_called_with(mocked_db_user)
+    mocked_add_strike.assert_called_with(
+        mocked_strike, constants.MODERATE_INFRACTION_POINTS, 0
+    )
 
     mocked__apply_punishment.assert_called_with(
-        mocked_logging_embed, mocked_user, mocked_db_user, 0
+        mocked_logging_embed, mocked_user, mocked_updated_db_user, 0
     )
+    record_moderation_event.assert_called_once_with(
+        constants.ModerationEventType.STRIKE,
+        mocked_user.id,
+        1,
+        "test",
+        actor_id=mocked_author.id,
+        severity="MODERATE",
+        temporary_points=constants.MODERATE_INFRACTION_POINTS,
+        permanent_points=0,
+    )
+
+
+@pytest.mark.parametrize(
+    "severity,expected_points",
+    [
+        (constants.StrikeSeverity.MINOR, (constants.MINOR_INFRACTION_POINTS, 0)),
+        (constants.StrikeSeverity.MODERATE, (constants.MODERATE_INFRACTION_POINTS, 0)),
+        (constants.StrikeSeverity.SERIOUS, (0, constants.SERIOUS_INFRACTION_POINTS)),
+    ],
+)
+def test_get_strike_point_penalty(severity, expected_points):
+    assert strike_service._get_strike_point_penalty(severity) == expected_points
@@ -0,0 +1,29 @@
+import asyncio
+
+from moddingway.flush_task import FlushTask
+
+
+async def test_ensure_started__restarts_finished_task():
+    # Arrange
+    runs = []
+
+    async def run(wakeup: asyncio.Event):
+        runs.append(wakeup)
+        await wakeup.wait()
+
+    flush_task = FlushTask("test", run)
+
+    # Act
+    first = flush_task.ensure_started()
+    same = flush_task.ensure_started()
+    first.set()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    second = flush_task.ensure_started()
+    await asyncio.sleep(0)
+    flush_task.stop()
+
+    # Assert
+    assert same is first
+    assert second is not first
+    assert runs == [first, second]
@@ -0,0 +1,71 @@
+import asyncio
+
+import discord
+from pytest_mock.plugin import MockerFixture
+
+from moddingway.log_sink import MAX_EMBEDS_PER_MESSAGE, LogSink
+
+EMBEDS = 25
+MAX_ATTEMPTS = 3
+SEND_ATTEMPTS = 2  # rate limited once, then sent
+
+
+async def test_submit__embeds_are_batched_per_channel(mocker: MockerFixture):
+    # Arrange
+    log_sink = LogSink(flush_interval=0.01)
+    channel = mocker.Mock(send=mocker.AsyncMock())
+    other_channel = mocker.Mock(send=mocker.AsyncMock())
+    embeds = [discord.Embed(description=str(i)) for i in range(EMBEDS)]
+
+    # Act
+    for embed in embeds:
+        log_sink.submit(channel, embed)
+    log_sink.submit(other_channel, embeds[0])
+    channel.send.assert_not_called()
+    await asyncio.sleep(0.05)
+
+    # Assert
+    sent = [call.kwargs["embeds"] for call in channel.send.call_args_list]
+    assert [len(batch) for batch in sent] == [
+        MAX_EMBEDS_PER_MESSAGE,
+        MAX_EMBEDS_PER_MESSAGE,
+        EMBEDS - 2 * MAX_EMBEDS_PER_MESSAGE,
+    ]
+    assert [embed for batch in sent for embed in batch] == embeds
+    other_channel.send.assert_called_once_with(embeds=[embeds[0]])
+    await log_sink.close()
+
+
+async def test_flush__retries_rate_limited_sends(mocker: MockerFixture):
+    # Arrange
+    log_sink = LogSink(max_attempts=MAX_ATTEMPTS)
+    mocked_sleep = mocker.patch("moddingway.log_sink.asyncio.sleep")
+    rate_limited = discord.HTTPException(mocker.Mock(status=429), "rate limited")
+    channel = mocker.Mock(send=mocker.AsyncMock(side_effect=[rate_limited, None]))
+    log_sink._pending.append((channel, discord.Embed(description="strike added")))
+
+    # Act
+    await log_sink.flush()
+
+    # Assert
+    assert channel.send.await_count == SEND_ATTEMPTS
+    mocked_sleep.assert_awaited_once()
+    assert len(log_sink) == 0
+
+
+async def test_close__resends_batch_cancelled_in_backoff(mocker: MockerFixture):
+    # Arrange
+    log_sink = LogSink(flush_interval=0)
+    rate_limited = discord.HTTPException(mocker.Mock(status=429), "rate limited")
+    channel = mocker.Mock(send=mocker.AsyncMock(side_effect=[rate_limited, None]))
+    embed = discord.Embed(description="strike added")
+    log_sink.submit(channel, embed)
+    await asyncio.sleep(0.01)  # first send is rate limited, flush sleeps in backoff
+
+    # Act
+    await log_sink.close()
+
+    # Assert
+    assert channel.send.await_count == SEND_ATTEMPTS
+    channel.send.assert_awaited_with(embeds=[embed])
+    assert len(log_sink) == 0
@@ -0,0 +1,50 @@
+from moddingway.constants import ModerationEventType
+from moddingway.moderation_log import ModerationLog, moderation_actor
+
+BATCH_SIZE = 2
+ACTOR_ID = 42
+TARGET_ID = 7
+NOTE_ID = 3
+
+
+async def test_flush__writes_events_in_batches(mocker):
+    # Arrange
+    mocked_add_moderation_events = mocker.patch(
+        "moddingway.database.moderation_events_database.add_moderation_events"
+    )
+    moderation_log = ModerationLog(batch_size=BATCH_SIZE)
+    token = moderation_actor.set(ACTOR_ID)
+    try:
+        moderation_log.record(ModerationEventType.BAN, TARGET_ID)
+        moderation_log.record(ModerationEventType.UNBAN, TARGET_ID, actor_id=1)
+        moderation_log.record(ModerationEventType.NOTE, TARGET_ID, NOTE_ID, "note")
+    finally:
+        moderation_actor.reset(token)
+
+    # Act
+    await moderation_log.close()
+
+    # Assert
+    batches = [call.args[0] for call in mocked_add_moderation_events.call_args_list]
+    assert [len(batch) for batch in batches] == [BATCH_SIZE, 1]
+    events = [event for batch in batches for event in batch]
+    assert [event.actor_id for event in events] == [str(ACTOR_ID), "1", str(ACTOR_ID)]
+    assert events[2].related_entity_id == NOTE_ID
+    assert all(event.target_id == str(TARGET_ID) for event in events)
+
+
+async def test_flush__keeps_events_when_write_fails(mocker):
+    # Arrange
+    mocker.patch(
+        "moddingway.database.moderation_events_database.add_moderation_events",
+        side_effect=[RuntimeError("database unavailable"), None],
+    )
+    moderation_log = ModerationLog()
+    moderation_log.record(ModerationEventType.BAN, TARGET_ID)
+
+    # Act / Assert
+    await moderation_log.close()
+    assert len(moderation_log) == 1
+
+    await moderation_log.flush()
+    assert len(moderation_log) == 0
@@ -0,0 +1,36 @@
+import discord
+import pytest
+
+from moddingway.pacing import AdaptivePacer
+
+MAX_DELAY = 1.0
+STEP = 0.25
+
+
+async def test_call__backs_off_on_rate_limit_and_recovers(mocker):
+    # Arrange
+    pacer = AdaptivePacer("test", max_delay=MAX_DELAY, step=STEP)
+    mocker.patch("moddingway.pacing.asyncio.sleep")
+    rate_limited = discord.HTTPException(mocker.Mock(status=429), "rate limited")
+    request = mocker.AsyncMock(side_effect=[rate_limited, rate_limited, None])
+
+    # Act / Assert
+    with pytest.raises(discord.HTTPException):
+        await pacer.call(request)
+    assert pacer.delay == STEP
+
+    with pytest.raises(discord.HTTPException):
+        await pacer.call(request)
+    assert pacer.delay == STEP * 2
+
+    await pacer.call(request)
+    assert pacer.delay == STEP
+
+
+async def test_call__delay_is_capped(mocker):
+    pacer = AdaptivePacer("test", max_delay=MAX_DELAY, step=STEP)
+
+    for _ in range(10):
+        pacer.throttled()
+
+    assert pacer.delay == MAX_DELAY
@@ -0,0 +1,68 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+from moddingway.scheduler import DeadlineScheduler
+
+NOW = datetime(2024, 6, 15, 12, 0, 0, tzinfo=UTC)
+
+
+def test_pop_due__returns_due_keys_in_deadline_order():
+    # Arrange
+    scheduler = DeadlineScheduler[int]("test")
+    scheduler.schedule(1, NOW - timedelta(minutes=1))
+    scheduler.schedule(2, NOW - timedelta(minutes=2))
+    scheduler.schedule(3, NOW + timedelta(minutes=1))
+
+    # Act
+    res = scheduler.pop_due(NOW)
+
+    # Assert
+    assert res == [2, 1]
+    assert len(scheduler) == 1
+    assert scheduler.next_deadline() == NOW + timedelta(minutes=1)
+
+
+def test_pop_due__skips_cancelled_and_rescheduled_keys():
+    # Arrange
+    scheduler = DeadlineScheduler[int]("test")
+    scheduler.schedule(1, NOW - timedelta(minutes=1))
+    scheduler.schedule(2, NOW - timedelta(minutes=1))
+    scheduler.cancel(1)
+    scheduler.schedule(2, NOW + timedelta(days=1))
+
+    # Act
+    res = scheduler.pop_due(NOW)
+
+    # Assert
+    assert res == []
+    assert scheduler.next_deadline() == NOW + timedelta(days=1)
+
+
+def test_schedule__naive_deadline_is_utc():
+    scheduler = DeadlineScheduler[int]("test")
+
+    scheduler.schedule(1, NOW.replace(tzinfo=None))
+
+    assert scheduler.next_deadline() == NOW
+
+
+async def test_start__handler_runs_when_deadline_passes():
+    # Arrange
+    scheduler = DeadlineScheduler[int]("test")
+    handled = asyncio.Queue()
+
+    async def handler(keys):
+        await handled.put(keys)
+
+    scheduler.start(handler)
+
+    # Act
+    scheduler.schedule(1, datetime.now(UTC) + timedelta(milliseconds=50))
+    scheduler.schedule(2, datetime.now(UTC) - timedelta(seconds=1))
+
+    # Assert
+    try:
+        assert await asyncio.wait_for(handled.get(), 1) == [2]
+        assert await asyncio.wait_for(handled.get(), 1) == [1]
+    finally:
+        scheduler.stop()
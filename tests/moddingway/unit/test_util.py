@@ -74,6 +74,30 @@ def test_user_has_role(
     assert res == expected_result
 
 
+def test_role_index__rebuild_picks_up_role_changes(mocker, create_role):
+    role_index = util.RoleIndex()
+    guild = mocker.Mock(roles=[create_role(constants.Role.MOD)])
+
+    assert role_index.get(guild, constants.Role.MOD) is guild.roles[0]
+    assert role_index.get(guild, constants.Role.EXILED) is None
+
+    guild.roles.append(create_role(constants.Role.EXILED))
+    # the index is only refreshed by the guild role events
+    assert role_index.get(guild, constants.Role.EXILED) is None
+
+    role_index.rebuild(guild)
+    assert role_index.get(guild, constants.Role.EXILED) is guild.roles[1]
+
+
+def test_role_index__first_role_wins_on_duplicate_names(mocker, create_role):
+    role_index = util.RoleIndex()
+    guild = mocker.Mock(
+        roles=[create_role(constants.Role.MOD), create_role(constants.Role.MOD)]
+    )
+
+    assert role_index.get(guild, constants.Role.MOD) is guild.roles[0]
+
+
 @pytest.mark.asyncio
 async def test_add_and_remove_role(create_member):
     role_to_add = constants.Role.EXILED
@@ -83,14 +107,41 @@ async def test_add_and_remove_role(create_member):
 
     await util.add_and_remove_role(mocked_member, role_to_add, role_to_remove)
 
-    mocked_member.add_roles.assert_called_once()
-    mocked_member.remove_roles.assert_called_once()
+    mocked_member.add_roles.assert_not_called()
+    mocked_member.remove_roles.assert_not_called()
+    mocked_member.edit.assert_called_once()
+
+    edited_roles = mocked_member.edit.call_args.kwargs["roles"]
+    assert [role.name for role in edited_roles] == [role_to_add.value]
+
+
+@pytest.mark.asyncio
+async def test_role_plan__single_edit_for_all_changes(create_member, create_role):
+    # Arrange
+    mocked_member = create_member(roles=[constants.Role.VERIFIED, constants.Role.MOD])
+    role_plan = util.RolePlan(mocked_member)
+
+    # Act
+    role_plan.remove(create_role(constants.Role.VERIFIED))
+    role_plan.add(create_role(constants.Role.EXILED))
+    role_plan.remove(create_role(constants.Role.MOD))
+    await role_plan.apply()
+
+    # Assert
+    mocked_member.edit.assert_called_once()
+    edited_roles = mocked_member.edit.call_args.kwargs["roles"]
+    assert [role.name for role in edited_roles] == [constants.Role.EXILED.value]
+
+
+@pytest.mark.asyncio
+async def test_role_plan__unchanged_roles_skip_edit(create_member, create_role):
+    mocked_member = create_member(roles=[constants.Role.VERIFIED])
+    role_plan = util.RolePlan(mocked_member)
 
-    added_role = mocked_member.add_roles.call_args[0][0]
-    assert added_role.name == role_to_add.value
+    role_plan.add(create_role(constants.Role.VERIFIED))
+    await role_plan.apply()
 
-    removed_role = mocked_member.remove_roles.call_args[0][0]
-    assert removed_role.name == role_to_remove.value
+    mocked_member.edit.assert_not_called()
 
 
 @pytest.mark.parametrize(
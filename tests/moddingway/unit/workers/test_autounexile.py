@@ -0,0 +1,66 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+
+from pytest_mock.plugin import MockerFixture
+
+from moddingway.constants import ExileStatus
+from moddingway.database.models import PendingExile
+from moddingway.workers import autounexile
+
+CONCURRENCY = 2
+DISCORD_ID_OFFSET = 1000
+FAILING_EXILE_ID = 3
+
+
+async def test_unexile_pending_users__bounded_and_isolated(
+    mocker: MockerFixture, monkeypatch
+):
+    # Arrange
+    monkeypatch.setattr(autounexile.settings, "unexile_concurrency", CONCURRENCY)
+    exiles = [
+        PendingExile(
+            exile_id, exile_id, DISCORD_ID_OFFSET + exile_id, datetime.now(UTC)
+        )
+        for exile_id in range(1, 6)
+    ]
+    mocker.patch(
+        "moddingway.database.exiles_database.get_pending_unexiles", return_value=exiles
+    )
+    mocked_update_exile_status = mocker.patch(
+        "moddingway.database.exiles_database.update_exile_status"
+    )
+
+    @asynccontextmanager
+    async def embed_context(*args, **kwargs):
+        yield mocker.Mock()
+
+    mocker.patch.object(autounexile, "create_autounexile_embed", embed_context)
+
+    running = 0
+    max_running = 0
+
+    async def unexile_user(embed, member):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if member.id == DISCORD_ID_OFFSET + FAILING_EXILE_ID:
+            raise RuntimeError("role edit failed")
+
+    mocker.patch.object(autounexile, "unexile_user", side_effect=unexile_user)
+    mocked_bot = mocker.Mock()
+    mocked_bot.get_guild.return_value.get_member.side_effect = lambda discord_id: (
+        mocker.Mock(id=discord_id)
+    )
+
+    # Act
+    await autounexile.unexile_pending_users(mocked_bot)
+
+    # Assert
+    assert max_running == CONCURRENCY
+    assert autounexile.unexile_user.call_count == len(exiles)
+    mocked_update_exile_status.assert_called_once_with(
+        FAILING_EXILE_ID, ExileStatus.UNKNOWN
+    )
@@ -0,0 +1,80 @@
+from pytest_mock.plugin import MockerFixture
+
+from moddingway.database.users_database import BanCorrections
+from moddingway.workers import ban_reconciliation
+
+
+def create_bot(mocker: MockerFixture, banned_user_ids: list[int]):
+    async def bans(limit=None):
+        for user_id in banned_user_ids:
+            yield mocker.Mock(user=mocker.Mock(id=user_id))
+
+    guild = mocker.Mock()
+    guild.bans = bans
+    return mocker.Mock(get_guild=mocker.Mock(return_value=guild))
+
+
+async def test_reconcile_bans__applies_diff_in_one_call(mocker: MockerFixture):
+    # Arrange
+    bot = create_bot(mocker, [1, 2, 3])
+    mocker.patch(
+        "moddingway.database.users_database.get_banned_discord_user_ids",
+        return_value={"2", "3", "4", "5"},
+    )
+    mocked_apply = mocker.patch(
+        "moddingway.database.users_database.apply_ban_corrections",
+        return_value=BanCorrections(banned=0, unbanned=2, created=1),
+    )
+
+    # Act
+    result = await ban_reconciliation.reconcile_bans.coro(bot)
+
+    # Assert
+    mocked_apply.assert_called_once_with(["1"], ["4", "5"])
+    assert "unbanned 2 users and created 1 users" in result
+
+
+async def test_reconcile_bans__skips_write_when_in_sync(mocker: MockerFixture):
+    # Arrange
+    bot = create_bot(mocker, [1, 2])
+    mocker.patch(
+        "moddingway.database.users_database.get_banned_discord_user_ids",
+        return_value={"1", "2"},
+    )
+    mocked_apply = mocker.patch(
+        "moddingway.database.users_database.apply_ban_corrections"
+    )
+
+    # Act
+    await ban_reconciliation.reconcile_bans.coro(bot)
+
+    # Assert
+    mocked_apply.assert_not_called()
+
+
+async def test_reconcile_bans__leaves_users_touched_by_events(mocker: MockerFixture):
+    # Arrange
+    async def bans(limit=None):
+        yield mocker.Mock(user=mocker.Mock(id=1))
+        yield mocker.Mock(user=mocker.Mock(id=2))
+        # user 1 is unbanned once its page was fetched
+        async with ban_reconciliation.ban_events.event_write(1):
+            pass
+
+    guild = mocker.Mock()
+    guild.bans = bans
+    bot = mocker.Mock(get_guild=mocker.Mock(return_value=guild))
+    mocker.patch(
+        "moddingway.database.users_database.get_banned_discord_user_ids",
+        return_value=set(),
+    )
+    mocked_apply = mocker.patch(
+        "moddingway.database.users_database.apply_ban_corrections",
+        return_value=BanCorrections(banned=1, unbanned=0, created=0),
+    )
+
+    # Act
+    await ban_reconciliation.reconcile_bans.coro(bot)
+
+    # Assert
+    mocked_apply.assert_called_once_with(["2"], [])
@@ -0,0 +1,222 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import discord
+from discord.utils import time_snowflake
+from pytest_mock.plugin import MockerFixture
+
+from moddingway.scheduler import DeadlineScheduler
+from moddingway.workers import forum_automod
+
+CONCURRENCY = 2
+CHANNELS = 5
+FAILING_CHANNEL_ID = 3
+FORUM_ID = 10
+FORUM_DURATION = 30
+CHANNEL_ID = 20
+CHANNEL_DURATION = 150
+
+
+async def test_autodelete_posts__channels_bounded_and_isolated(
+    mocker: MockerFixture, monkeypatch
+):
+    # Arrange
+    monkeypatch.setattr(forum_automod.settings, "automod_concurrency", CONCURRENCY)
+    monkeypatch.setattr(
+        forum_automod.settings,
+        "channel_automod_inactivity",
+        {channel_id: 150 for channel_id in range(1, CHANNELS + 1)},
+    )
+    monkeypatch.setattr(forum_automod, "channel_watermarks", {})
+    mocker.patch.object(forum_automod, "create_interaction_embed_context")
+
+    running = 0
+    max_running = 0
+    processed = []
+
+    async def automod_channel(channel, cutoff, pacer, after=None):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if channel.id == FAILING_CHANNEL_ID:
+            raise RuntimeError("history failed")
+        processed.append(channel.id)
+        return 0, 0
+
+    mocker.patch.object(forum_automod, "automod_channel", automod_channel)
+    monkeypatch.setattr(forum_automod, "_scheduled_channels", set())
+    mocker.patch.object(forum_automod.message_scheduler, "start")
+
+    async def history(**kwargs):
+        for _ in ():
+            yield
+
+    guild = mocker.Mock()
+    guild.get_channel.side_effect = lambda channel_id: mocker.Mock(
+        id=channel_id, history=history
+    )
+    bot = mocker.Mock(get_guild=mocker.Mock(return_value=guild))
+
+    # Act
+    await forum_automod.autodelete_posts.coro(bot)
+
+    # Assert
+    assert max_running == CONCURRENCY
+    assert sorted(processed) == [1, 2, 4, 5]
+    assert FAILING_CHANNEL_ID not in forum_automod.channel_watermarks
+    assert forum_automod._scheduled_channels == {1, 2, 4, 5}
+
+
+def test_schedule_thread__deadline_follows_activity(mocker: MockerFixture, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(
+        forum_automod.settings, "automod_inactivity", {FORUM_ID: FORUM_DURATION}
+    )
+    scheduler = DeadlineScheduler[int]("test")
+    monkeypatch.setattr(forum_automod, "thread_scheduler", scheduler)
+    last_activity = datetime.now(UTC)
+    thread = mocker.Mock(id=1, parent_id=FORUM_ID)
+    thread.flags.pinned = False
+    other_forum_thread = mocker.Mock(id=2, parent_id=FORUM_ID + 1)
+
+    # Act
+    forum_automod.schedule_thread(thread, last_activity - timedelta(days=1))
+    forum_automod.schedule_thread(thread, last_activity)
+    forum_automod.schedule_thread(other_forum_thread, last_activity)
+
+    # Assert
+    assert len(scheduler) == 1
+    assert scheduler.next_deadline() == last_activity + timedelta(days=FORUM_DURATION)
+
+    thread.flags.pinned = True
+    forum_automod.schedule_thread(thread)
+    assert len(scheduler) == 0
+
+
+async def test_delete_due_threads__reschedules_threads_with_new_activity(
+    mocker: MockerFixture, monkeypatch
+):
+    # Arrange
+    monkeypatch.setattr(
+        forum_automod.settings, "automod_inactivity", {FORUM_ID: FORUM_DURATION}
+    )
+    scheduler = DeadlineScheduler[int]("test")
+    monkeypatch.setattr(forum_automod, "thread_scheduler", scheduler)
+    now = datetime.now(UTC)
+
+    def create_thread(thread_id: int, inactive_for: timedelta):
+        thread = mocker.Mock(
+            spec=discord.Thread,
+            id=thread_id,
+            parent_id=FORUM_ID,
+            last_message_id=time_snowflake(now - inactive_for),
+            delete=mocker.AsyncMock(),
+        )
+        thread.flags.pinned = False
+        return thread
+
+    threads = {
+        1: create_thread(1, timedelta(days=FORUM_DURATION + 1)),
+        2: create_thread(2, timedelta(hours=1)),
+    }
+    guild = mocker.Mock(get_thread=threads.get)
+    guild.fetch_channel = mocker.AsyncMock(
+        side_effect=discord.NotFound(mocker.Mock(status=404), "gone")
+    )
+    bot = mocker.Mock(get_guild=mocker.Mock(return_value=guild))
+    mocked_remove_threads = mocker.patch(
+        "moddingway.database.automod_database.remove_threads"
+    )
+
+    # Act
+    await forum_automod.delete_due_threads(bot, [1, 2, 3])
+
+    # Assert
+    threads[1].delete.assert_awaited_once()
+    threads[2].delete.assert_not_called()
+    mocked_remove_threads.assert_called_once_with([1, 3])
+    assert len(scheduler) == 1
+
+
+def test_schedule_message__deadlines_are_coalesced(mocker: MockerFixture, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(
+        forum_automod.settings,
+        "channel_automod_inactivity",
+        {CHANNEL_ID: CHANNEL_DURATION},
+    )
+    scheduler = DeadlineScheduler[tuple[int, int]]("test")
+    monkeypatch.setattr(forum_automod, "message_scheduler", scheduler)
+    sent_at = datetime(2024, 6, 15, 12, 0, 10, tzinfo=UTC)
+    channel = mocker.Mock(id=CHANNEL_ID)
+
+    # Act
+    for message_id, seconds in enumerate([0, 20, 45]):
+        forum_automod.schedule_message(
+            mocker.Mock(
+                id=message_id,
+                channel=channel,
+                pinned=False,
+                created_at=sent_at + timedelta(seconds=seconds),
+            )
+        )
+
+    # Assert
+    expires_at = sent_at + timedelta(minutes=CHANNEL_DURATION)
+    assert scheduler.pop_due(expires_at + timedelta(seconds=49)) == []
+    assert scheduler.pop_due(expires_at + timedelta(seconds=50)) == [
+        (CHANNEL_ID, 0),
+        (CHANNEL_ID, 1),
+        (CHANNEL_ID, 2),
+    ]
+
+
+async def test_delete_due_messages__skips_pinned_messages(
+    mocker: MockerFixture, monkeypatch
+):
+    # Arrange
+    monkeypatch.setattr(forum_automod, "pinned_message_ids", {})
+    channel = mocker.Mock(
+        id=CHANNEL_ID,
+        pins=mocker.AsyncMock(return_value=[mocker.Mock(id=2)]),
+        delete_messages=mocker.AsyncMock(),
+    )
+    guild = mocker.Mock()
+    guild.get_channel.return_value = channel
+    bot = mocker.Mock(get_guild=mocker.Mock(return_value=guild))
+
+    # Act
+    await forum_automod.delete_due_messages(
+        bot, [(CHANNEL_ID, 1), (CHANNEL_ID, 2), (CHANNEL_ID, 3)]
+    )
+
+    # Assert
+    channel.pins.assert_awaited_once()
+    deleted = channel.delete_messages.call_args.args[0]
+    assert [message.id for message in deleted] == [1, 3]
+
+
+async def test_delete_due_messages__fetches_pins_once_until_updated(
+    mocker: MockerFixture, monkeypatch
+):
+    # Arrange
+    monkeypatch.setattr(forum_automod, "pinned_message_ids", {})
+    channel = mocker.Mock(
+        id=CHANNEL_ID,
+        pins=mocker.AsyncMock(return_value=[]),
+        delete_messages=mocker.AsyncMock(),
+    )
+    guild = mocker.Mock()
+    guild.get_channel.return_value = channel
+    bot = mocker.Mock(get_guild=mocker.Mock(return_value=guild))
+
+    # Act
+    await forum_automod.delete_due_messages(bot, [(CHANNEL_ID, 1)])
+    await forum_automod.delete_due_messages(bot, [(CHANNEL_ID, 2)])
+    forum_automod.forget_pins(CHANNEL_ID)
+    await forum_automod.delete_due_messages(bot, [(CHANNEL_ID, 3)])
+
+    # Assert
+    assert channel.pins.await_args_list == [mocker.call(), mocker.call()]
@@ -0,0 +1,104 @@
+from datetime import UTC, datetime, timedelta
+
+import discord
+from discord.utils import time_snowflake
+from pytest_mock.plugin import MockerFixture
+
+from moddingway.pacing import AdaptivePacer
+from moddingway.workers import helper
+
+RECENT_MESSAGES = 150
+OLD_MESSAGES = 2
+
+
+async def test_automod_channel__bulk_deletes_recent_messages(mocker: MockerFixture):
+    # Arrange
+    now = datetime.now(UTC)
+    recent = [
+        mocker.Mock(
+            id=time_snowflake(now - timedelta(hours=3, seconds=i)), pinned=False
+        )
+        for i in range(RECENT_MESSAGES)
+    ]
+    old = [
+        mocker.Mock(
+            id=time_snowflake(now - timedelta(days=20, seconds=i)),
+            pinned=False,
+            delete=mocker.AsyncMock(),
+        )
+        for i in range(OLD_MESSAGES)
+    ]
+    pinned = mocker.Mock(id=time_snowflake(now - timedelta(days=1)), pinned=True)
+
+    async def history(**kwargs):
+        for message in [*recent[:50], pinned, *recent[50:], *old]:
+            yield message
+
+    channel = mocker.Mock(history=mocker.Mock(side_effect=history))
+    channel.delete_messages = mocker.AsyncMock()
+    cutoff = now - timedelta(minutes=150)
+
+    # Act
+    num_removed, num_errors = await helper.automod_channel(
+        channel, cutoff, AdaptivePacer("test"), after=1
+    )
+
+    # Assert
+    assert (num_removed, num_errors) == (RECENT_MESSAGES + OLD_MESSAGES, 0)
+    assert channel.history.call_args.kwargs["before"] == cutoff
+    assert channel.history.call_args.kwargs["after"].id == 1
+    batches = [call.args[0] for call in channel.delete_messages.call_args_list]
+    assert [len(batch) for batch in batches] == [
+        helper.BULK_DELETE_MAX_MESSAGES,
+        RECENT_MESSAGES - helper.BULK_DELETE_MAX_MESSAGES,
+    ]
+    for message in old:
+        message.delete.assert_awaited_once()
+
+
+async def test_automod_forum__stops_paging_at_watermark(mocker: MockerFixture):
+    # Arrange
+    now = datetime.now(UTC)
+    watermark = now - timedelta(days=1)
+
+    def create_thread(thread_id: int, archived_ago: timedelta, inactive_for: timedelta):
+        thread = mocker.Mock(
+            spec=discord.Thread,
+            id=thread_id,
+            archive_timestamp=now - archived_ago,
+            last_message_id=time_snowflake(now - inactive_for),
+            delete=mocker.AsyncMock(),
+        )
+        thread.flags.pinned = False
+        return thread
+
+    recent = create_thread(1, timedelta(hours=1), timedelta(days=40))
+    before_watermark = create_thread(2, timedelta(days=2), timedelta(days=40))
+    seen_archived = []
+
+    async def archived_threads(**kwargs):
+        for thread in [recent, before_watermark]:
+            seen_archived.append(thread.id)
+            yield thread
+
+    channel = mocker.Mock(id=10, threads=[], archived_threads=archived_threads)
+    channel.guild.fetch_channel = mocker.AsyncMock(side_effect=[before_watermark])
+    automod_database = "moddingway.database.automod_database"
+    mocker.patch(f"{automod_database}.get_watermark", return_value=watermark)
+    mocked_upsert_threads = mocker.patch(f"{automod_database}.upsert_threads")
+    mocker.patch(f"{automod_database}.get_expired_threads", return_value=[1, 2])
+    mocked_remove_threads = mocker.patch(f"{automod_database}.remove_threads")
+    mocked_set_watermark = mocker.patch(f"{automod_database}.set_watermark")
+
+    # Act
+    num_removed, num_errors = await helper.automod_forum(
+        channel, duration=30, pacer=AdaptivePacer("test")
+    )
+
+    # Assert
+    assert (num_removed, num_errors) == (2, 0)
+    assert seen_archived == [1, 2]
+    indexed = mocked_upsert_threads.call_args_list[0].args[1]
+    assert [row[0] for row in indexed] == [1]
+    mocked_remove_threads.assert_called_once_with([1, 2])
+    assert mocked_set_watermark.call_args.args[0] == channel.id